@@ -0,0 +1,76 @@
+"""Compare HOPEChain storage backends: SQLite rows vs. the append-only segment log.
+
+Usage:
+    python benchmarks/bench_chain_backends.py --events 20000 --batch 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+# Importing the app creates its default databases in the working directory.
+os.chdir(tempfile.mkdtemp(prefix="hopechain_bench_"))
+import hopeverse_onefile_ultra as hv  # noqa: E402
+
+
+def _event(i: int) -> dict:
+    return hv.HOPEChain.node_execution_event(
+        trace_id=f"trace_{i % 97}",
+        actor_name=f"node-{i % 5}",
+        output_preview="Local node analysis: benchmark payload " * 4,
+        confidence=0.7,
+        duration_ms=i % 250,
+        success=True,
+    )
+
+
+def _timed(fn) -> float:
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def bench(name: str, db, events: int, batch: int) -> dict:
+    single = min(events, 2000)
+    single_s = _timed(lambda: [db.add_event(**_event(i)) for i in range(single)])
+    batched = events - single
+    batch_s = _timed(lambda: [db.add_events([_event(i) for i in range(start, min(start + batch, batched))]) for start in range(0, batched, batch)])
+    page_s = _timed(lambda: [db.list_events(limit=50, before_id=events - k * 50) for k in range(100)])
+    filtered_s = _timed(lambda: [db.list_events(limit=50, trace_id=f"trace_{k}") for k in range(97)])
+    verify_s = _timed(lambda: db.verify_chain(full=True))
+    return {
+        "backend": name,
+        "single_appends_per_s": round(single / single_s, 1),
+        "batched_appends_per_s": round(batched / batch_s, 1) if batched else None,
+        "page_reads_per_s": round(100 / page_s, 1),
+        "filtered_reads_per_s": round(97 / filtered_s, 1),
+        "full_verify_records_per_s": round(events / verify_s, 1),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--batch", type=int, default=500)
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="hopechain_bench_"))
+    results = [
+        bench("sqlite", hv.SimpleChainDB(str(workdir / "chain.db")), args.events, args.batch),
+        bench("segment_log", hv.SegmentLogChainDB(str(workdir / "log")), args.events, args.batch),
+    ]
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,136 @@
+"""Cost of the /v1/reason persistence path: connect-per-call vs. the pooled WAL connections.
+
+Each request replays what the orchestrator and the endpoint do against the Database:
+save the task, its candidates, verification, vicdan and trace, then read the trace,
+candidates and verification back. The ``pooled_bundle`` mode writes the five saves
+as one save_trace_bundle transaction, as the trace writer does;
+``pooled_bundle_inline`` does the same with the blob store turned off, and
+``db_kib`` shows what the blob store saves on disk.
+
+Usage:
+    python benchmarks/bench_db_pool.py --requests 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+# Importing the app creates its default databases in the working directory.
+os.chdir(tempfile.mkdtemp(prefix="hopedb_bench_"))
+import hopeverse_onefile_ultra as hv  # noqa: E402
+
+
+class ConnectPerCallPool(hv.SQLitePool):
+    """The previous behaviour: a fresh rollback-journal connection for every call."""
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @contextmanager
+    def write(self) -> Iterator[sqlite3.Connection]:
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN")
+            yield conn
+            if conn.in_transaction:
+                conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    @contextmanager
+    def read(self) -> Iterator[sqlite3.Connection]:
+        conn = self._connect()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+
+def _reason_request(db: hv.Database, i: int, bundle: bool) -> None:
+    task = hv.TaskContext(
+        task_id=f"task_{uuid.uuid4().hex}", trace_id=f"trace_{uuid.uuid4().hex}", task_type="reasoning",
+        policy_profile="default", prompt=f"benchmark prompt {i}", created_at=hv.utc_now(),
+    )
+    candidates = [
+        hv.CandidateAnswer(
+            candidate_id=f"cand_{uuid.uuid4().hex}", task_id=task.task_id, node_id=f"node-{n}",
+            output="Local node analysis: benchmark output " * 8, confidence_self_reported=0.7, duration_ms=12,
+        )
+        for n in range(3)
+    ]
+    verification = hv.VerificationResult(
+        task_id=task.task_id, agreement_score=0.8, evidence_score=0.5, contradiction_flags=[], confidence_score=0.7,
+        candidate_rankings=[c.candidate_id for c in candidates],
+        selected_candidate_id=candidates[0].candidate_id, verification_summary="ok",
+    )
+    vicdan = hv.VicdanResult(task_id=task.task_id, decision="allow", risk_scores={"harm": 0.0}, rationale="ok")
+
+    if bundle:
+        db.save_trace_bundle(
+            task, candidates, verification, vicdan, request_summary=task.prompt[:120],
+            selected_nodes=[c.node_id for c in candidates], final_output=candidates[0].output, total_duration_ms=40,
+        )
+    else:
+        db.save_task(task)
+        db.save_candidates(candidates)
+        db.save_verification(verification)
+        db.save_vicdan(vicdan)
+        db.save_trace(task.trace_id, task.task_id, task.prompt[:120], [c.node_id for c in candidates], [c.candidate_id for c in candidates], "ok", "allow", candidates[0].output, 40)
+
+    trace = db.get_trace(task.trace_id)
+    db.get_candidates_by_task(trace["task_id"])
+    with db.pool.read() as conn:
+        conn.execute("SELECT * FROM verification_results WHERE task_id = ?", (trace["task_id"],)).fetchone()
+        conn.execute("SELECT * FROM vicdan_results WHERE task_id = ?", (trace["task_id"],)).fetchone()
+
+
+def _run(name: str, pool: hv.SQLitePool, requests: int, bundle: bool = False, blob_min_bytes: int = 256) -> dict:
+    hv.TRACE_BLOB_OPTIONS["min_bytes"] = blob_min_bytes
+    db = hv.Database(pool.db_path, pool=pool)
+    for i in range(20):
+        _reason_request(db, i, bundle)
+    started = time.perf_counter()
+    for i in range(requests):
+        _reason_request(db, i, bundle)
+    elapsed = time.perf_counter() - started
+    with pool.write_lock:
+        pool.writer.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    return {
+        "mode": name, "requests": requests, "ms_per_request": round(elapsed * 1000 / requests, 3),
+        "requests_per_s": round(requests / elapsed, 1), "db_kib": os.path.getsize(pool.db_path) // 1024,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="hopedb_bench_"))
+    results = [
+        _run("connect_per_call", ConnectPerCallPool(str(workdir / "per_call.db")), args.requests),
+        _run("pooled_wal", hv.SQLitePool(str(workdir / "pooled.db")), args.requests),
+        _run("pooled_bundle_inline", hv.SQLitePool(str(workdir / "inline.db")), args.requests, bundle=True, blob_min_bytes=0),
+        _run("pooled_bundle", hv.SQLitePool(str(workdir / "bundle.db")), args.requests, bundle=True),
+    ]
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -8,15 +8,24 @@ Subcommands:
   node attest
   bench run
   bench sign
+  chain export
+  chain import
+  chain verify
 
 This is a skeleton you can wire into FastAPI/uvicorn or any HTTP server.
 """
 
 import argparse
+import gzip
+import hashlib
 import json
 import os
+import shutil
+import struct
 import sys
 import time
+import urllib.error
+import urllib.request
 from dataclasses import dataclass, asdict
 from typing import Any, Dict, Optional
 
@@ -111,6 +120,91 @@ def cmd_bench_sign(args: argparse.Namespace) -> int:
     print(json.dumps(signed, ensure_ascii=False, indent=2))
     return 0
 
+def open_ndjson(path: str):
+    with open(path, "rb") as f:
+        magic = f.read(2)
+    return gzip.open(path, "rb") if magic == b"\x1f\x8b" else open(path, "rb")
+
+def _bin1_text(value: Optional[str]) -> bytes:
+    if value is None:
+        return struct.pack(">I", 0xFFFFFFFF)
+    data = value.encode("utf-8")
+    return struct.pack(">I", len(data)) + data
+
+def record_hash(record: Dict[str, Any]) -> str:
+    # Must match chain_record_hash in hopeverse_onefile_ultra.py.
+    scheme = record.get("hash_scheme", "json-sha256")
+    if scheme == "json-sha256":
+        fields = {k: v for k, v in record.items() if k not in ("id", "record_hash", "hash_scheme")}
+        return hashlib.sha256(json.dumps(fields, sort_keys=True).encode("utf-8")).hexdigest()
+    payload_json = json.dumps(record["payload"], sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    encoded = b"".join((
+        b"\x01",
+        *(_bin1_text(record[k]) for k in ("trace_id", "event_type", "actor_did", "actor_name", "actor_type")),
+        struct.pack(">dd", float(record["impact_score"]), float(record["trust_delta"])),
+        _bin1_text(payload_json),
+        _bin1_text(record["prev_hash"]),
+        _bin1_text(record["created_at"]),
+    ))
+    if scheme == "bin1-blake2b":
+        return hashlib.blake2b(encoded, digest_size=32).hexdigest()
+    return hashlib.sha256(encoded).hexdigest()
+
+def cmd_chain_export(args: argparse.Namespace) -> int:
+    url = f"{args.node.rstrip('/')}/v1/chain/export?after_id={args.after_id}"
+    if args.gzip:
+        url += "&compress=true"
+    with urllib.request.urlopen(url) as resp, open(args.out, "wb") as f:
+        shutil.copyfileobj(resp, f, 1 << 20)
+    eprint(f"[hoped] exported {os.path.getsize(args.out)} bytes to {args.out}")
+    return 0
+
+def cmd_chain_import(args: argparse.Namespace) -> int:
+    headers = {"Content-Type": "application/x-ndjson", "Content-Length": str(os.path.getsize(args.infile))}
+    if args.token:
+        headers["Authorization"] = f"Bearer {args.token}"
+    with open(args.infile, "rb") as f:
+        req = urllib.request.Request(
+            f"{args.node.rstrip('/')}/v1/chain/import",
+            data=f,
+            method="POST",
+            headers=headers,
+        )
+        try:
+            with urllib.request.urlopen(req) as resp:
+                result = json.load(resp)
+        except urllib.error.HTTPError as exc:
+            result = json.load(exc)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    return 0 if result.get("ok") else 1
+
+def cmd_chain_verify(args: argparse.Namespace) -> int:
+    # Offline, single-pass audit of an export file: contiguous ids, prev_hash links, record hashes.
+    checked = 0
+    prev_hash: Optional[str] = None
+    prev_id: Optional[int] = None
+    error = None
+    with open_ndjson(args.infile) as f:
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if prev_id is not None and record["id"] != prev_id + 1:
+                error = f"Expected id {prev_id + 1} on line {line_no}, got {record['id']}"
+            elif prev_id is not None and record["prev_hash"] != prev_hash:
+                error = f"Prev hash mismatch at id {record['id']}"
+            elif record["record_hash"] != record_hash(record):
+                error = f"Record hash mismatch at id {record['id']}"
+            if error:
+                break
+            prev_id, prev_hash = record["id"], record["record_hash"]
+            checked += 1
+    report = {"ok": error is None, "checked_records": checked, "last_id": prev_id, "tip_hash": prev_hash}
+    if error:
+        report["error"] = error
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    return 0 if error is None else 1
+
 def build_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(prog="hoped", description="HOPE Chain node daemon CLI")
     p.add_argument("--version", action="version", version=f"%(prog)s {VERSION}")
@@ -175,6 +269,27 @@ def build_parser() -> argparse.ArgumentParser:
     bench_sign.add_argument("--out", default="bench_report.signed.json")
     bench_sign.set_defaults(func=cmd_bench_sign)
 
+    # chain export/import/verify
+    chain = sub.add_parser("chain", help="Chain backup and replication commands")
+    chain_sub = chain.add_subparsers(dest="subcmd", required=True)
+
+    chain_export = chain_sub.add_parser("export", help="Stream the chain from a node to an NDJSON file")
+    chain_export.add_argument("--node", default="http://127.0.0.1:8000")
+    chain_export.add_argument("--after-id", type=int, default=0)
+    chain_export.add_argument("--gzip", action="store_true")
+    chain_export.add_argument("--out", default="hopechain.ndjson")
+    chain_export.set_defaults(func=cmd_chain_export)
+
+    chain_import = chain_sub.add_parser("import", help="Upload an NDJSON export (plain or gzip) to a node")
+    chain_import.add_argument("--node", default="http://127.0.0.1:8000")
+    chain_import.add_argument("--in", dest="infile", required=True)
+    chain_import.add_argument("--token", default=os.getenv("HOPEVERSE_ADMIN_TOKEN", ""), help="admin token of the node")
+    chain_import.set_defaults(func=cmd_chain_import)
+
+    chain_verify = chain_sub.add_parser("verify", help="Verify an NDJSON export offline")
+    chain_verify.add_argument("--in", dest="infile", required=True)
+    chain_verify.set_defaults(func=cmd_chain_verify)
+
     return p
 
 def main(argv=None) -> int:
@@ -1,10 +1,18 @@
 from __future__ import annotations
 
+import argparse
+import gzip
 import hashlib
 import json
+import os
 import secrets
 import sqlite3
+import struct
+import threading
+import time
 import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
@@ -37,6 +45,99 @@ def sha256_text(text: str) -> str:
     return hashlib.sha256(text.encode("utf-8")).hexdigest()
 
 
+# Chain record hash schemes. "json-sha256" (the original) hashes canonical_json of the
+# record fields. The "bin1-*" schemes hash a versioned binary encoding with a fixed
+# field order that reuses the stored canonical payload text, so nothing is
+# re-serialized on verify.
+LEGACY_HASH_SCHEME = "json-sha256"
+CHAIN_HASH_SCHEMES = (LEGACY_HASH_SCHEME, "bin1-sha256", "bin1-blake2b")
+
+_BIN1_LEN = struct.Struct(">I")
+_BIN1_INDEX = struct.Struct(">q")
+_BIN1_SCORES = struct.Struct(">dd")
+
+
+def _bin1_text(value: str) -> bytes:
+    data = value.encode("utf-8")
+    return _BIN1_LEN.pack(len(data)) + data
+
+
+def encode_record_v1(fields: dict[str, Any], payload_json: str) -> bytes:
+    return b"".join((
+        b"\x01",
+        _BIN1_INDEX.pack(fields["chain_index"]),
+        _bin1_text(fields["prev_hash"]),
+        _bin1_text(fields["event_id"]),
+        _bin1_text(fields["actor_did"]),
+        _bin1_text(fields["actor_name"]),
+        _bin1_text(fields["actor_type"]),
+        _bin1_text(fields["event_type"]),
+        _bin1_text(payload_json),
+        _BIN1_SCORES.pack(float(fields["impact_score"]), float(fields["trust_delta"])),
+        _bin1_text(fields["signature"]),
+        _bin1_text(fields["created_at"]),
+    ))
+
+
+def record_hash_for(hash_scheme: str, fields: dict[str, Any] | sqlite3.Row, payload_json: str) -> str:
+    """Hash one chain record. ``fields`` holds everything but the payload, which is passed as canonical JSON."""
+    if hash_scheme == LEGACY_HASH_SCHEME:
+        material = {name: fields[name] for name in (
+            "chain_index", "prev_hash", "event_id", "actor_did", "actor_name", "actor_type",
+            "event_type", "impact_score", "trust_delta", "signature", "created_at",
+        )}
+        material["payload"] = json.loads(payload_json)
+        return sha256_text(canonical_json(material))
+    encoded = encode_record_v1(fields, payload_json)
+    if hash_scheme == "bin1-sha256":
+        return hashlib.sha256(encoded).hexdigest()
+    if hash_scheme == "bin1-blake2b":
+        return hashlib.blake2b(encoded, digest_size=32).hexdigest()
+    raise ValueError(f"Unknown chain hash scheme: {hash_scheme}")
+
+
+def merkle_leaf(record_hash: str) -> bytes:
+    return hashlib.sha256(b"\x00" + bytes.fromhex(record_hash)).digest()
+
+
+def merkle_parent(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+
+def merkle_next_level(level: list[bytes]) -> list[bytes]:
+    return [merkle_parent(level[i], level[i + 1]) if i + 1 < len(level) else level[i] for i in range(0, len(level), 2)]
+
+
+def merkle_root(record_hashes: list[str]) -> str:
+    """Merkle root over record hashes; an odd node is promoted to the next level unchanged."""
+    level = [merkle_leaf(h) for h in record_hashes]
+    if not level:
+        return hashlib.sha256(b"").hexdigest()
+    while len(level) > 1:
+        level = merkle_next_level(level)
+    return level[0].hex()
+
+
+def merkle_proof(record_hashes: list[str], index: int) -> list[dict[str, str]]:
+    level = [merkle_leaf(h) for h in record_hashes]
+    proof: list[dict[str, str]] = []
+    while len(level) > 1:
+        sibling = index ^ 1
+        if sibling < len(level):
+            proof.append({"side": "left" if sibling < index else "right", "hash": level[sibling].hex()})
+        level = merkle_next_level(level)
+        index //= 2
+    return proof
+
+
+def verify_merkle_proof(record_hash: str, proof: list[dict[str, str]], root: str) -> bool:
+    node = merkle_leaf(record_hash)
+    for step in proof:
+        sibling = bytes.fromhex(step["hash"])
+        node = merkle_parent(sibling, node) if step["side"] == "left" else merkle_parent(node, sibling)
+    return node.hex() == root
+
+
 def generate_did_document(name: str | None = None) -> dict[str, str]:
     private_key = secrets.token_hex(32)
     public_key = sha256_text(private_key)
@@ -86,6 +187,18 @@ class ChainRecord:
     record_hash: str
     event_id: str
     created_at: str
+    hash_scheme: str = LEGACY_HASH_SCHEME
+
+
+@dataclass
+class ChainBlock:
+    block_id: int
+    first_index: int
+    last_index: int
+    record_count: int
+    merkle_root: str
+    prev_block_root: Optional[str]
+    created_at: str
 
 
 @dataclass
@@ -99,9 +212,98 @@ class ReputationState:
     last_event_at: str
 
 
+_SEGMENT_QUERY = """
+    SELECT cr.chain_index, cr.prev_hash, cr.record_hash, cr.hash_scheme, cr.event_id,
+           ce.actor_did, ce.actor_name, ce.actor_type, ce.event_type,
+           ce.payload_json, ce.impact_score, ce.trust_delta, ce.signature, ce.created_at
+    FROM chain_records cr
+    JOIN contribution_events ce ON ce.event_id = cr.event_id
+    WHERE cr.chain_index BETWEEN ? AND ?
+    ORDER BY cr.chain_index ASC
+"""
+
+
+def verify_chain_segment(db_path: str, first_index: int, last_index: int) -> dict[str, Any]:
+    """Re-hash one chain_index range on its own connection.
+
+    Continuity inside the range is checked here; the caller checks the
+    boundaries against neighbouring segments via ``first_prev_hash`` and
+    ``last_record_hash``.
+    """
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    try:
+        first_prev_hash: Optional[str] = None
+        prev_hash: Optional[str] = None
+        expected_index = first_index
+        checked = 0
+        broken: Optional[dict[str, Any]] = None
+
+        for row in conn.execute(_SEGMENT_QUERY, (first_index, last_index)):
+            chain_index = row["chain_index"]
+            if chain_index != expected_index:
+                broken = {"chain_index": expected_index, "error": f"Missing record at chain_index {expected_index}"}
+                break
+            if checked == 0:
+                first_prev_hash = row["prev_hash"]
+            elif row["prev_hash"] != prev_hash:
+                broken = {"chain_index": chain_index, "error": f"Broken prev_hash at chain_index {chain_index}"}
+                break
+            if row["record_hash"] != HOPEChainDB._recompute_record_hash(row):
+                broken = {"chain_index": chain_index, "error": f"Hash mismatch at chain_index {chain_index}"}
+                break
+            prev_hash = row["record_hash"]
+            expected_index += 1
+            checked += 1
+
+        if broken is None and expected_index <= last_index:
+            broken = {"chain_index": expected_index, "error": f"Missing record at chain_index {expected_index}"}
+
+        return {
+            "first_index": first_index,
+            "last_index": last_index,
+            "first_prev_hash": first_prev_hash,
+            "last_record_hash": prev_hash,
+            "checked": checked,
+            "break": broken,
+        }
+    finally:
+        conn.close()
+
+
+_ARCHIVE_QUERY = """
+    SELECT ce.*, cr.chain_index, cr.record_id, cr.prev_hash, cr.record_hash, cr.hash_scheme
+    FROM chain_records cr
+    JOIN contribution_events ce ON ce.event_id = cr.event_id
+    WHERE cr.chain_index BETWEEN ? AND ?
+    ORDER BY cr.chain_index ASC
+"""
+
+
 class HOPEChainDB:
-    def __init__(self, db_path: str = "hopechain_did.db") -> None:
+    def __init__(
+        self,
+        db_path: str = "hopechain_did.db",
+        block_size: int = 64,
+        archive_dir: Optional[str] = None,
+        archive_segment_records: int = 10_000,
+        hash_scheme: str = "bin1-sha256",
+        identity_cache_size: int = 1024,
+    ) -> None:
+        if hash_scheme not in CHAIN_HASH_SCHEMES:
+            raise ValueError(f"Unknown chain hash scheme: {hash_scheme}")
         self.db_path = db_path
+        self.hash_scheme = hash_scheme
+        # LRU of identities keyed by DID, plus a name -> DID map for the cached entries.
+        self.identity_cache_size = max(1, identity_cache_size)
+        self._identity_cache: OrderedDict[str, DIDIdentity] = OrderedDict()
+        self._identity_names: dict[str, str] = {}
+        self._identity_lock = threading.Lock()
+        self.block_size = max(1, block_size)
+        self.archive_dir = Path(archive_dir or f"{db_path}.archive")
+        self.archive_segment_records = max(self.block_size, archive_segment_records)
+        self._archive_cache: OrderedDict[str, list[dict[str, Any]]] = OrderedDict()
+        self._archive_lock = threading.Lock()
         Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
         self._init_db()
 
@@ -110,9 +312,17 @@ class HOPEChainDB:
         conn.row_factory = sqlite3.Row
         return conn
 
+    # Tables this store used to create under names that SimpleChainDB in
+    # hopeverse_onefile_ultra also uses, with different columns, in the same default file.
+    LEGACY_TABLES = {"chain_blocks": "did_chain_blocks", "chain_archives": "did_chain_archives"}
+
     def _init_db(self) -> None:
         conn = self._connect()
         try:
+            existing = {row["name"] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+            for legacy, current in self.LEGACY_TABLES.items():
+                if legacy in existing and current not in existing and "first_index" in {row["name"] for row in conn.execute(f"PRAGMA table_info({legacy})")}:
+                    conn.execute(f"ALTER TABLE {legacy} RENAME TO {current}")
             conn.executescript(
                 """
                 CREATE TABLE IF NOT EXISTS did_identities (
@@ -147,6 +357,35 @@ class HOPEChainDB:
                     prev_hash TEXT NOT NULL,
                     record_hash TEXT UNIQUE NOT NULL,
                     event_id TEXT UNIQUE NOT NULL,
+                    created_at TEXT NOT NULL,
+                    hash_scheme TEXT NOT NULL DEFAULT 'json-sha256'
+                );
+
+                CREATE INDEX IF NOT EXISTS idx_did_identities_name ON did_identities(name);
+                CREATE INDEX IF NOT EXISTS idx_contribution_events_trace_id ON contribution_events(trace_id);
+                CREATE INDEX IF NOT EXISTS idx_contribution_events_actor_did ON contribution_events(actor_did);
+                CREATE INDEX IF NOT EXISTS idx_contribution_events_event_type ON contribution_events(event_type);
+                CREATE INDEX IF NOT EXISTS idx_contribution_events_created_at ON contribution_events(created_at);
+
+                CREATE TABLE IF NOT EXISTS did_chain_blocks (
+                    block_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    first_index INTEGER NOT NULL,
+                    last_index INTEGER UNIQUE NOT NULL,
+                    record_count INTEGER NOT NULL,
+                    merkle_root TEXT NOT NULL,
+                    prev_block_root TEXT,
+                    created_at TEXT NOT NULL
+                );
+
+                CREATE TABLE IF NOT EXISTS did_chain_archives (
+                    segment_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    first_index INTEGER NOT NULL,
+                    last_index INTEGER UNIQUE NOT NULL,
+                    record_count INTEGER NOT NULL,
+                    first_prev_hash TEXT NOT NULL,
+                    last_record_hash TEXT NOT NULL,
+                    file_name TEXT NOT NULL,
+                    file_sha256 TEXT NOT NULL,
                     created_at TEXT NOT NULL
                 );
 
@@ -162,6 +401,15 @@ class HOPEChainDB:
                 );
                 """
             )
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(chain_records)")}
+            if "hash_scheme" not in columns:
+                # Every record written before per-record schemes used the legacy JSON hash.
+                conn.execute("ALTER TABLE chain_records ADD COLUMN hash_scheme TEXT NOT NULL DEFAULT 'json-sha256'")
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(did_chain_archives)")}
+            if "first_id" not in columns:
+                # Segments archived before these columns existed have NULL bounds and are always read.
+                conn.execute("ALTER TABLE did_chain_archives ADD COLUMN first_id INTEGER")
+                conn.execute("ALTER TABLE did_chain_archives ADD COLUMN last_id INTEGER")
             conn.commit()
         finally:
             conn.close()
@@ -192,50 +440,90 @@ class HOPEChainDB:
                     identity.created_at,
                 ),
             )
+            oldest = conn.execute(
+                "SELECT did FROM did_identities WHERE name = ? ORDER BY id ASC LIMIT 1",
+                (identity.name,),
+            ).fetchone()
             conn.commit()
-            return identity
         finally:
             conn.close()
+        self._cache_identity(identity, canonical=oldest["did"] == identity.did)
+        return identity
+
+    def _cache_identity(self, identity: DIDIdentity, canonical: bool = False) -> None:
+        """Cache ``identity``; ``canonical`` marks it as the oldest identity for its name."""
+        with self._identity_lock:
+            self._identity_cache[identity.did] = identity
+            self._identity_cache.move_to_end(identity.did)
+            if canonical:
+                self._identity_names.setdefault(identity.name, identity.did)
+            while len(self._identity_cache) > self.identity_cache_size:
+                evicted = self._identity_cache.popitem(last=False)[1]
+                if self._identity_names.get(evicted.name) == evicted.did:
+                    del self._identity_names[evicted.name]
+
+    def _cached_identity(self, did: Optional[str]) -> Optional[DIDIdentity]:
+        with self._identity_lock:
+            identity = self._identity_cache.get(did) if did else None
+            if identity is not None:
+                self._identity_cache.move_to_end(did)
+            return identity
+
+    def _cached_identity_by_name(self, name: str) -> Optional[DIDIdentity]:
+        with self._identity_lock:
+            did = self._identity_names.get(name)
+            identity = self._identity_cache.get(did) if did else None
+            if identity is not None:
+                self._identity_cache.move_to_end(did)
+            return identity
+
+    @staticmethod
+    def _row_to_identity(row: sqlite3.Row) -> DIDIdentity:
+        return DIDIdentity(
+            did=row["did"],
+            name=row["name"],
+            actor_type=row["actor_type"],
+            public_key=row["public_key"],
+            private_key=row["private_key"],
+            created_at=row["created_at"],
+        )
 
     def get_identity(self, did: str) -> Optional[DIDIdentity]:
+        cached = self._cached_identity(did)
+        if cached is not None:
+            return cached
         conn = self._connect()
         try:
             row = conn.execute(
                 "SELECT * FROM did_identities WHERE did = ?",
                 (did,),
             ).fetchone()
-            if not row:
-                return None
-            return DIDIdentity(
-                did=row["did"],
-                name=row["name"],
-                actor_type=row["actor_type"],
-                public_key=row["public_key"],
-                private_key=row["private_key"],
-                created_at=row["created_at"],
-            )
         finally:
             conn.close()
+        if not row:
+            return None
+        identity = self._row_to_identity(row)
+        self._cache_identity(identity)
+        return identity
 
     def get_identity_by_name(self, name: str) -> Optional[DIDIdentity]:
+        cached = self._cached_identity_by_name(name)
+        if cached is not None:
+            return cached
         conn = self._connect()
         try:
+            # Names are not unique; the oldest identity for a name is the canonical one.
             row = conn.execute(
-                "SELECT * FROM did_identities WHERE name = ?",
+                "SELECT * FROM did_identities WHERE name = ? ORDER BY id ASC LIMIT 1",
                 (name,),
             ).fetchone()
-            if not row:
-                return None
-            return DIDIdentity(
-                did=row["did"],
-                name=row["name"],
-                actor_type=row["actor_type"],
-                public_key=row["public_key"],
-                private_key=row["private_key"],
-                created_at=row["created_at"],
-            )
         finally:
             conn.close()
+        if not row:
+            return None
+        identity = self._row_to_identity(row)
+        self._cache_identity(identity, canonical=True)
+        return identity
 
     def ensure_identity(self, name: str, actor_type: str) -> DIDIdentity:
         existing = self.get_identity_by_name(name)
@@ -244,6 +532,11 @@ class HOPEChainDB:
         return self.create_identity(name=name, actor_type=actor_type)
 
     def append_event(self, event: ContributionEvent) -> ChainRecord:
+        return self.append_event_with_reputation(event)[0]
+
+    def append_event_with_reputation(self, event: ContributionEvent) -> tuple[ChainRecord, ReputationState]:
+        """Append one event and return the reputation state written in the same transaction."""
+        payload_json = canonical_json(event.payload)
         conn = self._connect()
         try:
             conn.execute(
@@ -261,7 +554,7 @@ class HOPEChainDB:
                     event.actor_name,
                     event.actor_type,
                     event.event_type,
-                    canonical_json(event.payload),
+                    payload_json,
                     event.impact_score,
                     event.trust_delta,
                     event.signature,
@@ -270,8 +563,12 @@ class HOPEChainDB:
             )
 
             last = conn.execute(
-                "SELECT * FROM chain_records ORDER BY chain_index DESC LIMIT 1"
+                "SELECT chain_index, record_hash FROM chain_records ORDER BY chain_index DESC LIMIT 1"
             ).fetchone()
+            if last is None:
+                last = conn.execute(
+                    "SELECT last_index AS chain_index, last_record_hash AS record_hash FROM did_chain_archives ORDER BY last_index DESC LIMIT 1"
+                ).fetchone()
 
             if last:
                 prev_hash = last["record_hash"]
@@ -280,7 +577,8 @@ class HOPEChainDB:
                 prev_hash = "GENESIS"
                 chain_index = 0
 
-            material = canonical_json(
+            record_hash = record_hash_for(
+                self.hash_scheme,
                 {
                     "chain_index": chain_index,
                     "prev_hash": prev_hash,
@@ -289,21 +587,20 @@ class HOPEChainDB:
                     "actor_name": event.actor_name,
                     "actor_type": event.actor_type,
                     "event_type": event.event_type,
-                    "payload": event.payload,
                     "impact_score": event.impact_score,
                     "trust_delta": event.trust_delta,
                     "signature": event.signature,
                     "created_at": event.created_at,
-                }
+                },
+                payload_json,
             )
-            record_hash = sha256_text(material)
             record_id = generate_id("rec")
 
             conn.execute(
                 """
                 INSERT INTO chain_records (
-                    chain_index, record_id, prev_hash, record_hash, event_id, created_at
-                ) VALUES (?, ?, ?, ?, ?, ?)
+                    chain_index, record_id, prev_hash, record_hash, event_id, created_at, hash_scheme
+                ) VALUES (?, ?, ?, ?, ?, ?, ?)
                 """,
                 (
                     chain_index,
@@ -312,25 +609,58 @@ class HOPEChainDB:
                     record_hash,
                     event.event_id,
                     event.created_at,
+                    self.hash_scheme,
                 ),
             )
 
-            self._upsert_reputation_tx(conn, event)
+            reputation = self._upsert_reputation_tx(conn, event)
+            self._seal_blocks_tx(conn, chain_index)
 
             conn.commit()
 
-            return ChainRecord(
+            record = ChainRecord(
                 chain_index=chain_index,
                 record_id=record_id,
                 prev_hash=prev_hash,
                 record_hash=record_hash,
                 event_id=event.event_id,
                 created_at=event.created_at,
+                hash_scheme=self.hash_scheme,
             )
+            return record, reputation
         finally:
             conn.close()
 
-    def _upsert_reputation_tx(self, conn: sqlite3.Connection, event: ContributionEvent) -> None:
+    def _seal_blocks_tx(self, conn: sqlite3.Connection, tip_index: int) -> None:
+        last = conn.execute(
+            "SELECT last_index, merkle_root FROM did_chain_blocks ORDER BY last_index DESC LIMIT 1"
+        ).fetchone()
+        sealed_through = int(last["last_index"]) if last else -1
+        prev_root = last["merkle_root"] if last else None
+
+        while tip_index - sealed_through >= self.block_size:
+            first_index = sealed_through + 1
+            last_index = sealed_through + self.block_size
+            leaves = [
+                row["record_hash"]
+                for row in conn.execute(
+                    "SELECT record_hash FROM chain_records WHERE chain_index BETWEEN ? AND ? ORDER BY chain_index ASC",
+                    (first_index, last_index),
+                )
+            ]
+            root = merkle_root(leaves)
+            conn.execute(
+                """
+                INSERT INTO did_chain_blocks (
+                    first_index, last_index, record_count, merkle_root, prev_block_root, created_at
+                ) VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (first_index, last_index, len(leaves), root, prev_root, utc_now()),
+            )
+            sealed_through = last_index
+            prev_root = root
+
+    def _upsert_reputation_tx(self, conn: sqlite3.Connection, event: ContributionEvent) -> ReputationState:
         row = conn.execute(
             "SELECT * FROM reputation_states WHERE actor_did = ?",
             (event.actor_did,),
@@ -373,26 +703,93 @@ class HOPEChainDB:
                 event.created_at,
             ),
         )
+        return ReputationState(
+            actor_did=event.actor_did,
+            actor_name=event.actor_name,
+            actor_type=event.actor_type,
+            reputation_score=reputation,
+            trust_score=trust,
+            contribution_count=count,
+            last_event_at=event.created_at,
+        )
 
     def list_recent_events(self, limit: int = 20) -> list[dict[str, Any]]:
+        return self.list_events(limit=limit)
+
+    def list_events(
+        self,
+        limit: int = 20,
+        before_id: Optional[int] = None,
+        after_id: Optional[int] = None,
+        trace_id: Optional[str] = None,
+        actor_did: Optional[str] = None,
+        event_type: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> list[dict[str, Any]]:
+        """Newest-first listing with exclusive keyset cursors on contribution_events.id."""
+        clauses: list[str] = []
+        params: list[Any] = []
+        for column, op, value in (
+            ("ce.id", "<", before_id),
+            ("ce.id", ">", after_id),
+            ("ce.trace_id", "=", trace_id),
+            ("ce.actor_did", "=", actor_did),
+            ("ce.event_type", "=", event_type),
+            ("ce.created_at", ">=", since),
+            ("ce.created_at", "<", until),
+        ):
+            if value is not None:
+                clauses.append(f"{column} {op} ?")
+                params.append(value)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        order = "ASC" if after_id is not None and before_id is None else "DESC"
+        limit = max(1, min(limit, 200))
+        params.append(limit)
+
+        def matches(row: dict[str, Any]) -> bool:
+            return (
+                (before_id is None or row["id"] < before_id)
+                and (after_id is None or row["id"] > after_id)
+                and (trace_id is None or row["trace_id"] == trace_id)
+                and (actor_did is None or row["actor_did"] == actor_did)
+                and (event_type is None or row["event_type"] == event_type)
+                and (since is None or row["created_at"] >= since)
+                and (until is None or row["created_at"] < until)
+            )
+
         conn = self._connect()
         try:
-            rows = conn.execute(
-                """
-                SELECT ce.*, cr.chain_index, cr.prev_hash, cr.record_hash
-                FROM contribution_events ce
-                LEFT JOIN chain_records cr ON cr.event_id = ce.event_id
-                ORDER BY ce.id DESC
-                LIMIT ?
-                """,
-                (limit,),
-            ).fetchall()
+            # Archived rows are always older than every hot row, so the archive
+            # tier is read first for ascending pages and last for descending ones.
+            rows: list[Any] = []
+            hot_min = conn.execute("SELECT MIN(id) FROM contribution_events").fetchone()[0]
+            if order == "ASC" and (hot_min is None or after_id + 1 < hot_min):
+                rows.extend(self._archived_matches(conn, matches, limit, after_id, before_id, ascending=True))
+            if len(rows) < limit:
+                params[-1] = limit - len(rows)
+                rows.extend(conn.execute(
+                    f"""
+                    SELECT ce.*, cr.chain_index, cr.prev_hash, cr.record_hash
+                    FROM contribution_events ce
+                    LEFT JOIN chain_records cr ON cr.event_id = ce.event_id
+                    {where}
+                    ORDER BY ce.id {order}
+                    LIMIT ?
+                    """,
+                    params,
+                ).fetchall())
+            if order == "DESC" and len(rows) < limit:
+                rows.extend(self._archived_matches(conn, matches, limit - len(rows), after_id, before_id, ascending=False))
 
             items: list[dict[str, Any]] = []
             for row in rows:
                 item = dict(row)
+                item.pop("record_id", None)
                 item["payload"] = json.loads(item.pop("payload_json"))
                 items.append(item)
+            if order == "ASC":
+                items.reverse()
             return items
         finally:
             conn.close()
@@ -418,12 +815,18 @@ class HOPEChainDB:
         finally:
             conn.close()
 
+    @staticmethod
+    def _recompute_record_hash(row: sqlite3.Row | dict[str, Any]) -> str:
+        # Archive segments written before hash_scheme existed have no such key.
+        hash_scheme = row["hash_scheme"] if "hash_scheme" in row.keys() else LEGACY_HASH_SCHEME
+        return record_hash_for(hash_scheme, row, row["payload_json"])
+
     def verify_chain(self) -> dict[str, Any]:
         conn = self._connect()
         try:
             rows = conn.execute(
                 """
-                SELECT cr.chain_index, cr.prev_hash, cr.record_hash, cr.event_id,
+                SELECT cr.chain_index, cr.prev_hash, cr.record_hash, cr.hash_scheme, cr.event_id,
                        ce.actor_did, ce.actor_name, ce.actor_type, ce.event_type,
                        ce.payload_json, ce.impact_score, ce.trust_delta, ce.signature, ce.created_at
                 FROM chain_records cr
@@ -434,25 +837,15 @@ class HOPEChainDB:
 
             prev_hash = "GENESIS"
             checked = 0
+            for segment in conn.execute("SELECT * FROM did_chain_archives ORDER BY first_index ASC").fetchall():
+                archive_error = self._archive_segment_error(segment, prev_hash)
+                if archive_error:
+                    return {"ok": False, "checked_records": checked, "error": archive_error}
+                prev_hash = segment["last_record_hash"]
+                checked += segment["record_count"]
 
             for row in rows:
-                material = canonical_json(
-                    {
-                        "chain_index": row["chain_index"],
-                        "prev_hash": row["prev_hash"],
-                        "event_id": row["event_id"],
-                        "actor_did": row["actor_did"],
-                        "actor_name": row["actor_name"],
-                        "actor_type": row["actor_type"],
-                        "event_type": row["event_type"],
-                        "payload": json.loads(row["payload_json"]),
-                        "impact_score": row["impact_score"],
-                        "trust_delta": row["trust_delta"],
-                        "signature": row["signature"],
-                        "created_at": row["created_at"],
-                    }
-                )
-                recomputed = sha256_text(material)
+                recomputed = self._recompute_record_hash(row)
 
                 if row["prev_hash"] != prev_hash:
                     return {
@@ -475,51 +868,452 @@ class HOPEChainDB:
         finally:
             conn.close()
 
-    def verify_event_signature(self, event_id: str) -> dict[str, Any]:
+    def get_inclusion_proof(self, event_id: str) -> Optional[dict[str, Any]]:
         conn = self._connect()
         try:
-            row = conn.execute(
-                """
-                SELECT ce.*, di.private_key
-                FROM contribution_events ce
-                JOIN did_identities di ON di.did = ce.actor_did
-                WHERE ce.event_id = ?
-                """,
+            record = conn.execute(
+                "SELECT chain_index, record_hash FROM chain_records WHERE event_id = ?",
                 (event_id,),
             ).fetchone()
+            if not record:
+                record = self._find_archived_event(conn, event_id)
+            if not record:
+                return None
 
-            if not row:
-                return {"ok": False, "error": "Event not found"}
-
-            payload = json.loads(row["payload_json"])
-            signable = {
-                "event_id": row["event_id"],
-                "trace_id": row["trace_id"],
-                "actor_did": row["actor_did"],
-                "actor_name": row["actor_name"],
-                "actor_type": row["actor_type"],
-                "event_type": row["event_type"],
-                "payload": payload,
-                "impact_score": row["impact_score"],
-                "trust_delta": row["trust_delta"],
-                "created_at": row["created_at"],
-            }
-            recomputed = sign_payload(signable, row["private_key"])
+            chain_index = int(record["chain_index"])
+            block = conn.execute(
+                "SELECT * FROM did_chain_blocks WHERE first_index <= ? AND last_index >= ?",
+                (chain_index, chain_index),
+            ).fetchone()
+            if not block:
+                return {
+                    "event_id": event_id,
+                    "chain_index": chain_index,
+                    "record_hash": record["record_hash"],
+                    "sealed": False,
+                }
 
+            leaves = [row["record_hash"] for row in self._records_between(conn, block["first_index"], block["last_index"])]
+            leaf_index = chain_index - int(block["first_index"])
             return {
-                "ok": recomputed == row["signature"],
-                "event_id": row["event_id"],
-                "actor_did": row["actor_did"],
-                "stored_signature": row["signature"],
-                "recomputed_signature": recomputed,
+                "event_id": event_id,
+                "chain_index": chain_index,
+                "record_hash": record["record_hash"],
+                "sealed": True,
+                "block": asdict(self._row_to_block(block)),
+                "leaf_index": leaf_index,
+                "proof": merkle_proof(leaves, leaf_index),
             }
         finally:
             conn.close()
 
+    def verify_block(self, block_id: int) -> dict[str, Any]:
+        conn = self._connect()
+        try:
+            block = conn.execute(
+                "SELECT * FROM did_chain_blocks WHERE block_id = ?",
+                (block_id,),
+            ).fetchone()
+            if not block:
+                return {"ok": False, "block_id": block_id, "error": "Block not found"}
+
+            rows = self._records_between(conn, block["first_index"], block["last_index"])
+            first_index = int(block["first_index"])
+            prev = self._records_between(conn, first_index - 1, first_index - 1) if first_index else []
+            prev_hash = prev[0]["record_hash"] if prev else "GENESIS"
+
+            for row in rows:
+                if row["prev_hash"] != prev_hash:
+                    return {"ok": False, "block_id": block_id, "error": f"Broken prev_hash at chain_index {row['chain_index']}"}
+                if row["record_hash"] != self._recompute_record_hash(row):
+                    return {"ok": False, "block_id": block_id, "error": f"Hash mismatch at chain_index {row['chain_index']}"}
+                prev_hash = row["record_hash"]
+
+            if len(rows) != block["record_count"] or merkle_root([row["record_hash"] for row in rows]) != block["merkle_root"]:
+                return {"ok": False, "block_id": block_id, "error": "Merkle root mismatch"}
+
+            return {"ok": True, "block_id": block_id, "checked_records": len(rows), "merkle_root": block["merkle_root"]}
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _row_to_block(row: sqlite3.Row) -> ChainBlock:
+        return ChainBlock(
+            block_id=row["block_id"],
+            first_index=row["first_index"],
+            last_index=row["last_index"],
+            record_count=row["record_count"],
+            merkle_root=row["merkle_root"],
+            prev_block_root=row["prev_block_root"],
+            created_at=row["created_at"],
+        )
+
+    def verify_chain_parallel(self, workers: Optional[int] = None, segment_size: int = 250_000) -> dict[str, Any]:
+        """Full audit that re-hashes chain_index ranges in a process pool.
+
+        Reports the first break in chain order and the overall throughput.
+        """
+        started = time.perf_counter()
+        conn = self._connect()
+        try:
+            bounds = conn.execute("SELECT MIN(chain_index), MAX(chain_index) FROM chain_records").fetchone()
+            # Archived segments are checked here by their boundary hashes and file checksum;
+            # the process pool only re-hashes the hot range that follows them.
+            archived_checked = 0
+            expected_prev = "GENESIS"
+            archive_break: Optional[dict[str, Any]] = None
+            for archive in conn.execute("SELECT * FROM did_chain_archives ORDER BY first_index ASC").fetchall():
+                error = self._archive_segment_error(archive, expected_prev)
+                if error:
+                    archive_break = {"chain_index": archive["first_index"], "error": error}
+                    break
+                archived_checked += archive["record_count"]
+                expected_prev = archive["last_record_hash"]
+            start_index = conn.execute("SELECT COALESCE(MAX(last_index) + 1, 0) FROM did_chain_archives").fetchone()[0]
+        finally:
+            conn.close()
+
+        if bounds[0] is None or archive_break:
+            result = {
+                "ok": archive_break is None,
+                "checked_records": archived_checked,
+                "segments": 0,
+                "workers": 0,
+                "elapsed_s": round(time.perf_counter() - started, 3),
+                "records_per_s": 0.0,
+                "first_break": archive_break,
+            }
+            if archive_break:
+                result["error"] = archive_break["error"]
+            return result
+
+        lowest, highest = int(bounds[0]), int(bounds[1])
+        segment_size = max(1, segment_size)
+        ranges = [(start, min(start + segment_size - 1, highest)) for start in range(start_index, highest + 1, segment_size)]
+        workers = max(1, min(workers or os.cpu_count() or 1, len(ranges)))
+
+        if workers == 1:
+            segments = [verify_chain_segment(self.db_path, first, last) for first, last in ranges]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                segments = list(pool.map(verify_chain_segment, [self.db_path] * len(ranges), *zip(*ranges)))
+
+        first_break: Optional[dict[str, Any]] = None
+        if lowest != start_index:
+            first_break = {"chain_index": start_index, "error": f"Missing record at chain_index {start_index}"}
+
+        checked = archived_checked
+        for segment in segments:
+            if first_break:
+                break
+            if segment["checked"] and segment["first_prev_hash"] != expected_prev:
+                first_break = {
+                    "chain_index": segment["first_index"],
+                    "error": f"Broken prev_hash at chain_index {segment['first_index']}",
+                }
+                break
+            checked += segment["checked"]
+            if segment["break"]:
+                first_break = segment["break"]
+                break
+            expected_prev = segment["last_record_hash"]
+
+        elapsed = time.perf_counter() - started
+        total_checked = sum(segment["checked"] for segment in segments)
+        result: dict[str, Any] = {
+            "ok": first_break is None,
+            "checked_records": checked,
+            "segments": len(segments),
+            "workers": workers,
+            "elapsed_s": round(elapsed, 3),
+            "records_per_s": round(total_checked / elapsed, 1) if elapsed > 0 else 0.0,
+            "first_break": first_break,
+        }
+        if first_break:
+            result["error"] = first_break["error"]
+        return result
+
+    def _read_archive(self, file_name: str) -> list[dict[str, Any]]:
+        with self._archive_lock:
+            cached = self._archive_cache.get(file_name)
+            if cached is not None:
+                self._archive_cache.move_to_end(file_name)
+                return cached
+        with gzip.open(self.archive_dir / file_name, "rt", encoding="utf-8") as handle:
+            rows = [json.loads(line) for line in handle]
+        with self._archive_lock:
+            self._archive_cache[file_name] = rows
+            while len(self._archive_cache) > 4:
+                self._archive_cache.popitem(last=False)
+        return rows
+
+    @staticmethod
+    def _file_sha256(path: Path) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as handle:
+            for chunk in iter(lambda: handle.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _archive_segment_error(self, segment: sqlite3.Row, prev_hash: str) -> Optional[str]:
+        if segment["first_prev_hash"] != prev_hash:
+            return f"Broken prev_hash at chain_index {segment['first_index']}"
+        path = self.archive_dir / segment["file_name"]
+        if not path.exists() or self._file_sha256(path) != segment["file_sha256"]:
+            return f"Archive checksum mismatch for chain_index {segment['first_index']}..{segment['last_index']}"
+        return None
+
+    def _records_between(self, conn: sqlite3.Connection, first_index: int, last_index: int) -> list[Any]:
+        """Joined chain rows for [first_index, last_index] from both the archive tier and the hot tables."""
+        rows: list[Any] = []
+        for segment in conn.execute(
+            "SELECT file_name FROM did_chain_archives WHERE last_index >= ? AND first_index <= ? ORDER BY first_index ASC",
+            (first_index, last_index),
+        ):
+            rows.extend(row for row in self._read_archive(segment["file_name"]) if first_index <= row["chain_index"] <= last_index)
+        rows.extend(conn.execute(_ARCHIVE_QUERY, (first_index, last_index)))
+        return rows
+
+    def _find_archived_event(self, conn: sqlite3.Connection, event_id: str) -> Optional[dict[str, Any]]:
+        # Archived events have no event_id index; this cold path scans segments newest-first.
+        for segment in conn.execute("SELECT file_name FROM did_chain_archives ORDER BY first_index DESC"):
+            for row in self._read_archive(segment["file_name"]):
+                if row["event_id"] == event_id:
+                    return row
+        return None
+
+    def _archived_matches(
+        self,
+        conn: sqlite3.Connection,
+        matches,
+        limit: int,
+        after_id: Optional[int],
+        before_id: Optional[int],
+        ascending: bool,
+    ) -> list[dict[str, Any]]:
+        order = "ASC" if ascending else "DESC"
+        segments = conn.execute(
+            f"""
+            SELECT file_name FROM did_chain_archives
+            WHERE first_id IS NULL OR (last_id > ? AND first_id < ?)
+            ORDER BY first_index {order}
+            """,
+            (after_id if after_id is not None else -1, before_id if before_id is not None else 2 ** 63 - 1),
+        ).fetchall()
+        found: list[dict[str, Any]] = []
+        for segment in segments:
+            rows = self._read_archive(segment["file_name"])
+            for row in (rows if ascending else reversed(rows)):
+                if matches(row):
+                    found.append(row)
+                    if len(found) >= limit:
+                        return found
+        return found
+
+    def compact(self, keep_recent: int = 100_000) -> dict[str, Any]:
+        """Move old, sealed chain ranges into gzip NDJSON segments under archive_dir.
+
+        The chain is verified first and only whole Merkle blocks are archived,
+        keeping at least ``keep_recent`` records in the hot tables. Each segment
+        keeps its boundary hashes in did_chain_archives so verify_chain still proves
+        continuity from genesis.
+        """
+        verify = self.verify_chain()
+        if not verify["ok"]:
+            return {"ok": False, "archived_segments": 0, "archived_records": 0, "error": f"Refusing to archive an unverified chain: {verify['error']}"}
+
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        archived_segments = archived_records = 0
+        while True:
+            conn = self._connect()
+            try:
+                archived_through = conn.execute("SELECT COALESCE(MAX(last_index), -1) FROM did_chain_archives").fetchone()[0]
+                tip = conn.execute("SELECT COALESCE(MAX(chain_index), -1) FROM chain_records").fetchone()[0]
+                block_end = conn.execute(
+                    "SELECT MAX(last_index) FROM did_chain_blocks WHERE last_index > ? AND last_index <= ? AND last_index <= ?",
+                    (archived_through, archived_through + self.archive_segment_records, tip - max(1, keep_recent)),
+                ).fetchone()[0]
+                if block_end is None:
+                    break
+                rows = [dict(row) for row in conn.execute(_ARCHIVE_QUERY, (archived_through + 1, block_end))]
+
+                file_name = f"contrib-{rows[0]['chain_index']:012d}-{rows[-1]['chain_index']:012d}.ndjson.gz"
+                final_path = self.archive_dir / file_name
+                tmp_path = final_path.with_suffix(".tmp")
+                with gzip.open(tmp_path, "wt", encoding="utf-8") as handle:
+                    for row in rows:
+                        handle.write(json.dumps(row, separators=(",", ":")) + "\n")
+                with open(tmp_path, "rb") as handle:
+                    os.fsync(handle.fileno())
+                os.replace(tmp_path, final_path)
+
+                conn.execute("BEGIN IMMEDIATE")
+                if conn.execute("SELECT COALESCE(MAX(last_index), -1) FROM did_chain_archives").fetchone()[0] != archived_through:
+                    conn.rollback()
+                    break
+                conn.execute(
+                    """
+                    INSERT INTO did_chain_archives (
+                        first_index, last_index, first_id, last_id, record_count, first_prev_hash,
+                        last_record_hash, file_name, file_sha256, created_at
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        rows[0]["chain_index"],
+                        rows[-1]["chain_index"],
+                        min(row["id"] for row in rows),
+                        max(row["id"] for row in rows),
+                        len(rows),
+                        rows[0]["prev_hash"],
+                        rows[-1]["record_hash"],
+                        file_name,
+                        self._file_sha256(final_path),
+                        utc_now(),
+                    ),
+                )
+                conn.executemany("DELETE FROM contribution_events WHERE event_id = ?", [(row["event_id"],) for row in rows])
+                conn.execute("DELETE FROM chain_records WHERE chain_index BETWEEN ? AND ?", (archived_through + 1, block_end))
+                conn.commit()
+            finally:
+                conn.close()
+            archived_segments += 1
+            archived_records += len(rows)
+
+        return {"ok": True, "archived_segments": archived_segments, "archived_records": archived_records}
+
+    @staticmethod
+    def _signature_result(row: sqlite3.Row) -> dict[str, Any]:
+        signable = {
+            "event_id": row["event_id"],
+            "trace_id": row["trace_id"],
+            "actor_did": row["actor_did"],
+            "actor_name": row["actor_name"],
+            "actor_type": row["actor_type"],
+            "event_type": row["event_type"],
+            "payload": json.loads(row["payload_json"]),
+            "impact_score": row["impact_score"],
+            "trust_delta": row["trust_delta"],
+            "created_at": row["created_at"],
+        }
+        recomputed = sign_payload(signable, row["private_key"])
+        return {
+            "ok": recomputed == row["signature"],
+            "event_id": row["event_id"],
+            "actor_did": row["actor_did"],
+            "stored_signature": row["signature"],
+            "recomputed_signature": recomputed,
+        }
+
+    def verify_event_signature(self, event_id: str) -> dict[str, Any]:
+        results = self.verify_event_signatures([event_id])
+        return results[0] if results else {"ok": False, "error": "Event not found"}
+
+    def verify_event_signatures(self, event_ids: list[str], chunk_size: int = 500) -> list[dict[str, Any]]:
+        """Check the signatures of many events with one query per ``chunk_size`` ids.
+
+        Events that are not found are left out of the result.
+        """
+        results: list[dict[str, Any]] = []
+        conn = self._connect()
+        try:
+            for start in range(0, len(event_ids), chunk_size):
+                chunk = event_ids[start:start + chunk_size]
+                rows = conn.execute(
+                    f"""
+                    SELECT ce.*, di.private_key
+                    FROM contribution_events ce
+                    JOIN did_identities di ON di.did = ce.actor_did
+                    WHERE ce.event_id IN ({", ".join("?" * len(chunk))})
+                    ORDER BY ce.id ASC
+                    """,
+                    chunk,
+                ).fetchall()
+                results.extend(self._signature_result(row) for row in rows)
+            return results
+        finally:
+            conn.close()
+
+
+SignatureCheck = Literal["inline", "deferred", "off"]
+
 
 class HOPEChain:
-    def __init__(self, db_path: str = "hopechain_did.db") -> None:
-        self.db = HOPEChainDB(db_path)
+    """Records signed contribution events.
+
+    ``signature_check`` controls the post-append signature check: ``inline``
+    re-reads and verifies every event before returning, ``deferred`` queues
+    the event id for a background thread that verifies the queue in batches
+    every ``verify_interval_s``, and ``off`` skips the check.
+    """
+
+    def __init__(
+        self,
+        db_path: str = "hopechain_did.db",
+        block_size: int = 64,
+        hash_scheme: str = "bin1-sha256",
+        signature_check: SignatureCheck = "deferred",
+        verify_interval_s: float = 1.0,
+    ) -> None:
+        if signature_check not in ("inline", "deferred", "off"):
+            raise ValueError(f"Unknown signature_check mode: {signature_check}")
+        self.db = HOPEChainDB(db_path, block_size=block_size, hash_scheme=hash_scheme)
+        self.signature_check = signature_check
+        self.verify_interval_s = verify_interval_s
+        self.signature_failures: deque[dict[str, Any]] = deque(maxlen=1000)
+        self._pending_signatures: list[str] = []
+        self._pending_lock = threading.Lock()
+        self._verifier: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def verify_pending_signatures(self) -> dict[str, Any]:
+        """Verify every queued event signature now; failures are also kept in ``signature_failures``."""
+        with self._pending_lock:
+            pending, self._pending_signatures = self._pending_signatures, []
+        try:
+            results = self.db.verify_event_signatures(pending)
+        except sqlite3.Error:
+            with self._pending_lock:
+                self._pending_signatures[:0] = pending
+            raise
+        failures = [result for result in results if not result["ok"]]
+        self.signature_failures.extend(failures)
+        return {"checked": len(results), "failed": len(failures), "failures": failures}
+
+    def _verify_loop(self) -> None:
+        while not self._stop.wait(self.verify_interval_s):
+            try:
+                self.verify_pending_signatures()
+            except sqlite3.Error:
+                continue
+
+    def close(self) -> dict[str, Any]:
+        """Stop the background verifier and verify whatever is still queued."""
+        self._stop.set()
+        if self._verifier is not None:
+            self._verifier.join()
+            self._verifier = None
+        return self.verify_pending_signatures()
+
+    def _append(self, identity: DIDIdentity, event: ContributionEvent) -> dict[str, Any]:
+        record, reputation = self.db.append_event_with_reputation(event)
+        if self.signature_check == "inline":
+            verify = self.db.verify_event_signature(event.event_id)
+        elif self.signature_check == "deferred":
+            with self._pending_lock:
+                self._pending_signatures.append(event.event_id)
+                if self._verifier is None and not self._stop.is_set():
+                    self._verifier = threading.Thread(target=self._verify_loop, name="hopechain-signature-verifier", daemon=True)
+                    self._verifier.start()
+            verify = {"ok": None, "status": "deferred", "event_id": event.event_id}
+        else:
+            verify = {"ok": None, "status": "skipped", "event_id": event.event_id}
+        return {
+            "identity": asdict(identity),
+            "event": asdict(event),
+            "record": asdict(record),
+            "reputation": asdict(reputation),
+            "signature_verify": verify,
+        }
 
     def ensure_actor(self, actor_name: str, actor_type: str) -> DIDIdentity:
         return self.db.ensure_identity(name=actor_name, actor_type=actor_type)
@@ -591,16 +1385,7 @@ class HOPEChain:
             impact_score=impact,
             trust_delta=trust_delta,
         )
-        record = self.db.append_event(event)
-        rep = self.db.get_reputation(identity.did)
-        verify = self.db.verify_event_signature(event.event_id)
-        return {
-            "identity": asdict(identity),
-            "event": asdict(event),
-            "record": asdict(record),
-            "reputation": asdict(rep) if rep else None,
-            "signature_verify": verify,
-        }
+        return self._append(identity, event)
 
     def record_goal_decision(
         self,
@@ -628,16 +1413,7 @@ class HOPEChain:
             impact_score=expected_impact,
             trust_delta=trust_delta,
         )
-        record = self.db.append_event(event)
-        rep = self.db.get_reputation(identity.did)
-        verify = self.db.verify_event_signature(event.event_id)
-        return {
-            "identity": asdict(identity),
-            "event": asdict(event),
-            "record": asdict(record),
-            "reputation": asdict(rep) if rep else None,
-            "signature_verify": verify,
-        }
+        return self._append(identity, event)
 
     def record_human_feedback(
         self,
@@ -666,20 +1442,11 @@ class HOPEChain:
             impact_score=impact,
             trust_delta=trust_delta,
         )
-        record = self.db.append_event(event)
-        rep = self.db.get_reputation(target_identity.did)
-        verify = self.db.verify_event_signature(event.event_id)
-        return {
-            "identity": asdict(target_identity),
-            "event": asdict(event),
-            "record": asdict(record),
-            "reputation": asdict(rep) if rep else None,
-            "signature_verify": verify,
-        }
+        return self._append(target_identity, event)
 
 
-if __name__ == "__main__":
-    chain = HOPEChain("hopechain_did.db")
+def run_demo(db_path: str) -> None:
+    chain = HOPEChain(db_path)
 
     node_result = chain.record_node_execution(
         trace_id=generate_id("trace"),
@@ -714,6 +1481,38 @@ if __name__ == "__main__":
             "feedback_result": feedback_result,
             "recent_events": chain.db.list_recent_events(limit=10),
             "chain_verify": chain.db.verify_chain(),
+            "signature_audit": chain.close(),
         },
         indent=2,
     ))
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="hopechain_did", description="HOPEChain DID ledger tools")
+    parser.add_argument("--db", default="hopechain_did.db")
+    sub = parser.add_subparsers(dest="cmd")
+
+    audit = sub.add_parser("audit", help="Full parallel verification of the chain")
+    audit.add_argument("--workers", type=int, default=None)
+    audit.add_argument("--segment-size", type=int, default=250_000)
+
+    compact = sub.add_parser("compact", help="Move old sealed blocks into compressed archive segments")
+    compact.add_argument("--keep-recent", type=int, default=100_000)
+    compact.add_argument("--archive-dir", default=None)
+
+    args = parser.parse_args(argv)
+    if args.cmd == "compact":
+        report = HOPEChainDB(args.db, archive_dir=args.archive_dir).compact(keep_recent=args.keep_recent)
+        print(json.dumps(report, indent=2))
+        return 0 if report["ok"] else 1
+    if args.cmd == "audit":
+        report = HOPEChainDB(args.db).verify_chain_parallel(workers=args.workers, segment_size=args.segment_size)
+        print(json.dumps(report, indent=2))
+        return 0 if report["ok"] else 1
+
+    run_demo(args.db)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
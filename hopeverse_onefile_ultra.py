@@ -1,41 +1,474 @@
 from __future__ import annotations
 
 import asyncio
+import bisect
+import gzip
+import hashlib
+import importlib.util
 import json
 import logging
+import math
+import mmap
 import os
+import queue
 import re
 import secrets
 import sqlite3
+import struct
+import tempfile
+import threading
 import time
 import uuid
+import zlib
 from abc import ABC, abstractmethod
+from array import array
+from collections import OrderedDict
+from contextlib import asynccontextmanager, contextmanager
 from dataclasses import asdict, dataclass, field
-from datetime import datetime, timezone
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Literal, Optional
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator, Literal, Optional
 
 import httpx
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, StreamingResponse
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX hosts fall back to the in-process lock only
+    fcntl = None
 
-class SimpleChainDB:
-    def __init__(self, db_path: str) -> None:
-        self.db_path = db_path
-        self._init_db()
 
-    def _connect(self):
-        conn = sqlite3.connect(self.db_path)
+def merkle_leaf(record_hash: str) -> bytes:
+    return hashlib.sha256(b"\x00" + bytes.fromhex(record_hash)).digest()
+
+
+def merkle_parent(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+
+def merkle_next_level(level: list[bytes]) -> list[bytes]:
+    return [merkle_parent(level[i], level[i + 1]) if i + 1 < len(level) else level[i] for i in range(0, len(level), 2)]
+
+
+def merkle_root(record_hashes: list[str]) -> str:
+    """Merkle root over record hashes; an odd node is promoted to the next level unchanged."""
+    level = [merkle_leaf(h) for h in record_hashes]
+    if not level:
+        return hashlib.sha256(b"").hexdigest()
+    while len(level) > 1:
+        level = merkle_next_level(level)
+    return level[0].hex()
+
+
+def merkle_proof(record_hashes: list[str], index: int) -> list[dict[str, str]]:
+    level = [merkle_leaf(h) for h in record_hashes]
+    proof: list[dict[str, str]] = []
+    while len(level) > 1:
+        sibling = index ^ 1
+        if sibling < len(level):
+            proof.append({"side": "left" if sibling < index else "right", "hash": level[sibling].hex()})
+        level = merkle_next_level(level)
+        index //= 2
+    return proof
+
+
+def verify_merkle_proof(record_hash: str, proof: list[dict[str, str]], root: str) -> bool:
+    node = merkle_leaf(record_hash)
+    for step in proof:
+        sibling = bytes.fromhex(step["hash"])
+        node = merkle_parent(sibling, node) if step["side"] == "left" else merkle_parent(node, sibling)
+    return node.hex() == root
+
+
+# Record hash schemes. 'json-sha256' is the original one: sha256 over json.dumps(fields, sort_keys=True).
+# The 'bin1-*' schemes hash a versioned binary encoding with a fixed field order and take the
+# payload as its canonical JSON text, so verifying a stored row hashes bytes already on disk.
+LEGACY_HASH_SCHEME = 'json-sha256'
+CHAIN_HASH_SCHEMES = (LEGACY_HASH_SCHEME, 'bin1-sha256', 'bin1-blake2b')
+
+_BIN1_LEN = struct.Struct('>I')
+_BIN1_SCORES = struct.Struct('>dd')
+_BIN1_NULL = _BIN1_LEN.pack(0xFFFFFFFF)
+
+
+def canonical_payload_json(payload: dict[str, Any]) -> str:
+    return json.dumps(payload, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+
+
+def _bin1_text(value: str | None) -> bytes:
+    if value is None:
+        return _BIN1_NULL
+    data = value.encode('utf-8')
+    return _BIN1_LEN.pack(len(data)) + data
+
+
+def encode_chain_record_v1(*, trace_id: str, event_type: str, actor_did: str | None, actor_name: str | None, actor_type: str | None, impact_score: float, trust_delta: float, payload_json: str, prev_hash: str | None, created_at: str) -> bytes:
+    """Version byte, then length-prefixed UTF-8 strings (0xFFFFFFFF for None) and big-endian doubles."""
+    return b''.join((
+        b'\x01', _bin1_text(trace_id), _bin1_text(event_type), _bin1_text(actor_did), _bin1_text(actor_name),
+        _bin1_text(actor_type), _BIN1_SCORES.pack(float(impact_score), float(trust_delta)), _bin1_text(payload_json),
+        _bin1_text(prev_hash), _bin1_text(created_at),
+    ))
+
+
+def chain_record_hash(hash_scheme: str, *, trace_id: str, event_type: str, actor_did: str | None, actor_name: str | None, actor_type: str | None, impact_score: float, trust_delta: float, payload_json: str, prev_hash: str | None, created_at: str) -> str:
+    if hash_scheme == LEGACY_HASH_SCHEME:
+        canonical = json.dumps({
+            'trace_id': trace_id, 'event_type': event_type, 'actor_did': actor_did, 'actor_name': actor_name,
+            'actor_type': actor_type, 'impact_score': impact_score, 'trust_delta': trust_delta,
+            'payload': json.loads(payload_json or '{}'), 'prev_hash': prev_hash, 'created_at': created_at
+        }, sort_keys=True)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+    encoded = encode_chain_record_v1(
+        trace_id=trace_id, event_type=event_type, actor_did=actor_did, actor_name=actor_name, actor_type=actor_type,
+        impact_score=impact_score, trust_delta=trust_delta, payload_json=payload_json, prev_hash=prev_hash, created_at=created_at,
+    )
+    if hash_scheme == 'bin1-sha256':
+        return hashlib.sha256(encoded).hexdigest()
+    if hash_scheme == 'bin1-blake2b':
+        return hashlib.blake2b(encoded, digest_size=32).hexdigest()
+    raise ValueError(f'Unknown chain hash scheme: {hash_scheme}')
+
+
+# Field order of one exported chain record; also the on-disk record layout of SegmentLogChainDB.
+CHAIN_EXPORT_FIELDS = (
+    'id', 'trace_id', 'event_type', 'actor_did', 'actor_name', 'actor_type',
+    'impact_score', 'trust_delta', 'payload', 'prev_hash', 'created_at', 'hash_scheme', 'record_hash',
+)
+
+
+def chain_export_line(record: dict[str, Any]) -> bytes:
+    line = {name: record.get(name) for name in CHAIN_EXPORT_FIELDS}
+    line['hash_scheme'] = line['hash_scheme'] or LEGACY_HASH_SCHEME
+    return json.dumps(line, separators=(',', ':')).encode('utf-8') + b'\n'
+
+
+class SQLitePool:
+    """Long-lived connections to one SQLite file: a single writer plus one reader per thread.
+
+    The file is switched to WAL, so readers never block the writer or each other.
+    Connections stay open, so each keeps its prepared-statement cache
+    (``cached_statements``) across calls instead of re-parsing SQL on every connect.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        *,
+        synchronous: str = 'NORMAL',
+        busy_timeout_ms: int = 30_000,
+        cache_kib: int = 16_384,
+        mmap_mb: int = 256,
+        cached_statements: int = 256,
+    ) -> None:
+        if synchronous.upper() not in ('OFF', 'NORMAL', 'FULL', 'EXTRA'):
+            raise ValueError(f'Unknown SQLite synchronous mode: {synchronous}')
+        self.db_path = db_path
+        self.synchronous = synchronous.upper()
+        self.busy_timeout_ms = busy_timeout_ms
+        self.cache_kib = cache_kib
+        self.mmap_mb = mmap_mb
+        self.cached_statements = cached_statements
+        # Held for the whole of every write transaction on ``writer``.
+        self.write_lock = threading.Lock()
+        self._writer: sqlite3.Connection | None = None
+        self._local = threading.local()
+        self._readers: list[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+
+    def _open(self, *, query_only: bool) -> sqlite3.Connection:
+        # Autocommit: write transactions are opened explicitly, and reads never hold a snapshot open.
+        conn = sqlite3.connect(
+            self.db_path, isolation_level=None, check_same_thread=False,
+            timeout=self.busy_timeout_ms / 1000, cached_statements=self.cached_statements,
+        )
         conn.row_factory = sqlite3.Row
+        for pragma in (
+            f'busy_timeout = {int(self.busy_timeout_ms)}',
+            f'cache_size = {-int(self.cache_kib)}',
+            f'mmap_size = {int(self.mmap_mb) * 1024 * 1024}',
+            'temp_store = MEMORY',
+        ):
+            conn.execute(f'PRAGMA {pragma}')
+        if query_only:
+            conn.execute('PRAGMA query_only = ON')
+        else:
+            conn.execute('PRAGMA journal_mode = WAL')
+            # With WAL, NORMAL only syncs at checkpoints; a crash can lose the last commits but never corrupts.
+            conn.execute(f'PRAGMA synchronous = {self.synchronous}')
         return conn
 
+    @property
+    def writer(self) -> sqlite3.Connection:
+        """The shared writer connection; only use it while holding ``write_lock``."""
+        if self._writer is None:
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._writer = self._open(query_only=False)
+        return self._writer
+
+    @contextmanager
+    def write(self) -> Iterator[sqlite3.Connection]:
+        """Run the block as one ``BEGIN IMMEDIATE`` transaction; commit on success, roll back on error."""
+        with self.write_lock:
+            conn = self.writer
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+                # executescript() commits on its own, so there may be nothing left to commit.
+                if conn.in_transaction:
+                    conn.execute('COMMIT')
+            except BaseException:
+                # Includes a failed COMMIT, which would otherwise leave the shared writer mid-transaction.
+                if conn.in_transaction:
+                    conn.execute('ROLLBACK')
+                raise
+
+    @contextmanager
+    def read(self) -> Iterator[sqlite3.Connection]:
+        """Yield this thread's read-only connection, opening it on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            self.writer  # the first connection sets up WAL before any reader opens
+            conn = self._open(query_only=True)
+            self._local.conn = conn
+            with self._readers_lock:
+                self._readers.append(conn)
+        yield conn
+
+    def close(self) -> None:
+        with self.write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+        with self._readers_lock:
+            for conn in self._readers:
+                conn.close()
+            self._readers.clear()
+        self._local = threading.local()
+
+
+# Tuning applied to pools created by sqlite_pool(); filled in from Settings at startup.
+SQLITE_POOL_OPTIONS: dict[str, Any] = {}
+_SQLITE_POOLS: dict[str, SQLitePool] = {}
+_SQLITE_POOLS_LOCK = threading.Lock()
+
+
+def sqlite_pool(db_path: str) -> SQLitePool:
+    """Return the process-wide pool for ``db_path``, so every store on one file shares its writer."""
+    key = os.path.abspath(db_path)
+    with _SQLITE_POOLS_LOCK:
+        pool = _SQLITE_POOLS.get(key)
+        if pool is None:
+            pool = _SQLITE_POOLS[key] = SQLitePool(db_path, **SQLITE_POOL_OPTIONS)
+        return pool
+
+
+def close_sqlite_pools() -> None:
+    with _SQLITE_POOLS_LOCK:
+        pools = list(_SQLITE_POOLS.values())
+        _SQLITE_POOLS.clear()
+    for pool in pools:
+        pool.close()
+
+
+@dataclass(frozen=True)
+class Migration:
+    """One schema step: SQL statements, or callables for steps that must inspect the schema first."""
+
+    version: int
+    name: str
+    apply: tuple[str | Callable[[sqlite3.Connection], None], ...] | Callable[[sqlite3.Connection], None]
+
+
+def add_column(table: str, column: str, declaration: str) -> Callable[[sqlite3.Connection], None]:
+    """Migration step adding a column if it is missing.
+
+    ADD COLUMN only rewrites the schema entry, not the table, so it is safe on a live
+    database; readers see the declared default on old rows.
+    """
+    def apply(conn: sqlite3.Connection) -> None:
+        if column not in {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {declaration}")
+    return apply
+
+
+def run_migrations(pool: SQLitePool, component: str, migrations: Iterable[Migration]) -> list[int]:
+    """Apply the not-yet-applied ``migrations`` of ``component`` in version order; return their versions.
+
+    Each step runs in its own write transaction together with its schema_migrations row,
+    so a crash leaves the schema at a clean version and concurrent starters apply each
+    step exactly once.
+    """
+    with pool.write() as conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                component TEXT NOT NULL,
+                version INTEGER NOT NULL,
+                name TEXT NOT NULL,
+                applied_at TEXT NOT NULL,
+                PRIMARY KEY (component, version)
+            )
+        """)
+    applied: list[int] = []
+    for migration in sorted(migrations, key=lambda m: m.version):
+        with pool.write() as conn:
+            if conn.execute("SELECT 1 FROM schema_migrations WHERE component = ? AND version = ?", (component, migration.version)).fetchone():
+                continue
+            for step in (migration.apply,) if callable(migration.apply) else migration.apply:
+                if callable(step):
+                    step(conn)
+                else:
+                    conn.execute(step)
+            conn.execute(
+                "INSERT INTO schema_migrations (component, version, name, applied_at) VALUES (?, ?, ?, ?)",
+                (component, migration.version, migration.name, utc_now()),
+            )
+        applied.append(migration.version)
+    return applied
+
+
+def query_plan(conn: sqlite3.Connection, sql: str, params: tuple[Any, ...] = ()) -> list[str]:
+    return [row["detail"] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+
+def plan_uses_index(plan: list[str]) -> bool:
+    """False if any step of an EXPLAIN QUERY PLAN is a full table scan."""
+    return not any(step.startswith("SCAN") and "USING" not in step for step in plan)
+
+
+# Trace-store text of at least min_bytes is kept once per distinct content in the
+# blobs table, zlib-compressed from compress_min_bytes; 0 keeps everything inline.
+# Filled from Settings.
+TRACE_BLOB_OPTIONS: dict[str, int] = {"min_bytes": 256, "compress_min_bytes": 512, "compress_level": 6}
+_BLOB_CACHE: OrderedDict[bytes, str] = OrderedDict()
+_BLOB_CACHE_SIZE = 1024
+_BLOB_CACHE_LOCK = threading.Lock()
+
+
+def put_blob(conn: sqlite3.Connection, text: Optional[str]) -> tuple[Optional[str], Optional[bytes]]:
+    """Return the (inline text, blob hash) pair to store in place of ``text``.
+
+    Short text stays inline. Longer text is written to ``blobs`` under its SHA-256
+    unless that content is already there, and the row keeps an empty string.
+    """
+    min_bytes = TRACE_BLOB_OPTIONS["min_bytes"]
+    if text is None or not min_bytes:
+        return text, None
+    raw = text.encode("utf-8")
+    if len(raw) < min_bytes:
+        return text, None
+    digest = hashlib.sha256(raw).digest()
+    if conn.execute("SELECT 1 FROM blobs WHERE hash = ?", (digest,)).fetchone() is None:
+        codec, data = "raw", raw
+        if len(raw) >= TRACE_BLOB_OPTIONS["compress_min_bytes"]:
+            packed = zlib.compress(raw, TRACE_BLOB_OPTIONS["compress_level"])
+            if len(packed) < len(raw):
+                codec, data = "zlib", packed
+        conn.execute("INSERT INTO blobs (hash, codec, size, data) VALUES (?, ?, ?, ?)", (digest, codec, len(raw), data))
+    return "", digest
+
+
+def get_blobs(conn: sqlite3.Connection, hashes: Iterable[bytes]) -> dict[bytes, str]:
+    """Text for each of ``hashes`` found in ``blobs``; recently read blobs come from memory."""
+    found: dict[bytes, str] = {}
+    missing: list[bytes] = []
+    with _BLOB_CACHE_LOCK:
+        for digest in set(hashes):
+            if digest in _BLOB_CACHE:
+                _BLOB_CACHE.move_to_end(digest)
+                found[digest] = _BLOB_CACHE[digest]
+            else:
+                missing.append(digest)
+    if missing:
+        rows = conn.execute(f"SELECT hash, codec, data FROM blobs WHERE hash IN ({','.join('?' * len(missing))})", missing).fetchall()
+        loaded = {row["hash"]: (zlib.decompress(row["data"]) if row["codec"] == "zlib" else bytes(row["data"])).decode("utf-8") for row in rows}
+        found.update(loaded)
+        with _BLOB_CACHE_LOCK:
+            _BLOB_CACHE.update(loaded)
+            while len(_BLOB_CACHE) > _BLOB_CACHE_SIZE:
+                _BLOB_CACHE.popitem(last=False)
+    return found
+
+
+def resolve_blobs(conn: sqlite3.Connection, items: list[dict[str, Any]], column: str, blob_column: str) -> list[dict[str, Any]]:
+    """Replace ``column`` with the blob text wherever ``blob_column`` is set, dropping ``blob_column``."""
+    texts = get_blobs(conn, [item[blob_column] for item in items if item.get(blob_column)])
+    for item in items:
+        digest = item.pop(blob_column, None)
+        if digest:
+            item[column] = texts[digest]
+    return items
+
+
+class ChainListeners:
+    """Append notifications shared by the chain backends."""
+
+    _listeners: list[Callable[[list[dict[str, Any]]], None]]
+
+    def add_listener(self, listener: Callable[[list[dict[str, Any]]], None]) -> None:
+        """Call ``listener(records)`` after every committed append, in commit order.
+
+        ``records`` is empty for bulk imports; listeners should then re-read the store.
+        """
+        self._listeners.append(listener)
+
+    def _notify(self, records: list[dict[str, Any]]) -> None:
+        for listener in self._listeners:
+            try:
+                listener(records)
+            except Exception as exc:
+                logger.warning("chain listener failed: %s", exc)
+
+
+def verify_result(error: str | None, checked_records: int, verified_tail: int, mode: str, checkpoint_id: int, full_verified_at: str | None) -> dict[str, Any]:
+    """The verify_chain report shared by both chain backends."""
+    result: dict[str, Any] = {
+        'ok': error is None,
+        'checked_records': checked_records,
+        'verified_tail': verified_tail,
+        'mode': mode,
+        'checkpoint_id': checkpoint_id,
+        'last_full_verify_at': full_verified_at,
+        'checkpoint_age_s': round((datetime.now(timezone.utc) - datetime.fromisoformat(full_verified_at)).total_seconds(), 3) if full_verified_at else None,
+    }
+    if error:
+        result['error'] = error
+    return result
+
+
+class SimpleChainDB(ChainListeners):
+    def __init__(self, db_path: str, block_size: int = 64, archive_dir: str | None = None, archive_segment_events: int = 10_000, hash_scheme: str = 'bin1-sha256', pool: SQLitePool | None = None) -> None:
+        if hash_scheme not in CHAIN_HASH_SCHEMES:
+            raise ValueError(f'Unknown chain hash scheme: {hash_scheme}')
+        self.db_path = db_path
+        self.hash_scheme = hash_scheme
+        self._listeners = []
+        self.block_size = max(1, block_size)
+        self.archive_dir = Path(archive_dir or f'{db_path}.archive')
+        self.archive_segment_events = max(self.block_size, archive_segment_events)
+        self._archive_cache: OrderedDict[str, list[dict[str, Any]]] = OrderedDict()
+        self._archive_lock = threading.Lock()
+        self.pool = pool or sqlite_pool(db_path)
+        self._write_lock = self.pool.write_lock
+        self._tip: tuple[int, str | None] | None = None
+        self._tip_version: tuple[int, int] | None = None
+        self._sealed_through = 0
+        self._init_db()
+
+    # Tables that older hopechain_did builds created in the same default file under our
+    # names, with their own columns; moved to the names hopechain_did uses now.
+    FOREIGN_TABLES = {'chain_blocks': 'did_chain_blocks', 'chain_archives': 'did_chain_archives'}
+
     def _init_db(self) -> None:
-        conn = self._connect()
-        try:
+        with self.pool.write() as conn:
+            for table, did_table in self.FOREIGN_TABLES.items():
+                columns = {row['name'] for row in conn.execute(f'PRAGMA table_info({table})')}
+                if 'first_index' in columns and conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (did_table,)).fetchone() is None:
+                    conn.execute(f'ALTER TABLE {table} RENAME TO {did_table}')
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS chain_events (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -49,113 +482,1243 @@ class SimpleChainDB:
                     payload_json TEXT NOT NULL,
                     record_hash TEXT NOT NULL,
                     prev_hash TEXT,
+                    created_at TEXT NOT NULL,
+                    hash_scheme TEXT NOT NULL DEFAULT 'json-sha256'
+                )
+            """)
+            if 'hash_scheme' not in {row['name'] for row in conn.execute('PRAGMA table_info(chain_events)')}:
+                # Rows written before per-record schemes existed all used the legacy JSON hash.
+                conn.execute("ALTER TABLE chain_events ADD COLUMN hash_scheme TEXT NOT NULL DEFAULT 'json-sha256'")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS chain_checkpoints (
+                    name TEXT PRIMARY KEY,
+                    last_id INTEGER NOT NULL,
+                    last_hash TEXT,
+                    checked_records INTEGER NOT NULL,
+                    verified_at TEXT NOT NULL,
+                    full_verified_at TEXT NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS chain_blocks (
+                    block_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    first_event_id INTEGER NOT NULL,
+                    last_event_id INTEGER UNIQUE NOT NULL,
+                    event_count INTEGER NOT NULL,
+                    merkle_root TEXT NOT NULL,
+                    prev_block_root TEXT,
                     created_at TEXT NOT NULL
                 )
             """)
-            conn.commit()
-        finally:
-            conn.close()
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_chain_events_trace_id ON chain_events(trace_id)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_chain_events_actor_did ON chain_events(actor_did)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_chain_events_event_type ON chain_events(event_type)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_chain_events_created_at ON chain_events(created_at)')
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS actor_reputation (
+                    actor_did TEXT PRIMARY KEY,
+                    actor_name TEXT,
+                    actor_type TEXT,
+                    contribution_count INTEGER NOT NULL,
+                    impact_sum REAL NOT NULL,
+                    trust_delta_sum REAL NOT NULL,
+                    last_event_at TEXT NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS chain_archives (
+                    segment_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    first_id INTEGER NOT NULL,
+                    last_id INTEGER UNIQUE NOT NULL,
+                    event_count INTEGER NOT NULL,
+                    first_prev_hash TEXT,
+                    last_record_hash TEXT NOT NULL,
+                    file_name TEXT NOT NULL,
+                    file_sha256 TEXT NOT NULL,
+                    created_at TEXT NOT NULL
+                )
+            """)
+            if conn.execute('SELECT 1 FROM actor_reputation LIMIT 1').fetchone() is None:
+                # Backfill from history once, for chains created before the table existed.
+                conn.execute("""
+                    INSERT OR IGNORE INTO actor_reputation (
+                        actor_did, actor_name, actor_type, contribution_count, impact_sum, trust_delta_sum, last_event_at
+                    )
+                    SELECT actor_did, MAX(actor_name), MAX(actor_type), COUNT(*), SUM(impact_score), SUM(trust_delta), MAX(created_at)
+                    FROM chain_events
+                    WHERE actor_did IS NOT NULL
+                    GROUP BY actor_did
+                """)
+
+    def _row_error(self, row: sqlite3.Row | dict[str, Any], prev_hash: str | None) -> str | None:
+        if row['prev_hash'] != prev_hash:
+            return f'Prev hash mismatch at id {row["id"]}'
+        # Archive segments written before hash_scheme existed have no such key.
+        hash_scheme = row['hash_scheme'] if 'hash_scheme' in row.keys() else LEGACY_HASH_SCHEME
+        expected = chain_record_hash(
+            hash_scheme, trace_id=row['trace_id'], event_type=row['event_type'], actor_did=row['actor_did'], actor_name=row['actor_name'],
+            actor_type=row['actor_type'], impact_score=row['impact_score'], trust_delta=row['trust_delta'],
+            payload_json=row['payload_json'], prev_hash=row['prev_hash'], created_at=row['created_at'],
+        )
+        if row['record_hash'] != expected:
+            return f'Record hash mismatch at id {row["id"]}'
+        return None
 
-    def _last_hash(self) -> str | None:
-        conn = self._connect()
-        try:
-            row = conn.execute('SELECT record_hash FROM chain_events ORDER BY id DESC LIMIT 1').fetchone()
-            return row['record_hash'] if row else None
-        finally:
-            conn.close()
+    def _writer_conn(self) -> sqlite3.Connection:
+        # The pool's autocommit writer; transactions are opened explicitly with BEGIN IMMEDIATE.
+        return self.pool.writer
 
-    def add_event(self, *, trace_id: str, event_type: str, actor_name: str, actor_type: str, impact_score: float, trust_delta: float, payload: dict[str, Any], actor_did: str | None = None) -> dict[str, Any]:
-        prev_hash = self._last_hash()
-        created_at = utc_now()
-        actor_did = actor_did or f'did:hope:{re.sub(r"[^a-zA-Z0-9]+", "-", actor_name.lower()).strip("-") or "unknown"}'
-        canonical = json.dumps({
-            'trace_id': trace_id, 'event_type': event_type, 'actor_did': actor_did, 'actor_name': actor_name,
-            'actor_type': actor_type, 'impact_score': impact_score, 'trust_delta': trust_delta,
-            'payload': payload, 'prev_hash': prev_hash, 'created_at': created_at
-        }, sort_keys=True)
-        import hashlib
-        record_hash = hashlib.sha256(canonical.encode('utf-8')).hexdigest()
-        conn = self._connect()
-        try:
+    @staticmethod
+    def _tip_version_of(conn: sqlite3.Connection) -> tuple[int, int]:
+        # data_version moves on commits by other connections; total_changes on writes by
+        # other stores sharing this pooled writer. Read it before COMMIT: our own commit
+        # moves neither, and afterwards another connection may already have written.
+        return conn.execute('PRAGMA data_version').fetchone()[0], conn.total_changes
+
+    def _begin_append(self, conn: sqlite3.Connection) -> tuple[int, str | None]:
+        """Open the write transaction and return the current chain tip as (id, record_hash).
+
+        BEGIN IMMEDIATE takes the database write lock, so writers in other processes
+        queue behind us. The cached tip is reused unless anyone else has written to the
+        database since our last append.
+        """
+        conn.execute('BEGIN IMMEDIATE')
+        tip_version = self._tip_version_of(conn)
+        if self._tip is None or tip_version != self._tip_version:
+            row = conn.execute('SELECT id, record_hash FROM chain_events ORDER BY id DESC LIMIT 1').fetchone()
+            if row is None:
+                row = conn.execute('SELECT last_id AS id, last_record_hash AS record_hash FROM chain_archives ORDER BY last_id DESC LIMIT 1').fetchone()
+            self._tip = (row['id'], row['record_hash']) if row else (0, None)
+            self._sealed_through = conn.execute('SELECT COALESCE(MAX(last_event_id), 0) FROM chain_blocks').fetchone()[0]
+            self._tip_version = tip_version
+        return self._tip
+
+    @staticmethod
+    def _upsert_reputation_tx(conn: sqlite3.Connection, records: list[dict[str, Any]]) -> None:
+        totals: dict[str, list[Any]] = {}
+        for record in records:
+            entry = totals.setdefault(record['actor_did'], [record['actor_name'], record['actor_type'], 0, 0.0, 0.0, record['created_at']])
+            entry[0], entry[1], entry[5] = record['actor_name'], record['actor_type'], record['created_at']
+            entry[2] += 1
+            entry[3] += float(record['impact_score'])
+            entry[4] += float(record['trust_delta'])
+        conn.executemany(
+            """
+            INSERT INTO actor_reputation (
+                actor_did, actor_name, actor_type, contribution_count, impact_sum, trust_delta_sum, last_event_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(actor_did) DO UPDATE SET
+                actor_name=excluded.actor_name,
+                actor_type=excluded.actor_type,
+                contribution_count=contribution_count + excluded.contribution_count,
+                impact_sum=impact_sum + excluded.impact_sum,
+                trust_delta_sum=trust_delta_sum + excluded.trust_delta_sum,
+                last_event_at=excluded.last_event_at
+            """,
+            [(did, *entry) for did, entry in totals.items()],
+        )
+
+    def get_reputation(self, actor_did: str) -> Optional[dict[str, Any]]:
+        with self.pool.read() as conn:
+            row = conn.execute('SELECT * FROM actor_reputation WHERE actor_did = ?', (actor_did,)).fetchone()
+            return dict(row) if row else None
+
+    def _seal_blocks(self, conn: sqlite3.Connection, tip_id: int) -> None:
+        """Group every full run of ``block_size`` unsealed events into a Merkle block.
+
+        Runs inside the append transaction, so blocks never lag the events they cover.
+        """
+        while tip_id - self._sealed_through >= self.block_size:
+            rows = conn.execute(
+                'SELECT id, record_hash FROM chain_events WHERE id > ? ORDER BY id ASC LIMIT ?',
+                (self._sealed_through, self.block_size),
+            ).fetchall()
+            if len(rows) < self.block_size:
+                return
+            prev = conn.execute('SELECT merkle_root FROM chain_blocks ORDER BY block_id DESC LIMIT 1').fetchone()
             conn.execute(
-                'INSERT INTO chain_events (trace_id,event_type,actor_did,actor_name,actor_type,impact_score,trust_delta,payload_json,record_hash,prev_hash,created_at) VALUES (?,?,?,?,?,?,?,?,?,?,?)',
-                (trace_id, event_type, actor_did, actor_name, actor_type, float(impact_score), float(trust_delta), json.dumps(payload), record_hash, prev_hash, created_at)
+                'INSERT INTO chain_blocks (first_event_id, last_event_id, event_count, merkle_root, prev_block_root, created_at) VALUES (?,?,?,?,?,?)',
+                (rows[0]['id'], rows[-1]['id'], len(rows), merkle_root([r['record_hash'] for r in rows]), prev['merkle_root'] if prev else None, utc_now()),
             )
-            conn.commit()
-        finally:
-            conn.close()
-        return {
-            'trace_id': trace_id, 'event_type': event_type, 'actor_did': actor_did, 'actor_name': actor_name,
-            'actor_type': actor_type, 'impact_score': round(float(impact_score), 4), 'trust_delta': round(float(trust_delta), 4),
-            'payload': payload, 'record_hash': record_hash, 'prev_hash': prev_hash, 'created_at': created_at
-        }
+            self._sealed_through = rows[-1]['id']
+
+    def add_event(self, *, trace_id: str, event_type: str, actor_name: str, actor_type: str, impact_score: float, trust_delta: float, payload: dict[str, Any], actor_did: str | None = None) -> dict[str, Any]:
+        return self.add_events([{
+            'trace_id': trace_id, 'event_type': event_type, 'actor_name': actor_name, 'actor_type': actor_type,
+            'impact_score': impact_score, 'trust_delta': trust_delta, 'payload': payload, 'actor_did': actor_did,
+        }])[0]
+
+    def add_events(self, events: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Hash-link a batch of events in memory and append them in a single transaction.
+
+        Each item takes the keyword arguments of ``add_event``. Either every event is
+        committed or none is.
+        """
+        if not events:
+            return []
+        with self._write_lock:
+            conn = self._writer_conn()
+            try:
+                _, prev_hash = self._begin_append(conn)
+                rows: list[tuple[Any, ...]] = []
+                records: list[dict[str, Any]] = []
+                for event in events:
+                    actor_name = event['actor_name']
+                    actor_did = event.get('actor_did') or f'did:hope:{re.sub(r"[^a-zA-Z0-9]+", "-", actor_name.lower()).strip("-") or "unknown"}'
+                    created_at = utc_now()
+                    impact_score, trust_delta = float(event['impact_score']), float(event['trust_delta'])
+                    payload_json = canonical_payload_json(event['payload'])
+                    record_hash = chain_record_hash(
+                        self.hash_scheme, trace_id=event['trace_id'], event_type=event['event_type'], actor_did=actor_did, actor_name=actor_name,
+                        actor_type=event['actor_type'], impact_score=impact_score, trust_delta=trust_delta,
+                        payload_json=payload_json, prev_hash=prev_hash, created_at=created_at,
+                    )
+                    rows.append((
+                        event['trace_id'], event['event_type'], actor_did, actor_name, event['actor_type'],
+                        impact_score, trust_delta, payload_json, record_hash, prev_hash, created_at, self.hash_scheme,
+                    ))
+                    records.append({
+                        'trace_id': event['trace_id'], 'event_type': event['event_type'], 'actor_did': actor_did, 'actor_name': actor_name,
+                        'actor_type': event['actor_type'], 'impact_score': round(impact_score, 4), 'trust_delta': round(trust_delta, 4),
+                        'payload': event['payload'], 'record_hash': record_hash, 'prev_hash': prev_hash, 'created_at': created_at,
+                        'hash_scheme': self.hash_scheme,
+                    })
+                    prev_hash = record_hash
+                conn.executemany(
+                    'INSERT INTO chain_events (trace_id,event_type,actor_did,actor_name,actor_type,impact_score,trust_delta,payload_json,record_hash,prev_hash,created_at,hash_scheme) VALUES (?,?,?,?,?,?,?,?,?,?,?,?)',
+                    rows,
+                )
+                # We hold the write lock, so AUTOINCREMENT ids inside the batch are contiguous.
+                last_id = conn.execute('SELECT last_insert_rowid()').fetchone()[0]
+                self._upsert_reputation_tx(conn, records)
+                self._seal_blocks(conn, last_id)
+                tip_version = self._tip_version_of(conn)
+                conn.execute('COMMIT')
+            except BaseException:
+                if conn.in_transaction:
+                    conn.execute('ROLLBACK')
+                self._tip = None
+                raise
+            self._tip, self._tip_version = (last_id, prev_hash), tip_version
+            first_id = last_id - len(records) + 1
+            records = [{'id': first_id + offset, **record} for offset, record in enumerate(records)]
+            self._notify(records)
+        return records
 
     def list_recent_events(self, limit: int = 20) -> list[dict[str, Any]]:
-        conn = self._connect()
-        try:
-            rows = conn.execute('SELECT * FROM chain_events ORDER BY id DESC LIMIT ?', (max(1, min(limit, 200)),)).fetchall()
+        return self.list_events(limit=limit)
+
+    def list_events(
+        self,
+        limit: int = 20,
+        before_id: Optional[int] = None,
+        after_id: Optional[int] = None,
+        trace_id: Optional[str] = None,
+        actor_did: Optional[str] = None,
+        event_type: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> list[dict[str, Any]]:
+        """Keyset-paginated, newest-first event listing.
+
+        ``before_id``/``after_id`` are exclusive id cursors, so each page costs a
+        bounded index range scan regardless of how deep into history it is.
+        """
+        clauses: list[str] = []
+        params: list[Any] = []
+        for column, op, value in (
+            ('id', '<', before_id), ('id', '>', after_id), ('trace_id', '=', trace_id), ('actor_did', '=', actor_did),
+            ('event_type', '=', event_type), ('created_at', '>=', since), ('created_at', '<', until),
+        ):
+            if value is not None:
+                clauses.append(f'{column} {op} ?')
+                params.append(value)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        # Paging forward from after_id walks the index upwards; the page is flipped back to newest-first below.
+        order = 'ASC' if after_id is not None and before_id is None else 'DESC'
+        params.append(max(1, min(limit, 200)))
+
+        limit = params[-1]
+
+        def matches(row: dict[str, Any]) -> bool:
+            return (
+                (before_id is None or row['id'] < before_id) and (after_id is None or row['id'] > after_id)
+                and all(value is None or row[name] == value for name, value in (('trace_id', trace_id), ('actor_did', actor_did), ('event_type', event_type)))
+                and (since is None or row['created_at'] >= since) and (until is None or row['created_at'] < until)
+            )
+
+        with self.pool.read() as conn:
+            archived_through = self._archived_through(conn)
+            rows: list[Any] = []
+            if order == 'ASC' and after_id is not None and after_id < archived_through:
+                rows.extend(self._archived_matches(conn, matches, limit, after_id, before_id, ascending=True))
+            if len(rows) < limit:
+                params[-1] = limit - len(rows)
+                rows.extend(conn.execute(f'SELECT * FROM chain_events {where} ORDER BY id {order} LIMIT ?', params).fetchall())
+            if order == 'DESC' and len(rows) < limit and archived_through and (after_id is None or after_id < archived_through):
+                rows.extend(self._archived_matches(conn, matches, limit - len(rows), after_id, before_id, ascending=False))
             items = []
             for row in rows:
                 item = dict(row)
                 item['payload'] = json.loads(item.pop('payload_json') or '{}')
                 items.append(item)
+            if order == 'ASC':
+                items.reverse()
             return items
-        finally:
-            conn.close()
 
-    def verify_chain(self) -> dict[str, Any]:
-        conn = self._connect()
-        try:
-            rows = conn.execute('SELECT * FROM chain_events ORDER BY id ASC').fetchall()
-            import hashlib
-            prev_hash = None
+    # -- export / import ----------------------------------------------
+
+    def export_ndjson(self, after_id: int = 0, batch_size: int = 1000) -> Iterator[bytes]:
+        """Yield records with id > ``after_id`` as NDJSON chunks of up to ``batch_size`` lines.
+
+        The export stops at the tip seen when it starts. Archived segments are
+        streamed line by line and hot rows are read in keyset pages on the calling
+        thread's pooled reader, so memory stays bounded however long the chain is.
+        """
+        with self.pool.read() as conn:
+            last_id = max(conn.execute('SELECT COALESCE(MAX(id), 0) FROM chain_events').fetchone()[0], self._archived_through(conn))
+            segments = conn.execute('SELECT file_name, last_id FROM chain_archives WHERE last_id > ? ORDER BY first_id ASC', (after_id,)).fetchall()
+
+        for segment in segments:
+            chunk: list[bytes] = []
+            with gzip.open(self.archive_dir / segment['file_name'], 'rt', encoding='utf-8') as handle:
+                for line in handle:
+                    row = json.loads(line)
+                    if row['id'] <= after_id:
+                        continue
+                    row['payload'] = json.loads(row['payload_json'] or '{}')
+                    chunk.append(chain_export_line(row))
+                    if len(chunk) >= batch_size:
+                        yield b''.join(chunk)
+                        chunk = []
+            if chunk:
+                yield b''.join(chunk)
+            after_id = max(after_id, segment['last_id'])
+
+        while after_id < last_id:
+            with self.pool.read() as conn:
+                rows = conn.execute('SELECT * FROM chain_events WHERE id > ? AND id <= ? ORDER BY id ASC LIMIT ?', (after_id, last_id, batch_size)).fetchall()
+            if not rows:
+                break
+            chunk = []
+            for row in rows:
+                record = dict(row)
+                record['payload'] = json.loads(record['payload_json'] or '{}')
+                chunk.append(chain_export_line(record))
+            yield b''.join(chunk)
+            after_id = rows[-1]['id']
+
+    def import_ndjson(self, lines: Iterable[bytes | str], batch_size: int = 1000) -> dict[str, Any]:
+        """Bulk-load exported records onto the current tip in one transaction.
+
+        Every record must carry the next id and link to the previous hash, and is
+        re-hashed as it is read, so the import is verified in a single pass. Any
+        bad line rolls the whole import back.
+        """
+        with self._write_lock:
+            conn = self._writer_conn()
+            try:
+                tip_id, prev_hash = self._begin_append(conn)
+                first_id = tip_id + 1
+                line_no = 0
+                batch: list[dict[str, Any]] = []
+
+                def flush() -> None:
+                    conn.executemany(
+                        'INSERT INTO chain_events (id,trace_id,event_type,actor_did,actor_name,actor_type,impact_score,trust_delta,payload_json,record_hash,prev_hash,created_at,hash_scheme) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)',
+                        [(r['id'], r['trace_id'], r['event_type'], r['actor_did'], r['actor_name'], r['actor_type'], r['impact_score'], r['trust_delta'], r['payload_json'], r['record_hash'], r['prev_hash'], r['created_at'], r['hash_scheme']) for r in batch],
+                    )
+                    self._upsert_reputation_tx(conn, batch)
+                    batch.clear()
+
+                for line_no, line in enumerate(lines, start=1):
+                    if not line.strip():
+                        continue
+                    try:
+                        record = json.loads(line)
+                        row = {name: record[name] for name in CHAIN_EXPORT_FIELDS if name not in {'payload', 'hash_scheme'}}
+                        row['hash_scheme'] = record.get('hash_scheme', LEGACY_HASH_SCHEME)
+                        row['payload_json'] = canonical_payload_json(record['payload'])
+                    except (ValueError, KeyError, TypeError) as exc:
+                        raise ValueError(f'Malformed record on line {line_no}: {exc}') from exc
+                    if row['id'] != tip_id + 1:
+                        raise ValueError(f'Expected id {tip_id + 1} on line {line_no}, got {row["id"]}')
+                    error = self._row_error(row, prev_hash)
+                    if error:
+                        raise ValueError(f'{error} (line {line_no})')
+                    batch.append(row)
+                    tip_id, prev_hash = row['id'], row['record_hash']
+                    if len(batch) >= batch_size:
+                        flush()
+                if batch:
+                    flush()
+                self._seal_blocks(conn, tip_id)
+                tip_version = self._tip_version_of(conn)
+                conn.execute('COMMIT')
+            except ValueError as exc:
+                conn.execute('ROLLBACK')
+                self._tip = None
+                return {'ok': False, 'imported': 0, 'error': str(exc)}
+            except BaseException:
+                if conn.in_transaction:
+                    conn.execute('ROLLBACK')
+                self._tip = None
+                raise
+            self._tip, self._tip_version = (tip_id, prev_hash), tip_version
+            self._notify([])
+        return {'ok': True, 'imported': tip_id - first_id + 1, 'first_id': first_id, 'last_id': tip_id, 'tip_hash': prev_hash}
+
+    # -- archive tier ---------------------------------------------------
+
+    @staticmethod
+    def _archived_through(conn: sqlite3.Connection) -> int:
+        return conn.execute('SELECT COALESCE(MAX(last_id), 0) FROM chain_archives').fetchone()[0]
+
+    def _read_archive(self, file_name: str) -> list[dict[str, Any]]:
+        """Decompress one archive segment, keeping the few most recent ones in memory."""
+        with self._archive_lock:
+            cached = self._archive_cache.get(file_name)
+            if cached is not None:
+                self._archive_cache.move_to_end(file_name)
+                return cached
+        with gzip.open(self.archive_dir / file_name, 'rt', encoding='utf-8') as handle:
+            rows = [json.loads(line) for line in handle]
+        with self._archive_lock:
+            self._archive_cache[file_name] = rows
+            while len(self._archive_cache) > 4:
+                self._archive_cache.popitem(last=False)
+        return rows
+
+    def _archived_matches(self, conn: sqlite3.Connection, matches, limit: int, after_id: Optional[int], before_id: Optional[int], ascending: bool) -> list[dict[str, Any]]:
+        order = 'ASC' if ascending else 'DESC'
+        segments = conn.execute(
+            f'SELECT file_name FROM chain_archives WHERE last_id > ? AND first_id < ? ORDER BY first_id {order}',
+            (after_id or 0, before_id if before_id is not None else 2 ** 63 - 1),
+        ).fetchall()
+        found: list[dict[str, Any]] = []
+        for segment in segments:
+            rows = self._read_archive(segment['file_name'])
+            for row in (rows if ascending else reversed(rows)):
+                if matches(row):
+                    found.append(row)
+                    if len(found) >= limit:
+                        return found
+        return found
+
+    def _rows_between(self, conn: sqlite3.Connection, first_id: int, last_id: int) -> list[Any]:
+        """Rows with ids in [first_id, last_id] from the archive tier and the hot table, in id order."""
+        rows: list[Any] = []
+        for segment in conn.execute(
+            'SELECT file_name FROM chain_archives WHERE last_id >= ? AND first_id <= ? ORDER BY first_id ASC',
+            (first_id, last_id),
+        ):
+            rows.extend(row for row in self._read_archive(segment['file_name']) if first_id <= row['id'] <= last_id)
+        rows.extend(conn.execute('SELECT * FROM chain_events WHERE id BETWEEN ? AND ? ORDER BY id ASC', (first_id, last_id)))
+        return rows
+
+    def _hash_before(self, conn: sqlite3.Connection, event_id: int) -> str | None:
+        row = conn.execute('SELECT record_hash FROM chain_events WHERE id < ? ORDER BY id DESC LIMIT 1', (event_id,)).fetchone()
+        if row is not None:
+            return row['record_hash']
+        segment = conn.execute('SELECT file_name FROM chain_archives WHERE first_id < ? ORDER BY first_id DESC LIMIT 1', (event_id,)).fetchone()
+        if segment is None:
+            return None
+        return [r for r in self._read_archive(segment['file_name']) if r['id'] < event_id][-1]['record_hash']
+
+    @staticmethod
+    def _file_sha256(path: Path) -> str:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as handle:
+            for chunk in iter(lambda: handle.read(1 << 20), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def compact(self, keep_recent: int = 100_000) -> dict[str, Any]:
+        """Move sealed, already-verified ranges out of chain_events into gzip NDJSON archive segments.
+
+        Only whole Merkle blocks at or below the verification checkpoint are moved,
+        and at least ``keep_recent`` events stay hot. Each segment records its
+        boundary hashes, so verify_chain can prove continuity across it.
+        """
+        verify = self.verify_chain()
+        if not verify['ok']:
+            return {'ok': False, 'archived_segments': 0, 'archived_events': 0, 'error': f"Refusing to archive an unverified chain: {verify.get('error')}"}
+
+        with self.pool.read() as conn:
+            tip = conn.execute('SELECT COALESCE(MAX(id), 0) FROM chain_events').fetchone()[0]
+            limit_id = min(tip - max(1, keep_recent), verify['checkpoint_id'])
+            block_ends = [row[0] for row in conn.execute(
+                'SELECT last_event_id FROM chain_blocks WHERE last_event_id > ? AND last_event_id <= ? ORDER BY last_event_id ASC',
+                (self._archived_through(conn), limit_id),
+            )]
+
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        archived_segments = archived_events = 0
+        start_index = 0
+        while start_index < len(block_ends):
+            with self.pool.read() as conn:
+                first_after = self._archived_through(conn)
+            # Cut the segment at the last block boundary that keeps it within archive_segment_events.
+            end_index = start_index
+            while end_index + 1 < len(block_ends) and block_ends[end_index + 1] - first_after <= self.archive_segment_events:
+                end_index += 1
+            result = self._archive_range(first_after, block_ends[end_index])
+            if result is None:
+                break
+            archived_segments += 1
+            archived_events += result
+            start_index = end_index + 1
+
+        with self.pool.read() as conn:
+            archived_through = self._archived_through(conn)
+        return {'ok': True, 'archived_segments': archived_segments, 'archived_events': archived_events, 'archived_through': archived_through}
+
+    def _archive_range(self, after_id: int, last_id: int) -> Optional[int]:
+        with self.pool.read() as conn:
+            rows = [dict(row) for row in conn.execute('SELECT * FROM chain_events WHERE id > ? AND id <= ? ORDER BY id ASC', (after_id, last_id))]
+        if not rows:
+            return None
+
+        file_name = f'chain-{rows[0]["id"]:012d}-{rows[-1]["id"]:012d}.ndjson.gz'
+        final_path = self.archive_dir / file_name
+        tmp_path = final_path.with_suffix('.tmp')
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as handle:
+            for row in rows:
+                handle.write(json.dumps(row, separators=(',', ':')) + '\n')
+        with open(tmp_path, 'rb') as handle:
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, final_path)
+        file_sha256 = self._file_sha256(final_path)
+
+        with self._write_lock:
+            conn = self._writer_conn()
+            try:
+                conn.execute('BEGIN IMMEDIATE')
+                if self._archived_through(conn) != after_id:
+                    # Another compactor got here first.
+                    conn.execute('ROLLBACK')
+                    return None
+                conn.execute(
+                    'INSERT INTO chain_archives (first_id, last_id, event_count, first_prev_hash, last_record_hash, file_name, file_sha256, created_at) VALUES (?,?,?,?,?,?,?,?)',
+                    (rows[0]['id'], rows[-1]['id'], len(rows), rows[0]['prev_hash'], rows[-1]['record_hash'], file_name, file_sha256, utc_now()),
+                )
+                conn.execute('DELETE FROM chain_events WHERE id > ? AND id <= ?', (after_id, last_id))
+                conn.execute('COMMIT')
+            except BaseException:
+                if conn.in_transaction:
+                    conn.execute('ROLLBACK')
+                raise
+        return len(rows)
+
+    @staticmethod
+    def _stored_checkpoint(conn: sqlite3.Connection) -> Optional[sqlite3.Row]:
+        return conn.execute("SELECT * FROM chain_checkpoints WHERE name = 'verify'").fetchone()
+
+    def _load_checkpoint(self, conn: sqlite3.Connection) -> Optional[dict[str, Any]]:
+        row = self._stored_checkpoint(conn)
+        if not row:
+            return None
+        anchor = conn.execute('SELECT record_hash FROM chain_events WHERE id = ?', (row['last_id'],)).fetchone()
+        if anchor is None:
+            anchor = conn.execute('SELECT last_record_hash AS record_hash FROM chain_archives WHERE last_id = ?', (row['last_id'],)).fetchone()
+        if row['last_id'] and (not anchor or anchor['record_hash'] != row['last_hash']):
+            # The anchor row was rewritten or removed: the checkpoint can no longer be trusted.
+            return None
+        return dict(row)
+
+    def _save_checkpoint(self, *, last_id: int, last_hash: str | None, checked_records: int, full_verified_at: str) -> None:
+        with self.pool.write() as conn:
+            conn.execute(
+                """
+                INSERT INTO chain_checkpoints (name, last_id, last_hash, checked_records, verified_at, full_verified_at)
+                VALUES ('verify', ?, ?, ?, ?, ?)
+                ON CONFLICT(name) DO UPDATE SET
+                    last_id=excluded.last_id,
+                    last_hash=excluded.last_hash,
+                    checked_records=excluded.checked_records,
+                    verified_at=excluded.verified_at,
+                    full_verified_at=excluded.full_verified_at
+                """,
+                (last_id, last_hash, checked_records, utc_now(), full_verified_at),
+            )
+
+    def verify_chain(self, full: bool = False, deep_archives: bool = False) -> dict[str, Any]:
+        """Verify the hash chain, re-hashing only the tail past the persisted checkpoint.
+
+        With ``full=True`` (or when no trusted checkpoint exists) the chain is
+        re-verified from genesis and the checkpoint is rebuilt. Archived segments
+        are checked by boundary hashes and file checksum; ``deep_archives`` also
+        re-hashes every archived record. The checkpoint is only written when it
+        moves, so repeated calls on an idle chain stay read-only.
+        """
+        started_at = utc_now()
+        with self.pool.read() as conn:
+            stored = self._stored_checkpoint(conn)
+            checkpoint = None if full else self._load_checkpoint(conn)
+            mode = 'incremental' if checkpoint else 'full'
+            last_id = checkpoint['last_id'] if checkpoint else 0
+            prev_hash = checkpoint['last_hash'] if checkpoint else None
+            base_checked = checkpoint['checked_records'] if checkpoint else 0
+
             checked = 0
+            error = None
+            for segment in conn.execute('SELECT * FROM chain_archives WHERE first_id > ? ORDER BY first_id ASC', (last_id,)).fetchall():
+                if segment['first_prev_hash'] != prev_hash:
+                    error = f'Prev hash mismatch at id {segment["first_id"]}'
+                elif self._file_sha256(self.archive_dir / segment['file_name']) != segment['file_sha256']:
+                    error = f'Archive segment {segment["segment_id"]} checksum mismatch'
+                elif deep_archives:
+                    archived_prev = prev_hash
+                    for row in self._read_archive(segment['file_name']):
+                        error = self._row_error(row, archived_prev)
+                        if error:
+                            break
+                        archived_prev = row['record_hash']
+                    if not error and archived_prev != segment['last_record_hash']:
+                        error = f'Archive segment {segment["segment_id"]} boundary mismatch'
+                if error:
+                    break
+                prev_hash = segment['last_record_hash']
+                last_id = segment['last_id']
+                checked += segment['event_count']
+
+            rows = conn.execute('SELECT * FROM chain_events WHERE id > ? ORDER BY id ASC', (last_id,)) if not error else []
             for row in rows:
-                payload = json.loads(row['payload_json'] or '{}')
-                canonical = json.dumps({
-                    'trace_id': row['trace_id'], 'event_type': row['event_type'], 'actor_did': row['actor_did'], 'actor_name': row['actor_name'],
-                    'actor_type': row['actor_type'], 'impact_score': row['impact_score'], 'trust_delta': row['trust_delta'],
-                    'payload': payload, 'prev_hash': row['prev_hash'], 'created_at': row['created_at']
-                }, sort_keys=True)
-                expected = hashlib.sha256(canonical.encode('utf-8')).hexdigest()
-                if row['prev_hash'] != prev_hash:
-                    return {'ok': False, 'checked_records': checked, 'error': f'Prev hash mismatch at id {row["id"]}'}
-                if row['record_hash'] != expected:
-                    return {'ok': False, 'checked_records': checked, 'error': f'Record hash mismatch at id {row["id"]}'}
+                error = self._row_error(row, prev_hash)
+                if error:
+                    break
                 prev_hash = row['record_hash']
+                last_id = row['id']
                 checked += 1
-            return {'ok': True, 'checked_records': checked}
+
+        # Only a clean full pass earns a new full_verified_at; a failed one keeps the previous stamp.
+        if checkpoint:
+            full_verified_at = checkpoint['full_verified_at']
+        elif error is None:
+            full_verified_at = started_at
+        else:
+            full_verified_at = stored['full_verified_at'] if stored else None
+        # Advance (or, after a failed full pass, pull back) the checkpoint to the last good record.
+        moved = stored is None or (stored['last_id'], stored['last_hash'], stored['full_verified_at']) != (last_id, prev_hash, full_verified_at)
+        if full_verified_at is not None and moved:
+            self._save_checkpoint(last_id=last_id, last_hash=prev_hash, checked_records=base_checked + checked, full_verified_at=full_verified_at)
+        return verify_result(error, base_checked + checked, checked, mode, last_id, full_verified_at)
+
+    def _block_for_event(self, conn: sqlite3.Connection, event_id: int) -> Optional[sqlite3.Row]:
+        return conn.execute(
+            'SELECT * FROM chain_blocks WHERE last_event_id >= ? ORDER BY last_event_id ASC LIMIT 1',
+            (event_id,),
+        ).fetchone()
+
+    def get_inclusion_proof(self, event_id: int) -> Optional[dict[str, Any]]:
+        """Return a Merkle inclusion proof for one event, or None if it does not exist.
+
+        Events past the last sealed block come back with ``sealed`` set to False and no proof.
+        """
+        with self.pool.read() as conn:
+            event = conn.execute('SELECT id, record_hash FROM chain_events WHERE id = ?', (event_id,)).fetchone()
+            block = self._block_for_event(conn, event_id)
+            if event is None and block is not None and block['first_event_id'] <= event_id:
+                event = next((r for r in self._rows_between(conn, event_id, event_id)), None)
+            if not event:
+                return None
+            if not block or block['first_event_id'] > event_id:
+                return {'event_id': event_id, 'record_hash': event['record_hash'], 'sealed': False}
+            block_rows = self._rows_between(conn, block['first_event_id'], block['last_event_id'])
+            leaves = [r['record_hash'] for r in block_rows]
+            index = sum(1 for r in block_rows if r['id'] < event_id)
+            return {
+                'event_id': event_id,
+                'record_hash': event['record_hash'],
+                'sealed': True,
+                'block_id': block['block_id'],
+                'merkle_root': block['merkle_root'],
+                'prev_block_root': block['prev_block_root'],
+                'leaf_index': index,
+                'event_count': block['event_count'],
+                'proof': merkle_proof(leaves, index),
+            }
+
+    def verify_block(self, block_id: int) -> dict[str, Any]:
+        """Re-hash the events of one sealed block and check its links and Merkle root."""
+        with self.pool.read() as conn:
+            block = conn.execute('SELECT * FROM chain_blocks WHERE block_id = ?', (block_id,)).fetchone()
+            if not block:
+                return {'ok': False, 'block_id': block_id, 'error': 'Block not found'}
+            rows = self._rows_between(conn, block['first_event_id'], block['last_event_id'])
+            prev_hash = self._hash_before(conn, block['first_event_id'])
+            for row in rows:
+                error = self._row_error(row, prev_hash)
+                if error:
+                    return {'ok': False, 'block_id': block_id, 'error': error}
+                prev_hash = row['record_hash']
+            if len(rows) != block['event_count'] or merkle_root([r['record_hash'] for r in rows]) != block['merkle_root']:
+                return {'ok': False, 'block_id': block_id, 'error': 'Merkle root mismatch'}
+            return {'ok': True, 'block_id': block_id, 'checked_records': len(rows), 'merkle_root': block['merkle_root']}
+
+
+class SegmentLogChainDB(ChainListeners):
+    """Append-only segmented log backend for HOPEChain.
+
+    Records are compact JSON lines appended to size-capped segment files. Each
+    segment has a sidecar ``.idx`` of fixed-width (offset, length) entries, so
+    ids are sequential and a record is located without scanning. Reads are
+    slices of an mmap of the segment. The trace_id/actor_did/event_type
+    postings and the per-actor reputation are rebuilt in memory on open.
+
+    ``_index_lock`` guards that in-memory index (segments, postings, reputation,
+    tip and mmaps); readers copy what they need under it and parse outside it.
+    """
+
+    INDEX_ENTRY = struct.Struct('>QI')
+
+    def __init__(self, log_dir: str, block_size: int = 64, segment_bytes: int = 64 * 1024 * 1024, fsync: bool = False, hash_scheme: str = 'bin1-sha256') -> None:
+        if hash_scheme not in CHAIN_HASH_SCHEMES:
+            raise ValueError(f'Unknown chain hash scheme: {hash_scheme}')
+        self.hash_scheme = hash_scheme
+        self.log_dir = Path(log_dir)
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        self.block_size = max(1, block_size)
+        self.segment_bytes = max(4096, segment_bytes)
+        self.fsync = fsync
+        self._listeners = []
+        self._write_lock = threading.Lock()
+        self._index_lock = threading.RLock()
+        self._segments: list[dict[str, Any]] = []
+        self._maps: dict[int, mmap.mmap] = {}
+        self._postings: dict[str, dict[str, list[int]]] = {'trace_id': {}, 'actor_did': {}, 'event_type': {}}
+        self._reputation: dict[str, dict[str, Any]] = {}
+        self._tip: tuple[int, str | None] = (0, None)
+        self._lock_file = open(self.log_dir / 'LOCK', 'a+b')
+        with self._process_lock():
+            self._recover_tail()
+            self._catch_up()
+
+    # -- storage layout -------------------------------------------------
+
+    def _segment_path(self, seq: int, suffix: str) -> Path:
+        return self.log_dir / f'segment-{seq:06d}.{suffix}'
+
+    @contextmanager
+    def _process_lock(self):
+        # flock on a lock file plays the role BEGIN IMMEDIATE plays for the SQLite backend.
+        if fcntl is not None:
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+        try:
+            yield
         finally:
-            conn.close()
+            if fcntl is not None:
+                fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def _refresh(self) -> None:
+        with self._write_lock:
+            self._catch_up()
+
+    def _recover_tail(self) -> None:
+        """Drop a torn write: data past the last index entry, or index entries past the data."""
+        seqs = sorted(int(p.stem.split('-')[1]) for p in self.log_dir.glob('segment-*.log'))
+        if not seqs:
+            return
+        data_path, idx_path = self._segment_path(seqs[-1], 'log'), self._segment_path(seqs[-1], 'idx')
+        idx = idx_path.read_bytes() if idx_path.exists() else b''
+        data_size = data_path.stat().st_size
+        entries = len(idx) // self.INDEX_ENTRY.size
+        end = 0
+        while entries:
+            offset, length = self.INDEX_ENTRY.unpack_from(idx, (entries - 1) * self.INDEX_ENTRY.size)
+            if offset + length <= data_size:
+                end = offset + length
+                break
+            entries -= 1
+        with open(idx_path, 'ab') as handle:
+            handle.truncate(entries * self.INDEX_ENTRY.size)
+        with open(data_path, 'ab') as handle:
+            handle.truncate(end)
+
+    def _catch_up(self) -> None:
+        """Load records appended since we last looked, by this or another process."""
+        next_seq = self._segments[-1]['seq'] if self._segments else 0
+        while True:
+            idx_path = self._segment_path(next_seq, 'idx')
+            if not idx_path.exists():
+                return
+            if self._segments and self._segments[-1]['seq'] == next_seq:
+                segment = self._segments[-1]
+            else:
+                first_id = self._segments[-1]['first_id'] + len(self._segments[-1]['offsets']) if self._segments else 1
+                segment = {'seq': next_seq, 'first_id': first_id, 'offsets': array('Q'), 'lengths': array('I'), 'size': 0}
+                with self._index_lock:
+                    self._segments.append(segment)
+            with open(idx_path, 'rb') as handle:
+                handle.seek(len(segment['offsets']) * self.INDEX_ENTRY.size)
+                fresh = handle.read()
+            known = len(segment['offsets'])
+            with self._index_lock:
+                for offset, length in self.INDEX_ENTRY.iter_unpack(fresh[: len(fresh) - len(fresh) % self.INDEX_ENTRY.size]):
+                    segment['offsets'].append(offset)
+                    segment['lengths'].append(length)
+                    segment['size'] = offset + length
+            for position in range(known, len(segment['offsets'])):
+                self._index_record(self._read(segment, position))
+            next_seq += 1
+
+    def _map(self, segment: dict[str, Any]) -> mmap.mmap:
+        with self._index_lock:
+            current = self._maps.get(segment['seq'])
+            if current is None or len(current) < segment['size']:
+                # The outgrown map is dropped, never closed: read_raw views may still
+                # point into it, and it is freed when the last of them is released.
+                with open(self._segment_path(segment['seq'], 'log'), 'rb') as handle:
+                    current = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+                self._maps[segment['seq']] = current
+            return current
+
+    def _read(self, segment: dict[str, Any], position: int) -> dict[str, Any]:
+        with self._index_lock:
+            offset, length = segment['offsets'][position], segment['lengths'][position]
+            mapped = self._map(segment)
+        return json.loads(mapped[offset: offset + length])
+
+    def _locate(self, event_id: int) -> tuple[dict[str, Any], int] | None:
+        with self._index_lock:
+            if event_id < 1 or event_id > self._tip[0]:
+                return None
+            index = bisect.bisect_right([s['first_id'] for s in self._segments], event_id) - 1
+            segment = self._segments[index]
+            return segment, event_id - segment['first_id']
+
+    def get_event(self, event_id: int) -> Optional[dict[str, Any]]:
+        located = self._locate(event_id)
+        return self._read(*located) if located else None
+
+    def read_raw(self, first_id: int, last_id: int):
+        """Yield zero-copy memoryview slices covering records ``first_id..last_id`` (one per segment)."""
+        with self._index_lock:
+            segments = list(self._segments)
+        for segment in segments:
+            with self._index_lock:
+                seg_first = segment['first_id']
+                seg_last = seg_first + len(segment['offsets']) - 1
+                lo, hi = max(first_id, seg_first), min(last_id, seg_last)
+                if lo > hi:
+                    continue
+                start = segment['offsets'][lo - seg_first]
+                end = segment['offsets'][hi - seg_first] + segment['lengths'][hi - seg_first]
+                mapped = self._map(segment)
+            yield memoryview(mapped)[start:end]
+
+    def _index_record(self, record: dict[str, Any]) -> None:
+        with self._index_lock:
+            for field_name, postings in self._postings.items():
+                value = record.get(field_name)
+                if value is not None:
+                    postings.setdefault(value, []).append(record['id'])
+            rep = self._reputation.setdefault(record['actor_did'], {
+                'actor_did': record['actor_did'], 'actor_name': record['actor_name'], 'actor_type': record['actor_type'],
+                'contribution_count': 0, 'impact_sum': 0.0, 'trust_delta_sum': 0.0, 'last_event_at': record['created_at'],
+            })
+            rep['actor_name'], rep['actor_type'], rep['last_event_at'] = record['actor_name'], record['actor_type'], record['created_at']
+            rep['contribution_count'] += 1
+            rep['impact_sum'] += float(record['impact_score'])
+            rep['trust_delta_sum'] += float(record['trust_delta'])
+            self._tip = (record['id'], record['record_hash'])
+
+    # -- appends ------------------------------------------------------
+
+    def add_event(self, *, trace_id: str, event_type: str, actor_name: str, actor_type: str, impact_score: float, trust_delta: float, payload: dict[str, Any], actor_did: str | None = None) -> dict[str, Any]:
+        return self.add_events([{
+            'trace_id': trace_id, 'event_type': event_type, 'actor_name': actor_name, 'actor_type': actor_type,
+            'impact_score': impact_score, 'trust_delta': trust_delta, 'payload': payload, 'actor_did': actor_did,
+        }])[0]
+
+    def add_events(self, events: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        if not events:
+            return []
+        with self._write_lock, self._process_lock():
+            self._catch_up()
+            tip_id, prev_hash = self._tip
+            records: list[dict[str, Any]] = []
+            for offset, event in enumerate(events, start=1):
+                actor_name = event['actor_name']
+                actor_did = event.get('actor_did') or f'did:hope:{re.sub(r"[^a-zA-Z0-9]+", "-", actor_name.lower()).strip("-") or "unknown"}'
+                record = {
+                    'id': tip_id + offset, 'trace_id': event['trace_id'], 'event_type': event['event_type'],
+                    'actor_did': actor_did, 'actor_name': actor_name, 'actor_type': event['actor_type'],
+                    'impact_score': float(event['impact_score']), 'trust_delta': float(event['trust_delta']),
+                    'payload': event['payload'], 'prev_hash': prev_hash, 'created_at': utc_now(), 'hash_scheme': self.hash_scheme,
+                }
+                record['record_hash'] = self._hash(record)
+                records.append(record)
+                prev_hash = record['record_hash']
+            self._write(records)
+            for record in records:
+                self._index_record(record)
+            self._notify([dict(record) for record in records])
+        return [dict(record) for record in records]
+
+    def _write(self, records: list[dict[str, Any]]) -> None:
+        pending = [json.dumps(record, separators=(',', ':')).encode('utf-8') + b'\n' for record in records]
+        while pending:
+            if not self._segments or (self._segments[-1]['size'] and self._segments[-1]['size'] + len(pending[0]) > self.segment_bytes):
+                seq = self._segments[-1]['seq'] + 1 if self._segments else 0
+                first_id = self._segments[-1]['first_id'] + len(self._segments[-1]['offsets']) if self._segments else 1
+                with self._index_lock:
+                    self._segments.append({'seq': seq, 'first_id': first_id, 'offsets': array('Q'), 'lengths': array('I'), 'size': 0})
+            segment = self._segments[-1]
+            chunk: list[bytes] = []
+            size = segment['size']
+            while pending and (not chunk and not segment['size'] or size + len(pending[0]) <= self.segment_bytes):
+                chunk.append(pending.pop(0))
+                size += len(chunk[-1])
+            entries = bytearray()
+            offset = segment['size']
+            for line in chunk:
+                entries += self.INDEX_ENTRY.pack(offset, len(line))
+                offset += len(line)
+            # Data before index: an index entry never points at bytes that are not on disk yet.
+            with open(self._segment_path(segment['seq'], 'log'), 'ab') as data:
+                data.write(b''.join(chunk))
+                data.flush()
+                if self.fsync:
+                    os.fsync(data.fileno())
+            with open(self._segment_path(segment['seq'], 'idx'), 'ab') as idx:
+                idx.write(entries)
+                idx.flush()
+                if self.fsync:
+                    os.fsync(idx.fileno())
+            with self._index_lock:
+                for line in chunk:
+                    segment['offsets'].append(segment['size'])
+                    segment['lengths'].append(len(line))
+                    segment['size'] += len(line)
+
+    # -- export / import ----------------------------------------------
+
+    def export_ndjson(self, after_id: int = 0, batch_size: int = 1000) -> Iterator[bytes]:
+        """Stream records with id > ``after_id``; segment bytes already are the export format."""
+        self._refresh()
+        last_id = self._tip[0]
+        for first in range(after_id + 1, last_id + 1, batch_size):
+            for view in self.read_raw(first, min(first + batch_size - 1, last_id)):
+                yield bytes(view)
+
+    def import_ndjson(self, lines: Iterable[bytes | str], batch_size: int = 1000) -> dict[str, Any]:
+        """Verify and append exported records onto the current tip in one pass.
+
+        Batches are appended as they verify, so a bad line keeps the records
+        before it; each of those is already a valid extension of the chain.
+        """
+        imported = 0
+        batch: list[dict[str, Any]] = []
+
+        def flush() -> None:
+            nonlocal imported
+            self._write(batch)
+            for written in batch:
+                self._index_record(written)
+            imported += len(batch)
+            batch.clear()
+
+        with self._write_lock, self._process_lock():
+            self._catch_up()
+            tip_id, prev_hash = self._tip
+            first_id = tip_id + 1
+            error = None
+            for line_no, line in enumerate(lines, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    record = {name: record.get(name, LEGACY_HASH_SCHEME) if name == 'hash_scheme' else record[name] for name in CHAIN_EXPORT_FIELDS}
+                except (ValueError, KeyError, TypeError) as exc:
+                    error = f'Malformed record on line {line_no}: {exc}'
+                    break
+                if record['id'] != tip_id + 1:
+                    error = f'Expected id {tip_id + 1} on line {line_no}, got {record["id"]}'
+                    break
+                error = self._record_error(record, prev_hash)
+                if error:
+                    error = f'{error} (line {line_no})'
+                    break
+                batch.append(record)
+                tip_id, prev_hash = record['id'], record['record_hash']
+                if len(batch) >= batch_size:
+                    flush()
+            if batch:
+                flush()
+            if imported:
+                self._notify([])
+        result: dict[str, Any] = {'ok': error is None, 'imported': imported, 'first_id': first_id, 'last_id': first_id + imported - 1, 'tip_hash': self._tip[1]}
+        if error:
+            result['error'] = error
+        return result
+
+    # -- reads --------------------------------------------------------
+
+    def list_recent_events(self, limit: int = 20) -> list[dict[str, Any]]:
+        return self.list_events(limit=limit)
+
+    def list_events(
+        self,
+        limit: int = 20,
+        before_id: Optional[int] = None,
+        after_id: Optional[int] = None,
+        trace_id: Optional[str] = None,
+        actor_did: Optional[str] = None,
+        event_type: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> list[dict[str, Any]]:
+        self._refresh()
+        limit = max(1, min(limit, 200))
+        filters = {'trace_id': trace_id, 'actor_did': actor_did, 'event_type': event_type}
+        with self._index_lock:
+            active = [self._postings[name].get(value, []) for name, value in filters.items() if value is not None]
+            ids: Any = min(active, key=len) if active else range(1, self._tip[0] + 1)
+            lo = bisect.bisect_right(ids, after_id) if after_id is not None else 0
+            hi = bisect.bisect_left(ids, before_id) if before_id is not None else len(ids)
+            # Postings lists grow under appends, so page over a copy of the matching slice.
+            ids = ids[lo:hi]
+        ascending = after_id is not None and before_id is None
+        positions = range(len(ids)) if ascending else range(len(ids) - 1, -1, -1)
+
+        items: list[dict[str, Any]] = []
+        for position in positions:
+            record = self.get_event(ids[position])
+            if record is None:
+                continue
+            if any(value is not None and record.get(name) != value for name, value in filters.items()):
+                continue
+            if (since is not None and record['created_at'] < since) or (until is not None and record['created_at'] >= until):
+                continue
+            items.append(record)
+            if len(items) >= limit:
+                break
+        if ascending:
+            items.reverse()
+        return items
+
+    def get_reputation(self, actor_did: str) -> Optional[dict[str, Any]]:
+        self._refresh()
+        with self._index_lock:
+            rep = self._reputation.get(actor_did)
+            return dict(rep) if rep else None
+
+    # -- verification ---------------------------------------------------
+
+    @staticmethod
+    def _hash(record: dict[str, Any]) -> str:
+        # Records written before hash_scheme existed carry no such key and use the legacy JSON hash.
+        return chain_record_hash(
+            record.get('hash_scheme', LEGACY_HASH_SCHEME), trace_id=record['trace_id'], event_type=record['event_type'],
+            actor_did=record['actor_did'], actor_name=record['actor_name'], actor_type=record['actor_type'],
+            impact_score=record['impact_score'], trust_delta=record['trust_delta'], payload_json=canonical_payload_json(record['payload']),
+            prev_hash=record['prev_hash'], created_at=record['created_at'],
+        )
+
+    def _record_error(self, record: dict[str, Any], prev_hash: str | None) -> str | None:
+        if record['prev_hash'] != prev_hash:
+            return f'Prev hash mismatch at id {record["id"]}'
+        if record['record_hash'] != self._hash(record):
+            return f'Record hash mismatch at id {record["id"]}'
+        return None
+
+    def verify_chain(self, full: bool = False) -> dict[str, Any]:
+        """Same contract as SimpleChainDB.verify_chain; the checkpoint lives in checkpoint.json."""
+        started_at = utc_now()
+        self._refresh()
+        checkpoint_path = self.log_dir / 'checkpoint.json'
+        stored = json.loads(checkpoint_path.read_text()) if checkpoint_path.exists() else None
+        checkpoint = None if full else stored
+        if checkpoint:
+            anchor = self.get_event(checkpoint['last_id']) if checkpoint['last_id'] else None
+            if checkpoint['last_id'] and (not anchor or anchor['record_hash'] != checkpoint['last_hash']):
+                checkpoint = None
+
+        mode = 'incremental' if checkpoint else 'full'
+        last_id = checkpoint['last_id'] if checkpoint else 0
+        prev_hash = checkpoint['last_hash'] if checkpoint else None
+        base_checked = checkpoint['checked_records'] if checkpoint else 0
+
+        checked = 0
+        error = None
+        for event_id in range(last_id + 1, self._tip[0] + 1):
+            record = self.get_event(event_id)
+            error = self._record_error(record, prev_hash)
+            if error:
+                break
+            prev_hash = record['record_hash']
+            last_id = event_id
+            checked += 1
+
+        if checkpoint:
+            full_verified_at = checkpoint['full_verified_at']
+        elif error is None:
+            full_verified_at = started_at
+        else:
+            full_verified_at = stored['full_verified_at'] if stored else None
+        moved = stored is None or (stored['last_id'], stored['last_hash'], stored['full_verified_at']) != (last_id, prev_hash, full_verified_at)
+        if full_verified_at is not None and moved:
+            tmp_path = checkpoint_path.with_suffix('.tmp')
+            tmp_path.write_text(json.dumps({
+                'last_id': last_id, 'last_hash': prev_hash, 'checked_records': base_checked + checked,
+                'verified_at': utc_now(), 'full_verified_at': full_verified_at,
+            }))
+            os.replace(tmp_path, checkpoint_path)
+        return verify_result(error, base_checked + checked, checked, mode, last_id, full_verified_at)
+
+    def _block_hashes(self, block_index: int) -> list[str]:
+        first = block_index * self.block_size + 1
+        return [self.get_event(event_id)['record_hash'] for event_id in range(first, first + self.block_size)]
+
+    def get_inclusion_proof(self, event_id: int) -> Optional[dict[str, Any]]:
+        """Blocks are implicit fixed-size id ranges, so proofs need no extra table."""
+        record = self.get_event(event_id)
+        if record is None:
+            return None
+        block_index = (event_id - 1) // self.block_size
+        if (block_index + 1) * self.block_size > self._tip[0]:
+            return {'event_id': event_id, 'record_hash': record['record_hash'], 'sealed': False}
+        leaves = self._block_hashes(block_index)
+        leaf_index = (event_id - 1) % self.block_size
+        return {
+            'event_id': event_id,
+            'record_hash': record['record_hash'],
+            'sealed': True,
+            'block_id': block_index + 1,
+            'merkle_root': merkle_root(leaves),
+            'prev_block_root': merkle_root(self._block_hashes(block_index - 1)) if block_index else None,
+            'leaf_index': leaf_index,
+            'event_count': len(leaves),
+            'proof': merkle_proof(leaves, leaf_index),
+        }
+
+    def verify_block(self, block_id: int) -> dict[str, Any]:
+        first = (block_id - 1) * self.block_size + 1
+        last = first + self.block_size - 1
+        if block_id < 1 or last > self._tip[0]:
+            return {'ok': False, 'block_id': block_id, 'error': 'Block not found'}
+        prev_hash = self.get_event(first - 1)['record_hash'] if first > 1 else None
+        hashes: list[str] = []
+        for event_id in range(first, last + 1):
+            record = self.get_event(event_id)
+            error = self._record_error(record, prev_hash)
+            if error:
+                return {'ok': False, 'block_id': block_id, 'error': error}
+            prev_hash = record['record_hash']
+            hashes.append(prev_hash)
+        return {'ok': True, 'block_id': block_id, 'checked_records': len(hashes), 'merkle_root': merkle_root(hashes)}
+
+    def close(self) -> None:
+        with self._index_lock:
+            for mapped in self._maps.values():
+                try:
+                    mapped.close()
+                except BufferError:
+                    pass  # an export still holds a view; the map is freed when it is released
+            self._maps.clear()
+        self._lock_file.close()
 
 
 class HOPEChain:
-    def __init__(self, db_path: str = 'hopechain_did.db') -> None:
-        self.db = SimpleChainDB(db_path)
+    def __init__(self, db_path: str = 'hopechain_did.db', block_size: int = 64, backend: str = 'sqlite', log_dir: str = 'hopechain_log', archive_dir: str | None = None, hash_scheme: str = 'bin1-sha256') -> None:
+        self.db: SimpleChainDB | SegmentLogChainDB
+        if backend == 'sqlite':
+            self.db = SimpleChainDB(db_path, block_size=block_size, archive_dir=archive_dir, hash_scheme=hash_scheme)
+        elif backend == 'segment_log':
+            self.db = SegmentLogChainDB(log_dir, block_size=block_size, hash_scheme=hash_scheme)
+        else:
+            raise ValueError(f"Unknown HOPEChain backend: {backend}")
 
-    def record_node_execution(self, *, trace_id: str, actor_name: str, output_preview: str, confidence: float, duration_ms: int, success: bool) -> dict[str, Any]:
+    @staticmethod
+    def node_execution_event(*, trace_id: str, actor_name: str, output_preview: str, confidence: float, duration_ms: int, success: bool) -> dict[str, Any]:
         trust_delta = 0.03 if success else -0.05
-        return self.db.add_event(
-            trace_id=trace_id,
-            event_type='node_execution',
-            actor_name=actor_name,
-            actor_type='ai_node',
-            impact_score=confidence,
-            trust_delta=trust_delta,
-            payload={'output_preview': summarize_prompt(output_preview, 220), 'confidence': confidence, 'duration_ms': duration_ms, 'success': success},
-        )
+        return {
+            'trace_id': trace_id,
+            'event_type': 'node_execution',
+            'actor_name': actor_name,
+            'actor_type': 'ai_node',
+            'impact_score': confidence,
+            'trust_delta': trust_delta,
+            'payload': {'output_preview': summarize_prompt(output_preview, 220), 'confidence': confidence, 'duration_ms': duration_ms, 'success': success},
+        }
 
-    def record_goal_decision(self, *, trace_id: str, actor_name: str, goal_id: str, rank: int, expected_impact: float, vicdan_alignment: str) -> dict[str, Any]:
+    @staticmethod
+    def goal_decision_event(*, trace_id: str, actor_name: str, goal_id: str, rank: int, expected_impact: float, vicdan_alignment: str) -> dict[str, Any]:
         trust_delta = 0.04 if vicdan_alignment == 'ACCEPT' else (0.01 if vicdan_alignment in {'MODIFY', 'REVIEW'} else -0.04)
-        return self.db.add_event(
-            trace_id=trace_id,
-            event_type='goal_decision',
-            actor_name=actor_name,
-            actor_type='governance',
-            impact_score=expected_impact,
-            trust_delta=trust_delta,
-            payload={'goal_id': goal_id, 'rank': rank, 'expected_impact': expected_impact, 'vicdan_alignment': vicdan_alignment},
-        )
+        return {
+            'trace_id': trace_id,
+            'event_type': 'goal_decision',
+            'actor_name': actor_name,
+            'actor_type': 'governance',
+            'impact_score': expected_impact,
+            'trust_delta': trust_delta,
+            'payload': {'goal_id': goal_id, 'rank': rank, 'expected_impact': expected_impact, 'vicdan_alignment': vicdan_alignment},
+        }
+
+    def record_node_execution(self, *, trace_id: str, actor_name: str, output_preview: str, confidence: float, duration_ms: int, success: bool) -> dict[str, Any]:
+        return self.db.add_event(**self.node_execution_event(
+            trace_id=trace_id, actor_name=actor_name, output_preview=output_preview,
+            confidence=confidence, duration_ms=duration_ms, success=success,
+        ))
+
+    def record_goal_decision(self, *, trace_id: str, actor_name: str, goal_id: str, rank: int, expected_impact: float, vicdan_alignment: str) -> dict[str, Any]:
+        return self.db.add_event(**self.goal_decision_event(
+            trace_id=trace_id, actor_name=actor_name, goal_id=goal_id, rank=rank,
+            expected_impact=expected_impact, vicdan_alignment=vicdan_alignment,
+        ))
+
+    def record_events(self, events: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        return self.db.add_events(events)
+
+
+class ChainSubscription:
+    def __init__(self, loop: asyncio.AbstractEventLoop, max_pending: int) -> None:
+        self.loop = loop
+        self.queue: asyncio.Queue[list[dict[str, Any]]] = asyncio.Queue(maxsize=max_pending)
+        self.overflowed = False
+
+    def offer(self, records: list[dict[str, Any]]) -> None:
+        # Runs on the subscriber's loop. A slow consumer drops batches and later sees the gap in ids.
+        try:
+            self.queue.put_nowait(records)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class ChainEventBroadcaster:
+    """Fans committed chain appends out to async subscribers.
+
+    ``publish`` is registered as a chain listener and may run on any thread;
+    each batch is handed to the subscriber's own event loop. Subscribers never
+    block the append path: a full queue drops the batch and the subscriber
+    catches up from the store.
+    """
+
+    def __init__(self, max_pending: int = 256) -> None:
+        self.max_pending = max_pending
+        self._subscribers: set[ChainSubscription] = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self) -> ChainSubscription:
+        subscription = ChainSubscription(asyncio.get_running_loop(), self.max_pending)
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: ChainSubscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def publish(self, records: list[dict[str, Any]]) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.offer, records)
+            except RuntimeError:
+                # The subscriber's loop is closed.
+                self.unsubscribe(subscription)
 
 
 def env_bool(name: str, default: bool) -> bool:
@@ -180,7 +1743,18 @@ class Settings:
 
     default_policy_profile: str = os.getenv("DEFAULT_POLICY_PROFILE", "default")
     node_timeout_ms: int = int(os.getenv("NODE_TIMEOUT_MS", "20000"))
+    adaptive_node_timeouts: bool = env_bool("ADAPTIVE_NODE_TIMEOUTS", True)
+    node_timeout_min_ms: int = int(os.getenv("NODE_TIMEOUT_MIN_MS", "250"))
+    node_timeout_max_ms: int = int(os.getenv("NODE_TIMEOUT_MAX_MS", os.getenv("NODE_TIMEOUT_MS", "20000")))
+    node_timeout_quantile: float = float(os.getenv("NODE_TIMEOUT_QUANTILE", "0.99"))
+    node_timeout_multiplier: float = float(os.getenv("NODE_TIMEOUT_MULTIPLIER", "3"))
+    node_timeout_min_samples: int = int(os.getenv("NODE_TIMEOUT_MIN_SAMPLES", "20"))
     strict_mode_min_nodes: int = int(os.getenv("STRICT_MODE_MIN_NODES", "2"))
+    reason_quorum: int = int(os.getenv("REASON_QUORUM", "0"))
+    reason_quorum_agreement: float = float(os.getenv("REASON_QUORUM_AGREEMENT", "0.5"))
+    hedge_budget_percent: float = float(os.getenv("HEDGE_BUDGET_PERCENT", "5"))
+    hedge_quantile: float = float(os.getenv("HEDGE_QUANTILE", "0.9"))
+    hedge_min_samples: int = int(os.getenv("HEDGE_MIN_SAMPLES", "20"))
 
     external_llm_base_url: str = os.getenv("EXTERNAL_LLM_BASE_URL", "https://api.openai.com/v1")
     external_llm_api_key: Optional[str] = os.getenv("EXTERNAL_LLM_API_KEY")
@@ -190,15 +1764,75 @@ class Settings:
     external_node_name: str = os.getenv("EXTERNAL_NODE_NAME", "external-1")
     retrieval_node_name: str = os.getenv("RETRIEVAL_NODE_NAME", "retrieval-1")
 
+    chain_full_verify_interval_s: int = int(os.getenv("HOPECHAIN_FULL_VERIFY_INTERVAL_S", "3600"))
+    chain_block_size: int = int(os.getenv("HOPECHAIN_BLOCK_SIZE", "64"))
+    chain_backend: str = os.getenv("HOPECHAIN_BACKEND", "sqlite")
+    chain_db_path: str = os.getenv("HOPECHAIN_DB_PATH", "hopechain_did.db")
+    chain_log_dir: str = os.getenv("HOPECHAIN_LOG_DIR", "hopechain_log")
+    chain_archive_dir: str = os.getenv("HOPECHAIN_ARCHIVE_DIR", "")
+    chain_hash_scheme: str = os.getenv("HOPECHAIN_HASH_SCHEME", "bin1-sha256")
+    chain_stream_heartbeat_s: float = float(os.getenv("HOPECHAIN_STREAM_HEARTBEAT_S", "15"))
+    chain_archive_interval_s: int = int(os.getenv("HOPECHAIN_ARCHIVE_INTERVAL_S", "0"))
+    chain_archive_keep_recent: int = int(os.getenv("HOPECHAIN_ARCHIVE_KEEP_RECENT", "100000"))
+    chain_import_max_bytes: int = int(os.getenv("HOPECHAIN_IMPORT_MAX_BYTES", str(1 << 30)))
+
+    admin_token: Optional[str] = os.getenv("HOPEVERSE_ADMIN_TOKEN")
+
+    trace_queue_size: int = int(os.getenv("TRACE_QUEUE_SIZE", "1024"))
+    trace_batch_size: int = int(os.getenv("TRACE_BATCH_SIZE", "64"))
+    trace_enqueue_timeout_s: float = float(os.getenv("TRACE_ENQUEUE_TIMEOUT_S", "5"))
+    trace_chain_retries: int = int(os.getenv("TRACE_CHAIN_RETRIES", "3"))
+    trace_dead_letter_path: str = os.getenv("TRACE_DEAD_LETTER_PATH", "")
+
+    sqlite_synchronous: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    sqlite_busy_timeout_ms: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "30000"))
+    sqlite_cache_kib: int = int(os.getenv("SQLITE_CACHE_KIB", "16384"))
+    sqlite_mmap_mb: int = int(os.getenv("SQLITE_MMAP_MB", "256"))
+
+    external_llm_max_connections: int = int(os.getenv("EXTERNAL_LLM_MAX_CONNECTIONS", "20"))
+    external_llm_max_keepalive: int = int(os.getenv("EXTERNAL_LLM_MAX_KEEPALIVE", "10"))
+    external_llm_keepalive_s: float = float(os.getenv("EXTERNAL_LLM_KEEPALIVE_S", "60"))
+    external_llm_http2: bool = env_bool("EXTERNAL_LLM_HTTP2", False)
+    external_llm_warmup: bool = env_bool("EXTERNAL_LLM_WARMUP", True)
+    external_llm_hedge: bool = env_bool("EXTERNAL_LLM_HEDGE", False)
+
+    trace_blob_min_bytes: int = int(os.getenv("TRACE_BLOB_MIN_BYTES", "256"))
+    trace_blob_compress_min_bytes: int = int(os.getenv("TRACE_BLOB_COMPRESS_MIN_BYTES", "512"))
+
+    trace_partition: str = os.getenv("TRACE_PARTITION", "none")
+    trace_partition_dir: str = os.getenv("TRACE_PARTITION_DIR", "")
+    trace_retention_days: int = int(os.getenv("TRACE_RETENTION_DAYS", "0"))
+    trace_retention: str = os.getenv("TRACE_RETENTION", "")
+    trace_retention_interval_s: int = int(os.getenv("TRACE_RETENTION_INTERVAL_S", "3600"))
+
 
 SETTINGS = Settings()
+SQLITE_POOL_OPTIONS.update(
+    synchronous=SETTINGS.sqlite_synchronous,
+    busy_timeout_ms=SETTINGS.sqlite_busy_timeout_ms,
+    cache_kib=SETTINGS.sqlite_cache_kib,
+    mmap_mb=SETTINGS.sqlite_mmap_mb,
+)
+TRACE_BLOB_OPTIONS.update(
+    min_bytes=SETTINGS.trace_blob_min_bytes,
+    compress_min_bytes=SETTINGS.trace_blob_compress_min_bytes,
+)
 
 logging.basicConfig(
     level=getattr(logging, SETTINGS.log_level.upper(), logging.INFO),
     format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
 )
 logger = logging.getLogger("hopeverse")
-HOPECHAIN = HOPEChain("hopechain_did.db")
+HOPECHAIN = HOPEChain(
+    SETTINGS.chain_db_path,
+    block_size=SETTINGS.chain_block_size,
+    backend=SETTINGS.chain_backend,
+    log_dir=SETTINGS.chain_log_dir,
+    archive_dir=SETTINGS.chain_archive_dir or None,
+    hash_scheme=SETTINGS.chain_hash_scheme,
+)
+CHAIN_BROADCASTER = ChainEventBroadcaster()
+HOPECHAIN.db.add_listener(CHAIN_BROADCASTER.publish)
 
 
 def utc_now() -> str:
@@ -255,6 +1889,8 @@ class TraceResponse(BaseModel):
     total_duration_ms: int
     created_at: str
     candidates: list[dict[str, Any]]
+    hedges: int = 0
+    hedge_wins: int = 0
 
 
 class NodeStatusResponse(BaseModel):
@@ -264,6 +1900,7 @@ class NodeStatusResponse(BaseModel):
     enabled: bool
     trust_score: float
     reputation_score: float
+    latency: dict[str, Any] = Field(default_factory=dict)
 
 
 class TaskContext(BaseModel):
@@ -318,108 +1955,425 @@ class FinalResponse(BaseModel):
     trace_id: str
 
 
-class Database:
-    def __init__(self, db_path: str) -> None:
-        self.db_path = db_path
-        self._init_db()
+@dataclass
+class TraceBundle:
+    """Everything one finished /v1/reason request persists, plus the chain events it records."""
+
+    task: TaskContext
+    candidates: list[CandidateAnswer]
+    verification: VerificationResult
+    vicdan: VicdanResult
+    request_summary: str
+    selected_nodes: list[str]
+    final_output: str
+    total_duration_ms: int
+    chain_events: list[dict[str, Any]] = field(default_factory=list)
+    created_at: str = field(default_factory=lambda: utc_now())
+    hedges: int = 0
+    hedge_wins: int = 0
 
-    def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+    def trace_row(self) -> dict[str, Any]:
+        """The bundle as Database.get_trace would return it once written."""
+        return {
+            "trace_id": self.task.trace_id,
+            "task_id": self.task.task_id,
+            "request_summary": self.request_summary,
+            "selected_nodes_json": json.dumps(self.selected_nodes),
+            "candidate_ids_json": json.dumps([c.candidate_id for c in self.candidates]),
+            "verification_summary": self.verification.verification_summary,
+            "vicdan_status": self.vicdan.decision,
+            "final_output": self.final_output,
+            "total_duration_ms": self.total_duration_ms,
+            "created_at": self.created_at,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+        }
 
-    def _init_db(self) -> None:
-        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
-        conn = self._connect()
-        try:
-            conn.executescript(
-                """
-                CREATE TABLE IF NOT EXISTS nodes (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    node_id TEXT UNIQUE NOT NULL,
-                    node_type TEXT NOT NULL,
-                    capabilities_json TEXT NOT NULL,
-                    enabled INTEGER NOT NULL,
-                    trust_score REAL NOT NULL,
-                    reputation_score REAL NOT NULL,
-                    cost_weight REAL NOT NULL,
-                    latency_weight REAL NOT NULL,
-                    policy_tags_json TEXT NOT NULL,
-                    created_at TEXT NOT NULL
-                );
+    def candidate_rows(self) -> list[dict[str, Any]]:
+        """The candidates as Database.get_candidates_by_task would return them once written."""
+        return [{**c.model_dump(), "created_at": self.created_at} for c in self.candidates]
 
-                CREATE TABLE IF NOT EXISTS tasks (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    task_id TEXT UNIQUE NOT NULL,
-                    trace_id TEXT NOT NULL,
-                    requester_id TEXT,
-                    task_type TEXT NOT NULL,
-                    policy_profile TEXT NOT NULL,
-                    required_confidence REAL,
-                    prompt TEXT NOT NULL,
-                    context_json TEXT,
-                    metadata_json TEXT,
-                    created_at TEXT NOT NULL
-                );
 
-                CREATE TABLE IF NOT EXISTS candidate_answers (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    candidate_id TEXT UNIQUE NOT NULL,
-                    task_id TEXT NOT NULL,
-                    node_id TEXT NOT NULL,
-                    output_text TEXT,
-                    confidence_self_reported REAL,
-                    evidence_refs_json TEXT NOT NULL,
-                    duration_ms INTEGER NOT NULL,
-                    error_text TEXT,
-                    created_at TEXT NOT NULL
-                );
+# Partition length in days; "none" keeps every trace in the main file.
+TRACE_PARTITION_PERIODS = {"none": 0, "day": 1, "week": 7}
+TRACE_TABLES = ("tasks", "candidate_answers", "verification_results", "vicdan_results", "traces")
 
-                CREATE TABLE IF NOT EXISTS verification_results (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    task_id TEXT UNIQUE NOT NULL,
-                    agreement_score REAL NOT NULL,
-                    evidence_score REAL NOT NULL,
-                    contradiction_flags_json TEXT NOT NULL,
-                    confidence_score REAL NOT NULL,
-                    candidate_rankings_json TEXT NOT NULL,
-                    selected_candidate_id TEXT,
-                    verification_summary TEXT NOT NULL,
-                    created_at TEXT NOT NULL
-                );
 
-                CREATE TABLE IF NOT EXISTS vicdan_results (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    task_id TEXT UNIQUE NOT NULL,
-                    decision TEXT NOT NULL,
-                    risk_scores_json TEXT NOT NULL,
-                    rationale TEXT NOT NULL,
-                    required_modification TEXT,
-                    created_at TEXT NOT NULL
-                );
+def parse_trace_retention(default_days: int, overrides: str = "") -> dict[str, int]:
+    """Retention in days per trace table: ``default_days`` for all, then ``table=days,...`` overrides; 0 keeps forever."""
+    retention = {table: default_days for table in TRACE_TABLES}
+    for part in filter(None, (p.strip() for p in overrides.split(","))):
+        table, _, days = part.partition("=")
+        if table.strip() not in retention or not days.strip().isdigit():
+            raise ValueError(f"Invalid trace retention entry: {part}")
+        retention[table.strip()] = int(days)
+    return {table: days for table, days in retention.items() if days > 0}
 
-                CREATE TABLE IF NOT EXISTS traces (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    trace_id TEXT UNIQUE NOT NULL,
-                    task_id TEXT UNIQUE NOT NULL,
-                    request_summary TEXT NOT NULL,
-                    selected_nodes_json TEXT NOT NULL,
-                    candidate_ids_json TEXT NOT NULL,
-                    verification_summary TEXT NOT NULL,
-                    vicdan_status TEXT NOT NULL,
-                    final_output TEXT NOT NULL,
-                    total_duration_ms INTEGER NOT NULL,
-                    created_at TEXT NOT NULL
-                );
-                """
+
+class Database:
+    def __init__(
+        self,
+        db_path: str,
+        pool: SQLitePool | None = None,
+        partition: str = "none",
+        partition_dir: Optional[str] = None,
+        retention_days: Optional[dict[str, int]] = None,
+        max_open_partitions: int = 16,
+    ) -> None:
+        if partition not in TRACE_PARTITION_PERIODS:
+            raise ValueError(f"Unknown trace partition period: {partition}")
+        self.db_path = db_path
+        self.pool = pool or sqlite_pool(db_path)
+        self.partition = partition
+        self.partition_dir = Path(partition_dir or f"{db_path}.partitions")
+        self.retention_days = dict(retention_days or {})
+        self.max_open_partitions = max(1, max_open_partitions)
+        self._partitions: OrderedDict[str, SQLitePool] = OrderedDict()
+        self._partition_lock = threading.Lock()
+        self._partition_listing: tuple[int, list[str]] | None = None
+        self._migrated_partitions: set[str] = set()
+        # Every user of a partition pool holds a lease; an evicted or dropped pool still on
+        # lease is retired and closed by its last user.
+        self._partition_leases: dict[SQLitePool, int] = {}
+        self._retired_pools: set[SQLitePool] = set()
+        # Evicted but still leased, so reopening the partition takes the pool back instead of a second writer.
+        self._evicted_partitions: dict[str, SQLitePool] = {}
+        self._init_db()
+
+    # Append new steps here; never edit a step that has shipped.
+    MIGRATIONS = (
+        Migration(1, "baseline tables", (
+            """
+            CREATE TABLE IF NOT EXISTS nodes (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                node_id TEXT UNIQUE NOT NULL,
+                node_type TEXT NOT NULL,
+                capabilities_json TEXT NOT NULL,
+                enabled INTEGER NOT NULL,
+                trust_score REAL NOT NULL,
+                reputation_score REAL NOT NULL,
+                cost_weight REAL NOT NULL,
+                latency_weight REAL NOT NULL,
+                policy_tags_json TEXT NOT NULL,
+                created_at TEXT NOT NULL
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS tasks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                task_id TEXT UNIQUE NOT NULL,
+                trace_id TEXT NOT NULL,
+                requester_id TEXT,
+                task_type TEXT NOT NULL,
+                policy_profile TEXT NOT NULL,
+                required_confidence REAL,
+                prompt TEXT NOT NULL,
+                context_json TEXT,
+                metadata_json TEXT,
+                created_at TEXT NOT NULL
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS candidate_answers (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                candidate_id TEXT UNIQUE NOT NULL,
+                task_id TEXT NOT NULL,
+                node_id TEXT NOT NULL,
+                output_text TEXT,
+                confidence_self_reported REAL,
+                evidence_refs_json TEXT NOT NULL,
+                duration_ms INTEGER NOT NULL,
+                error_text TEXT,
+                created_at TEXT NOT NULL
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS verification_results (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                task_id TEXT UNIQUE NOT NULL,
+                agreement_score REAL NOT NULL,
+                evidence_score REAL NOT NULL,
+                contradiction_flags_json TEXT NOT NULL,
+                confidence_score REAL NOT NULL,
+                candidate_rankings_json TEXT NOT NULL,
+                selected_candidate_id TEXT,
+                verification_summary TEXT NOT NULL,
+                created_at TEXT NOT NULL
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS vicdan_results (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                task_id TEXT UNIQUE NOT NULL,
+                decision TEXT NOT NULL,
+                risk_scores_json TEXT NOT NULL,
+                rationale TEXT NOT NULL,
+                required_modification TEXT,
+                created_at TEXT NOT NULL
             )
-            conn.commit()
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS traces (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                trace_id TEXT UNIQUE NOT NULL,
+                task_id TEXT UNIQUE NOT NULL,
+                request_summary TEXT NOT NULL,
+                selected_nodes_json TEXT NOT NULL,
+                candidate_ids_json TEXT NOT NULL,
+                verification_summary TEXT NOT NULL,
+                vicdan_status TEXT NOT NULL,
+                final_output TEXT NOT NULL,
+                total_duration_ms INTEGER NOT NULL,
+                created_at TEXT NOT NULL
+            )
+            """,
+        )),
+        Migration(2, "indexes for trace reads", (
+            "CREATE INDEX IF NOT EXISTS idx_candidate_answers_task_id ON candidate_answers(task_id, id)",
+            "CREATE INDEX IF NOT EXISTS idx_tasks_created_at ON tasks(created_at)",
+            "CREATE INDEX IF NOT EXISTS idx_traces_created_at ON traces(created_at)",
+            "CREATE INDEX IF NOT EXISTS idx_traces_vicdan_status_created_at ON traces(vicdan_status, created_at)",
+        )),
+        Migration(3, "content-addressed text blobs", (
+            """
+            CREATE TABLE IF NOT EXISTS blobs (
+                hash BLOB PRIMARY KEY,
+                codec TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                data BLOB NOT NULL
+            ) WITHOUT ROWID
+            """,
+            add_column("tasks", "prompt_blob", "BLOB"),
+            add_column("candidate_answers", "output_blob", "BLOB"),
+            add_column("traces", "final_output_blob", "BLOB"),
+        )),
+        Migration(4, "hedged request counts", (
+            add_column("traces", "hedges", "INTEGER NOT NULL DEFAULT 0"),
+            add_column("traces", "hedge_wins", "INTEGER NOT NULL DEFAULT 0"),
+        )),
+    )
+
+    # Queries on the request and investigation paths; check_query_plans() keeps them off full scans.
+    HOT_QUERIES = {
+        "trace_by_id": ("SELECT * FROM traces WHERE trace_id = ?", ("trace_x",)),
+        "candidates_by_task": ("SELECT * FROM candidate_answers WHERE task_id = ? ORDER BY id ASC", ("task_x",)),
+        "verification_by_task": ("SELECT * FROM verification_results WHERE task_id = ?", ("task_x",)),
+        "vicdan_by_task": ("SELECT * FROM vicdan_results WHERE task_id = ?", ("task_x",)),
+        "tasks_by_time": ("SELECT * FROM tasks WHERE created_at >= ? AND created_at < ? ORDER BY created_at DESC", ("", "~")),
+        "traces_by_time": ("SELECT * FROM traces WHERE created_at >= ? AND created_at < ? ORDER BY created_at DESC", ("", "~")),
+        "traces_by_status": (
+            "SELECT * FROM traces WHERE vicdan_status = ? AND created_at >= ? ORDER BY created_at DESC",
+            ("REJECT", ""),
+        ),
+        "trace_search_page": (
+            "SELECT t.id FROM traces t LEFT JOIN tasks k ON k.task_id = t.task_id LEFT JOIN verification_results v ON v.task_id = t.task_id"
+            " WHERE t.created_at >= ? AND (t.created_at, t.id) < (?, ?) ORDER BY t.created_at DESC, t.id DESC LIMIT 20",
+            ("", "~", 1 << 62),
+        ),
+    }
+
+    def _init_db(self) -> None:
+        applied = run_migrations(self.pool, "trace_store", self.MIGRATIONS)
+        if applied:
+            logger.info("trace store migrated: versions=%s", applied)
+        for name, result in self.check_query_plans().items():
+            if not result["uses_index"]:
+                logger.warning("trace store query %s scans a table: %s", name, result["plan"])
+
+    def check_query_plans(self) -> dict[str, dict[str, Any]]:
+        """EXPLAIN QUERY PLAN for every hot query, flagging any that falls back to a full table scan."""
+        with self.pool.read() as conn:
+            results = {}
+            for name, (sql, params) in self.HOT_QUERIES.items():
+                plan = query_plan(conn, sql, params)
+                results[name] = {"uses_index": plan_uses_index(plan), "plan": plan}
+            return results
+
+    # -- partitions ------------------------------------------------------
+    #
+    # With partitioning on, trace rows live in one file per day or week under
+    # partition_dir, keyed by the bundle's created_at, and the main file only keeps
+    # nodes plus any traces written before partitioning was switched on. Files are
+    # opened on demand and the most recently used stay open; each file is migrated
+    # once per process.
+
+    def _partition_key(self, created_at: str) -> str:
+        day = datetime.fromisoformat(created_at).astimezone(timezone.utc).date()
+        if self.partition == "week":
+            day -= timedelta(days=day.weekday())
+        return day.isoformat()
+
+    def _partition_end(self, key: str) -> str:
+        return (date.fromisoformat(key) + timedelta(days=TRACE_PARTITION_PERIODS[self.partition])).isoformat()
+
+    def _partition_keys(self) -> list[str]:
+        """Partition keys on disk, oldest first; re-listed only when the directory changes."""
+        try:
+            mtime = self.partition_dir.stat().st_mtime_ns
+        except FileNotFoundError:
+            return []
+        listing = self._partition_listing
+        if listing is None or listing[0] != mtime:
+            listing = (mtime, sorted(path.name[len("traces-"):-len(".db")] for path in self.partition_dir.glob("traces-*.db")))
+            self._partition_listing = listing
+        return listing[1]
+
+    def _partition_pool(self, key: str, create: bool = False) -> Optional[SQLitePool]:
+        """The open pool for partition ``key``, leased to the caller; pair with _release_partition."""
+        path = self.partition_dir / f"traces-{key}.db"
+        with self._partition_lock:
+            pool = self._partitions.get(key)
+            if pool is None:
+                pool = self._evicted_partitions.pop(key, None)
+                self._retired_pools.discard(pool)
+            evicted = self._lease_partition(key, pool) if pool is not None else []
+        for idle in evicted:
+            idle.close()
+        if pool is not None:
+            return pool
+        missing = not path.exists()
+        if missing and not create:
+            return None
+        opened = SQLitePool(str(path), **SQLITE_POOL_OPTIONS)
+        if missing or key not in self._migrated_partitions:
+            run_migrations(opened, "trace_store", self.MIGRATIONS)
+            self._migrated_partitions.add(key)
+        with self._partition_lock:
+            pool = self._partitions.get(key, opened)
+            evicted = self._lease_partition(key, pool)
+        if pool is not opened:
+            # Another thread opened the same partition first.
+            opened.close()
+        for idle in evicted:
+            idle.close()
+        return pool
+
+    def _lease_partition(self, key: str, pool: SQLitePool) -> list[SQLitePool]:
+        """Lease ``pool`` as the most recent partition (lock held); returns evicted pools that are safe to close."""
+        self._partitions[key] = pool
+        self._partitions.move_to_end(key)
+        self._partition_leases[pool] = self._partition_leases.get(pool, 0) + 1
+        idle = []
+        while len(self._partitions) > self.max_open_partitions:
+            evicted_key, evicted = self._partitions.popitem(last=False)
+            if evicted in self._partition_leases:
+                self._retired_pools.add(evicted)
+                self._evicted_partitions[evicted_key] = evicted
+            else:
+                idle.append(evicted)
+        return idle
+
+    @contextmanager
+    def _write_pool(self, created_at: str) -> Iterator[SQLitePool]:
+        """The store that ``created_at`` routes to, leased for the duration of the block."""
+        if self.partition == "none":
+            yield self.pool
+            return
+        pool = self._partition_pool(self._partition_key(created_at), create=True)
+        try:
+            yield pool
         finally:
-            conn.close()
+            self._release_partition(pool)
+
+    def _read_pools(self, since: Optional[str] = None, until: Optional[str] = None) -> Iterator[SQLitePool]:
+        """Stores that can hold traces in [since, until), newest first, ending with the main file."""
+        if self.partition != "none":
+            for key in reversed(self._partition_keys()):
+                if until is not None and key >= until:
+                    continue
+                if since is not None and self._partition_end(key) <= since:
+                    break
+                pool = self._partition_pool(key)
+                if pool is None:
+                    continue
+                try:
+                    yield pool
+                finally:
+                    self._release_partition(pool)
+        yield self.pool
+
+    def _release_partition(self, pool: SQLitePool) -> None:
+        with self._partition_lock:
+            leases = self._partition_leases.pop(pool) - 1
+            if leases:
+                self._partition_leases[pool] = leases
+                return
+            if pool not in self._retired_pools:
+                return
+            self._retired_pools.discard(pool)
+            self._evicted_partitions = {key: kept for key, kept in self._evicted_partitions.items() if kept is not pool}
+        pool.close()
+
+    def apply_retention(self, now: Optional[datetime] = None) -> dict[str, Any]:
+        """Expire partitions whose period ended longer ago than each table's retention.
+
+        A partition whose every table has expired is removed by deleting its file;
+        otherwise only the expired tables are emptied. Nothing is deleted row by row
+        from a live table, and the main file is left alone.
+        """
+        result: dict[str, Any] = {"ok": True, "dropped_partitions": [], "emptied_tables": []}
+        if self.partition == "none" or not self.retention_days:
+            return result
+        today = (now or datetime.now(timezone.utc)).date()
+        for key in self._partition_keys():
+            closed_days = (today - date.fromisoformat(self._partition_end(key))).days
+            expired = [table for table in TRACE_TABLES if table in self.retention_days and closed_days >= self.retention_days[table]]
+            if not expired:
+                continue
+            if len(expired) == len(TRACE_TABLES):
+                self._drop_partition(key)
+                result["dropped_partitions"].append(key)
+                continue
+            pool = self._partition_pool(key)
+            if pool is None:
+                continue
+            try:
+                with pool.write() as conn:
+                    emptied = False
+                    for table in expired:
+                        if conn.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone():
+                            # No WHERE clause, so SQLite truncates instead of deleting row by row.
+                            conn.execute(f"DELETE FROM {table}")
+                            result["emptied_tables"].append({"partition": key, "table": table})
+                            emptied = True
+                    if emptied:
+                        conn.execute(
+                            """
+                            DELETE FROM blobs WHERE hash NOT IN (
+                                SELECT prompt_blob FROM tasks WHERE prompt_blob IS NOT NULL
+                                UNION SELECT output_blob FROM candidate_answers WHERE output_blob IS NOT NULL
+                                UNION SELECT final_output_blob FROM traces WHERE final_output_blob IS NOT NULL
+                            )
+                            """
+                        )
+            finally:
+                self._release_partition(pool)
+        return result
+
+    def _drop_partition(self, key: str) -> None:
+        with self._partition_lock:
+            pool = self._partitions.pop(key, None) or self._evicted_partitions.pop(key, None)
+            self._migrated_partitions.discard(key)
+            if pool is not None and pool in self._partition_leases:
+                # Still being read: the last reader closes it; the unlinked file stays readable until then.
+                self._retired_pools.add(pool)
+                pool = None
+        if pool is not None:
+            pool.close()
+        path = self.partition_dir / f"traces-{key}.db"
+        for suffix in ("", "-wal", "-shm"):
+            Path(f"{path}{suffix}").unlink(missing_ok=True)
+        self._partition_listing = None
+
+    def close_partitions(self) -> None:
+        with self._partition_lock:
+            pools = list(self._partitions.values())
+            self._partitions.clear()
+        for pool in pools:
+            pool.close()
 
     def upsert_node(self, node: "BaseNode") -> None:
-        conn = self._connect()
-        try:
+        with self.pool.write() as conn:
             conn.execute(
                 """
                 INSERT INTO nodes (
@@ -450,115 +2404,120 @@ class Database:
                     utc_now(),
                 ),
             )
-            conn.commit()
-        finally:
-            conn.close()
 
     def save_task(self, task: TaskContext) -> None:
-        conn = self._connect()
-        try:
-            conn.execute(
-                """
-                INSERT OR REPLACE INTO tasks (
-                    task_id, trace_id, requester_id, task_type, policy_profile,
-                    required_confidence, prompt, context_json, metadata_json, created_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    task.task_id,
-                    task.trace_id,
-                    task.requester_id,
-                    task.task_type,
-                    task.policy_profile,
-                    task.required_confidence,
-                    task.prompt,
-                    json.dumps(task.context_payload or {}),
-                    json.dumps(task.metadata or {}),
-                    task.created_at,
-                ),
-            )
-            conn.commit()
-        finally:
-            conn.close()
+        with self._write_pool(task.created_at) as pool, pool.write() as conn:
+            self._save_task_tx(conn, task)
 
-    def save_candidates(self, candidates: list["CandidateAnswer"]) -> None:
-        conn = self._connect()
-        try:
-            for c in candidates:
-                conn.execute(
-                    """
-                    INSERT OR REPLACE INTO candidate_answers (
-                        candidate_id, task_id, node_id, output_text,
-                        confidence_self_reported, evidence_refs_json,
-                        duration_ms, error_text, created_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        c.candidate_id,
-                        c.task_id,
-                        c.node_id,
-                        c.output,
-                        c.confidence_self_reported,
-                        json.dumps(c.evidence_refs),
-                        c.duration_ms,
-                        c.error,
-                        utc_now(),
-                    ),
-                )
-            conn.commit()
-        finally:
-            conn.close()
+    @staticmethod
+    def _save_task_tx(conn: sqlite3.Connection, task: TaskContext) -> None:
+        prompt, prompt_blob = put_blob(conn, task.prompt)
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO tasks (
+                task_id, trace_id, requester_id, task_type, policy_profile,
+                required_confidence, prompt, prompt_blob, context_json, metadata_json, created_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                task.task_id,
+                task.trace_id,
+                task.requester_id,
+                task.task_type,
+                task.policy_profile,
+                task.required_confidence,
+                prompt,
+                prompt_blob,
+                json.dumps(task.context_payload or {}),
+                json.dumps(task.metadata or {}),
+                task.created_at,
+            ),
+        )
 
-    def save_verification(self, vr: "VerificationResult") -> None:
-        conn = self._connect()
-        try:
-            conn.execute(
-                """
-                INSERT OR REPLACE INTO verification_results (
-                    task_id, agreement_score, evidence_score,
-                    contradiction_flags_json, confidence_score,
-                    candidate_rankings_json, selected_candidate_id,
-                    verification_summary, created_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
+    def save_candidates(self, candidates: list["CandidateAnswer"], created_at: Optional[str] = None) -> None:
+        created_at = created_at or utc_now()
+        with self._write_pool(created_at) as pool, pool.write() as conn:
+            self._save_candidates_tx(conn, candidates, created_at=created_at)
+
+    @staticmethod
+    def _save_candidates_tx(conn: sqlite3.Connection, candidates: list["CandidateAnswer"], created_at: Optional[str] = None) -> None:
+        created_at = created_at or utc_now()
+        conn.executemany(
+            """
+            INSERT OR REPLACE INTO candidate_answers (
+                candidate_id, task_id, node_id, output_text, output_blob,
+                confidence_self_reported, evidence_refs_json,
+                duration_ms, error_text, created_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
                 (
-                    vr.task_id,
-                    vr.agreement_score,
-                    vr.evidence_score,
-                    json.dumps(vr.contradiction_flags),
-                    vr.confidence_score,
-                    json.dumps(vr.candidate_rankings),
-                    vr.selected_candidate_id,
-                    vr.verification_summary,
-                    utc_now(),
-                ),
-            )
-            conn.commit()
-        finally:
-            conn.close()
+                    c.candidate_id,
+                    c.task_id,
+                    c.node_id,
+                    *put_blob(conn, c.output),
+                    c.confidence_self_reported,
+                    json.dumps(c.evidence_refs),
+                    c.duration_ms,
+                    c.error,
+                    created_at,
+                )
+                for c in candidates
+            ],
+        )
+
+    def save_verification(self, vr: "VerificationResult", created_at: Optional[str] = None) -> None:
+        created_at = created_at or utc_now()
+        with self._write_pool(created_at) as pool, pool.write() as conn:
+            self._save_verification_tx(conn, vr, created_at=created_at)
+
+    @staticmethod
+    def _save_verification_tx(conn: sqlite3.Connection, vr: "VerificationResult", created_at: Optional[str] = None) -> None:
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO verification_results (
+                task_id, agreement_score, evidence_score,
+                contradiction_flags_json, confidence_score,
+                candidate_rankings_json, selected_candidate_id,
+                verification_summary, created_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                vr.task_id,
+                vr.agreement_score,
+                vr.evidence_score,
+                json.dumps(vr.contradiction_flags),
+                vr.confidence_score,
+                json.dumps(vr.candidate_rankings),
+                vr.selected_candidate_id,
+                vr.verification_summary,
+                created_at or utc_now(),
+            ),
+        )
+
+    def save_vicdan(self, vc: "VicdanResult", created_at: Optional[str] = None) -> None:
+        created_at = created_at or utc_now()
+        with self._write_pool(created_at) as pool, pool.write() as conn:
+            self._save_vicdan_tx(conn, vc, created_at=created_at)
 
-    def save_vicdan(self, vc: "VicdanResult") -> None:
-        conn = self._connect()
-        try:
-            conn.execute(
-                """
-                INSERT OR REPLACE INTO vicdan_results (
-                    task_id, decision, risk_scores_json, rationale,
-                    required_modification, created_at
-                ) VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    vc.task_id,
-                    vc.decision,
-                    json.dumps(vc.risk_scores),
-                    vc.rationale,
-                    vc.required_modification,
-                    utc_now(),
-                ),
-            )
-            conn.commit()
-        finally:
-            conn.close()
+    @staticmethod
+    def _save_vicdan_tx(conn: sqlite3.Connection, vc: "VicdanResult", created_at: Optional[str] = None) -> None:
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO vicdan_results (
+                task_id, decision, risk_scores_json, rationale,
+                required_modification, created_at
+            ) VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (
+                vc.task_id,
+                vc.decision,
+                json.dumps(vc.risk_scores),
+                vc.rationale,
+                vc.required_modification,
+                created_at or utc_now(),
+            ),
+        )
 
     def save_trace(
         self,
@@ -571,71 +2530,509 @@ class Database:
         vicdan_status: str,
         final_output: str,
         total_duration_ms: int,
+        created_at: Optional[str] = None,
     ) -> None:
-        conn = self._connect()
-        try:
-            conn.execute(
-                """
-                INSERT OR REPLACE INTO traces (
-                    trace_id, task_id, request_summary, selected_nodes_json,
-                    candidate_ids_json, verification_summary, vicdan_status,
-                    final_output, total_duration_ms, created_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    trace_id,
-                    task_id,
-                    request_summary,
-                    json.dumps(selected_nodes),
-                    json.dumps(candidate_ids),
-                    verification_summary,
-                    vicdan_status,
-                    final_output,
-                    total_duration_ms,
-                    utc_now(),
-                ),
+        created_at = created_at or utc_now()
+        with self._write_pool(created_at) as pool, pool.write() as conn:
+            self._save_trace_tx(
+                conn,
+                trace_id=trace_id,
+                task_id=task_id,
+                request_summary=request_summary,
+                selected_nodes=selected_nodes,
+                candidate_ids=candidate_ids,
+                verification_summary=verification_summary,
+                vicdan_status=vicdan_status,
+                final_output=final_output,
+                total_duration_ms=total_duration_ms,
+                created_at=created_at,
             )
-            conn.commit()
-        finally:
-            conn.close()
+
+    @staticmethod
+    def _save_trace_tx(
+        conn: sqlite3.Connection,
+        trace_id: str,
+        task_id: str,
+        request_summary: str,
+        selected_nodes: list[str],
+        candidate_ids: list[str],
+        verification_summary: str,
+        vicdan_status: str,
+        final_output: str,
+        total_duration_ms: int,
+        created_at: Optional[str] = None,
+        hedges: int = 0,
+        hedge_wins: int = 0,
+    ) -> None:
+        final_output, final_output_blob = put_blob(conn, final_output)
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO traces (
+                trace_id, task_id, request_summary, selected_nodes_json,
+                candidate_ids_json, verification_summary, vicdan_status,
+                final_output, final_output_blob, total_duration_ms, created_at,
+                hedges, hedge_wins
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                trace_id,
+                task_id,
+                request_summary,
+                json.dumps(selected_nodes),
+                json.dumps(candidate_ids),
+                verification_summary,
+                vicdan_status,
+                final_output,
+                final_output_blob,
+                total_duration_ms,
+                created_at or utc_now(),
+                hedges,
+                hedge_wins,
+            ),
+        )
+
+    def save_trace_bundle(
+        self,
+        task: TaskContext,
+        candidates: list["CandidateAnswer"],
+        verification: "VerificationResult",
+        vicdan: "VicdanResult",
+        *,
+        request_summary: str,
+        selected_nodes: list[str],
+        final_output: str,
+        total_duration_ms: int,
+    ) -> None:
+        """Write a finished request's task, candidates, verification, vicdan and trace rows in one transaction.
+
+        Either the whole bundle is committed or none of it is, so a trace never points at missing rows.
+        """
+        self.save_trace_bundles([
+            TraceBundle(
+                task=task,
+                candidates=candidates,
+                verification=verification,
+                vicdan=vicdan,
+                request_summary=request_summary,
+                selected_nodes=selected_nodes,
+                final_output=final_output,
+                total_duration_ms=total_duration_ms,
+            )
+        ])
+
+    def save_trace_bundles(self, bundles: list[TraceBundle]) -> None:
+        """Write several bundles in one transaction per store; each bundle is committed whole or not at all.
+
+        Unpartitioned, that is a single transaction. A batch straddling a partition
+        boundary commits one transaction per partition.
+        """
+        groups: dict[str, list[TraceBundle]] = {}
+        for bundle in bundles:
+            key = "none" if self.partition == "none" else self._partition_key(bundle.created_at)
+            groups.setdefault(key, []).append(bundle)
+        for group in groups.values():
+            with self._write_pool(group[0].created_at) as pool:
+                self._save_trace_bundles_to(pool, group)
+
+    def _save_trace_bundles_to(self, pool: SQLitePool, bundles: list[TraceBundle]) -> None:
+        with pool.write() as conn:
+            for bundle in bundles:
+                self._save_task_tx(conn, bundle.task)
+                self._save_candidates_tx(conn, bundle.candidates, created_at=bundle.created_at)
+                self._save_verification_tx(conn, bundle.verification, created_at=bundle.created_at)
+                self._save_vicdan_tx(conn, bundle.vicdan, created_at=bundle.created_at)
+                self._save_trace_tx(
+                    conn,
+                    trace_id=bundle.task.trace_id,
+                    task_id=bundle.task.task_id,
+                    request_summary=bundle.request_summary,
+                    selected_nodes=bundle.selected_nodes,
+                    candidate_ids=[c.candidate_id for c in bundle.candidates],
+                    verification_summary=bundle.verification.verification_summary,
+                    vicdan_status=bundle.vicdan.decision,
+                    final_output=bundle.final_output,
+                    total_duration_ms=bundle.total_duration_ms,
+                    created_at=bundle.created_at,
+                    hedges=bundle.hedges,
+                    hedge_wins=bundle.hedge_wins,
+                )
 
     def get_trace(self, trace_id: str) -> Optional[dict[str, Any]]:
-        conn = self._connect()
-        try:
-            row = conn.execute("SELECT * FROM traces WHERE trace_id = ?", (trace_id,)).fetchone()
-            return dict(row) if row else None
-        finally:
-            conn.close()
+        for pool in self._read_pools():
+            with pool.read() as conn:
+                row = conn.execute("SELECT * FROM traces WHERE trace_id = ?", (trace_id,)).fetchone()
+                if row:
+                    return resolve_blobs(conn, [dict(row)], "final_output", "final_output_blob")[0]
+        return None
 
     def get_candidates_by_task(self, task_id: str) -> list[dict[str, Any]]:
-        conn = self._connect()
-        try:
-            rows = conn.execute(
-                """
-                SELECT candidate_id, task_id, node_id, output_text,
-                       confidence_self_reported, evidence_refs_json,
-                       duration_ms, error_text, created_at
-                FROM candidate_answers
-                WHERE task_id = ?
-                ORDER BY id ASC
-                """,
-                (task_id,),
-            ).fetchall()
+        for pool in self._read_pools():
+            with pool.read() as conn:
+                rows = self._candidate_rows(conn, task_id)
+                if rows:
+                    return self._candidate_items(conn, rows)
+        return []
 
-            results: list[dict[str, Any]] = []
-            for row in rows:
-                item = dict(row)
-                item["evidence_refs"] = json.loads(item["evidence_refs_json"] or "[]")
-                item.pop("evidence_refs_json", None)
-                item["output"] = item.pop("output_text", None)
-                item["error"] = item.pop("error_text", None)
-                results.append(item)
-            return results
-        finally:
-            conn.close()
+    @staticmethod
+    def _candidate_rows(conn: sqlite3.Connection, task_id: str) -> list[sqlite3.Row]:
+        return conn.execute(
+            """
+            SELECT candidate_id, task_id, node_id, output_text, output_blob,
+                   confidence_self_reported, evidence_refs_json,
+                   duration_ms, error_text, created_at
+            FROM candidate_answers
+            WHERE task_id = ?
+            ORDER BY id ASC
+            """,
+            (task_id,),
+        ).fetchall()
+
+    @classmethod
+    def _candidate_items(cls, conn: sqlite3.Connection, rows: list[sqlite3.Row]) -> list[dict[str, Any]]:
+        return [cls._candidate_item(item) for item in resolve_blobs(conn, [dict(row) for row in rows], "output_text", "output_blob")]
+
+    @staticmethod
+    def _candidate_item(item: dict[str, Any]) -> dict[str, Any]:
+        item["evidence_refs"] = json.loads(item["evidence_refs_json"] or "[]")
+        item.pop("evidence_refs_json", None)
+        item["output"] = item.pop("output_text", None)
+        item["error"] = item.pop("error_text", None)
+        return item
+
+    @staticmethod
+    def _trace_search_where(
+        *,
+        since: Optional[str],
+        until: Optional[str],
+        vicdan_status: Optional[str],
+        node_id: Optional[str],
+        task_type: Optional[str],
+        policy_profile: Optional[str],
+        min_confidence: Optional[float],
+        max_confidence: Optional[float],
+    ) -> tuple[list[str], list[Any]]:
+        clauses: list[str] = []
+        params: list[Any] = []
+        for clause, value in (
+            ("t.created_at >= ?", since),
+            ("t.created_at < ?", until),
+            ("t.vicdan_status = ?", vicdan_status),
+            ("EXISTS (SELECT 1 FROM candidate_answers c WHERE c.task_id = t.task_id AND c.node_id = ?)", node_id),
+            ("k.task_type = ?", task_type),
+            ("k.policy_profile = ?", policy_profile),
+            ("v.confidence_score >= ?", min_confidence),
+            ("v.confidence_score <= ?", max_confidence),
+        ):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        return clauses, params
+
+    def search_traces(
+        self,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        vicdan_status: Optional[str] = None,
+        node_id: Optional[str] = None,
+        task_type: Optional[str] = None,
+        policy_profile: Optional[str] = None,
+        min_confidence: Optional[float] = None,
+        max_confidence: Optional[float] = None,
+        include_candidates: bool = False,
+        include_counts: bool = True,
+    ) -> dict[str, Any]:
+        """Newest-first trace summaries matching the filters, keyset-paginated on (created_at, id).
+
+        ``cursor`` is the ``next_cursor`` of the previous page. ``counts`` covers every
+        match, not just the page. Traces still queued in the write-behind writer are
+        not visible yet.
+        """
+        clauses, params = self._trace_search_where(
+            since=since, until=until, vicdan_status=vicdan_status, node_id=node_id, task_type=task_type,
+            policy_profile=policy_profile, min_confidence=min_confidence, max_confidence=max_confidence,
+        )
+        joins = "FROM traces t LEFT JOIN tasks k ON k.task_id = t.task_id LEFT JOIN verification_results v ON v.task_id = t.task_id"
+        page_clauses, page_params = list(clauses), list(params)
+        if cursor:
+            created_at, _, last_id = cursor.rpartition("|")
+            if not created_at or not last_id.isdigit():
+                raise ValueError(f"Invalid trace cursor: {cursor}")
+            page_clauses.append("(t.created_at, t.id) < (?, ?)")
+            page_params.extend([created_at, int(last_id)])
+        limit = max(1, min(limit, 200))
+        # Counts cover every match; without them the cursor also bounds which partitions to open.
+        upper = until if include_counts else min(filter(None, (until, cursor and cursor.rpartition("|")[0])), default=None)
+
+        items: list[dict[str, Any]] = []
+        by_status: dict[str, int] = {}
+        for pool in self._read_pools(since, upper):
+            # Partitions cover disjoint periods and come newest first, so filling the
+            # page store by store keeps the global order.
+            with pool.read() as conn:
+                if len(items) < limit:
+                    rows = conn.execute(
+                        f"""
+                        SELECT t.id, t.trace_id, t.task_id, t.request_summary, t.selected_nodes_json, t.verification_summary,
+                               t.vicdan_status, t.total_duration_ms, t.created_at, k.task_type, k.policy_profile, v.confidence_score
+                        {joins}
+                        {"WHERE " + " AND ".join(page_clauses) if page_clauses else ""}
+                        ORDER BY t.created_at DESC, t.id DESC
+                        LIMIT ?
+                        """,
+                        [*page_params, limit - len(items)],
+                    ).fetchall()
+                    page = []
+                    for row in rows:
+                        item = dict(row)
+                        item["selected_nodes"] = json.loads(item.pop("selected_nodes_json") or "[]")
+                        page.append(item)
+
+                    if include_candidates and page:
+                        by_task: dict[str, list[dict[str, Any]]] = {item["task_id"]: [] for item in page}
+                        rows = conn.execute(
+                            f"SELECT * FROM candidate_answers WHERE task_id IN ({','.join('?' * len(by_task))}) ORDER BY task_id, id",
+                            list(by_task),
+                        ).fetchall()
+                        for candidate in self._candidate_items(conn, rows):
+                            by_task[candidate["task_id"]].append(candidate)
+                        for item in page:
+                            item["candidates"] = by_task[item["task_id"]]
+                    items.extend(page)
+                elif not include_counts:
+                    break
+
+                if include_counts:
+                    for status, count in conn.execute(
+                        f"SELECT t.vicdan_status, COUNT(*) {joins} {'WHERE ' + ' AND '.join(clauses) if clauses else ''} GROUP BY t.vicdan_status",
+                        params,
+                    ):
+                        by_status[status] = by_status.get(status, 0) + count
+
+        result: dict[str, Any] = {
+            "traces": items,
+            "next_cursor": f"{items[-1]['created_at']}|{items[-1]['id']}" if len(items) == limit else None,
+        }
+        if include_counts:
+            result["counts"] = {"total": sum(by_status.values()), "by_vicdan_status": by_status}
+        return result
+
+
+DB = Database(
+    SETTINGS.db_path,
+    partition=SETTINGS.trace_partition,
+    partition_dir=SETTINGS.trace_partition_dir or None,
+    retention_days=parse_trace_retention(SETTINGS.trace_retention_days, SETTINGS.trace_retention),
+)
+
+
+class TraceWriter:
+    """Write-behind persistence for finished requests.
+
+    The request path only enqueues; one daemon thread drains up to ``batch_size``
+    items at a time, writes their trace bundles in one transaction and appends
+    their chain events in one batch. A full queue pushes back on callers instead
+    of growing without bound. Bundles stay visible through ``pending()`` until
+    they are committed, so a client can read its own trace straight away.
 
+    A chain append that still fails after ``chain_retries`` retries is written to
+    an NDJSON dead-letter file and replayed after the next successful append.
+    """
+
+    def __init__(
+        self,
+        db: Database,
+        chain: HOPEChain,
+        max_pending: int = 1024,
+        batch_size: int = 64,
+        enqueue_timeout_s: float = 5.0,
+        chain_retries: int = 3,
+        retry_backoff_s: float = 0.1,
+        dead_letter_path: Optional[str] = None,
+    ) -> None:
+        self.db = db
+        self.chain = chain
+        self.batch_size = max(1, batch_size)
+        self.enqueue_timeout_s = enqueue_timeout_s
+        self.chain_retries = max(0, chain_retries)
+        self.retry_backoff_s = retry_backoff_s
+        self.dead_letter_path = Path(dead_letter_path or f"{db.db_path}.chain-dead-letter.ndjson")
+        # Items are trace bundles or bare lists of chain events; None stops the thread.
+        self._queue: queue.Queue[TraceBundle | list[dict[str, Any]] | None] = queue.Queue(maxsize=max(1, max_pending))
+        self._pending: dict[str, TraceBundle] = {}
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self.written_bundles = 0
+        self.failed_bundles = 0
+        self.failed_chain_events = 0
+        self.dead_letter_events = 0
+        if self.dead_letter_path.exists():
+            with open(self.dead_letter_path, "rb") as handle:
+                self.dead_letter_events = sum(1 for line in handle if line.strip())
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="trace-writer", daemon=True)
+                self._thread.start()
+
+    def submit(self, item: TraceBundle | list[dict[str, Any]], block: bool = True) -> None:
+        """Enqueue a bundle or a batch of chain events, blocking up to ``enqueue_timeout_s`` for room.
+
+        Raises queue.Full when the writer cannot keep up, or at once when ``block`` is false.
+        """
+        self._ensure_started()
+        if isinstance(item, TraceBundle):
+            with self._lock:
+                self._pending[item.task.trace_id] = item
+        try:
+            self._queue.put(item, block=block, timeout=self.enqueue_timeout_s if block else None)
+        except queue.Full:
+            if isinstance(item, TraceBundle):
+                with self._lock:
+                    self._pending.pop(item.task.trace_id, None)
+            raise
+
+    async def submit_async(self, item: TraceBundle | list[dict[str, Any]]) -> None:
+        """``submit`` for the event loop: waits for room in a worker thread, never on the loop."""
+        try:
+            self.submit(item, block=False)
+        except queue.Full:
+            await asyncio.to_thread(self.submit, item)
+
+    def pending(self, trace_id: str) -> Optional[TraceBundle]:
+        with self._lock:
+            return self._pending.get(trace_id)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "queued": self._queue.qsize(),
+                "written_bundles": self.written_bundles,
+                "failed_bundles": self.failed_bundles,
+                "failed_chain_events": self.failed_chain_events,
+                "dead_letter_events": self.dead_letter_events,
+            }
+
+    def flush(self) -> None:
+        """Block until everything enqueued so far has been written."""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.join()
+
+    def close(self) -> None:
+        """Write out the queue and stop the writer thread."""
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            self._queue.put(None)
+            thread.join()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._write([item for item in batch if item is not None])
+            except Exception as exc:
+                logger.warning("trace writer batch failed: %s", exc)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if None in batch:
+                return
+
+    def _write(self, items: list[TraceBundle | list[dict[str, Any]]]) -> None:
+        bundles = [item for item in items if isinstance(item, TraceBundle)]
+        written = bundles
+        if bundles:
+            try:
+                self.db.save_trace_bundles(bundles)
+            except Exception as exc:
+                # One bad bundle must not take the rest of the batch with it.
+                logger.warning("trace batch write failed, retrying one by one: %s", exc)
+                written = []
+                for bundle in bundles:
+                    try:
+                        self.db.save_trace_bundles([bundle])
+                        written.append(bundle)
+                    except Exception as bundle_exc:
+                        logger.warning("trace_id=%s event=trace_write_failed error=%s", bundle.task.trace_id, bundle_exc)
+            with self._lock:
+                for bundle in bundles:
+                    self._pending.pop(bundle.task.trace_id, None)
+                self.written_bundles += len(written)
+                self.failed_bundles += len(bundles) - len(written)
+
+        # A trace that failed to persist does not get chain events pointing at it.
+        written_ids = {id(bundle) for bundle in written}
+        events: list[dict[str, Any]] = []
+        for item in items:
+            if not isinstance(item, TraceBundle):
+                events.extend(item)
+            elif id(item) in written_ids:
+                events.extend(item.chain_events)
+        if events and self._record_events(events) and self.dead_letter_events:
+            try:
+                self.replay_dead_letters()
+            except Exception as exc:
+                logger.warning("hopechain dead-letter replay failed: %s", exc)
 
-DB = Database(SETTINGS.db_path)
+    def _record_events(self, events: list[dict[str, Any]]) -> bool:
+        """Append chain events, retrying with backoff; dead-letter them if every attempt fails."""
+        for attempt in range(self.chain_retries + 1):
+            try:
+                self.chain.record_events(events)
+                return True
+            except Exception as exc:
+                error = exc
+                if attempt < self.chain_retries:
+                    time.sleep(self.retry_backoff_s * 2 ** attempt)
+        logger.error("hopechain write-behind batch failed, dead-lettering %s events: %s", len(events), error)
+        with self._lock:
+            self.failed_chain_events += len(events)
+        try:
+            with open(self.dead_letter_path, "a", encoding="utf-8") as handle:
+                for event in events:
+                    handle.write(json.dumps(event, separators=(",", ":"), default=str) + "\n")
+        except OSError as exc:
+            logger.error("event=chain_events_lost count=%s error=%s", len(events), exc)
+            return False
+        with self._lock:
+            self.dead_letter_events += len(events)
+        return False
+
+    def replay_dead_letters(self) -> int:
+        """Append the dead-lettered chain events and clear the file; returns how many were written.
+
+        Only call this from the writer thread, or while it is stopped: it is the only
+        other writer of the dead-letter file.
+        """
+        if not self.dead_letter_path.exists():
+            return 0
+        with open(self.dead_letter_path, "rb") as handle:
+            events = [json.loads(line) for line in handle if line.strip()]
+        if events:
+            self.chain.record_events(events)
+        self.dead_letter_path.unlink()
+        with self._lock:
+            self.dead_letter_events = 0
+        logger.info("event=chain_dead_letters_replayed count=%s", len(events))
+        return len(events)
+
+
+TRACE_WRITER = TraceWriter(
+    DB,
+    HOPECHAIN,
+    max_pending=SETTINGS.trace_queue_size,
+    batch_size=SETTINGS.trace_batch_size,
+    enqueue_timeout_s=SETTINGS.trace_enqueue_timeout_s,
+    chain_retries=SETTINGS.trace_chain_retries,
+    dead_letter_path=SETTINGS.trace_dead_letter_path or None,
+)
 
 
 class TaskClassifier:
@@ -653,6 +3050,220 @@ class TaskClassifier:
         return "general"
 
 
+class HTTPClientPool:
+    """One long-lived httpx.AsyncClient shared by every call to an upstream.
+
+    Connections are kept alive between requests, so only the first request to an
+    idle upstream pays for DNS, TCP and TLS. HTTP/2 is used when asked for and the
+    optional ``h2`` package is installed. Each request is traced to count fresh
+    connections and the time spent waiting for a pooled one.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        max_connections: int = 20,
+        max_keepalive: int = 10,
+        keepalive_expiry_s: float = 60.0,
+        http2: bool = False,
+        timeout_s: float = 20.0,
+    ) -> None:
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("http pool %s: HTTP/2 requested but the h2 package is not installed; using HTTP/1.1", name)
+            http2 = False
+        self.name = name
+        self.http2 = http2
+        self.limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive, keepalive_expiry=keepalive_expiry_s)
+        self.timeout_s = timeout_s
+        self._client: Optional[httpx.AsyncClient] = None
+        self.requests = 0
+        self.failures = 0
+        self.new_connections = 0
+        self.pool_wait_ms_total = 0.0
+        self.pool_wait_ms_max = 0.0
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(limits=self.limits, http2=self.http2, timeout=self.timeout_s)
+        return self._client
+
+    async def request(self, method: str, url: str, *, expect_success: bool = True, **kwargs: Any) -> httpx.Response:
+        """Send one request through the pool; transport errors and, unless ``expect_success`` is off, non-2xx answers count as failures."""
+        started = time.perf_counter()
+        state: dict[str, Any] = {"connect_s": 0.0, "new": False}
+
+        async def trace(event: str, info: dict[str, Any]) -> None:
+            now = time.perf_counter()
+            step = event.split(".", 1)[-1]
+            if step in ("connect_tcp.started", "start_tls.started"):
+                state["new"] = True
+                state["mark"] = now
+            elif step in ("connect_tcp.complete", "start_tls.complete", "connect_tcp.failed", "start_tls.failed"):
+                state["connect_s"] += now - state.pop("mark", now)
+            elif step == "send_request_headers.started" and "sent_at" not in state:
+                state["sent_at"] = now
+
+        try:
+            response = await self.client.request(method, url, extensions={"trace": trace}, **kwargs)
+        except Exception:
+            self.failures += 1
+            raise
+        else:
+            if expect_success and not response.is_success:
+                self.failures += 1
+            return response
+        finally:
+            self.requests += 1
+            self.new_connections += state["new"]
+            if "sent_at" in state:
+                wait_ms = max(0.0, (state["sent_at"] - started - state["connect_s"]) * 1000)
+                self.pool_wait_ms_total += wait_ms
+                self.pool_wait_ms_max = max(self.pool_wait_ms_max, wait_ms)
+
+    async def warm_up(self, url: str, **kwargs: Any) -> bool:
+        """Open a connection to ``url`` ahead of the first real request; any HTTP status counts."""
+        try:
+            await self.request("HEAD", url, expect_success=False, **kwargs)
+            return True
+        except Exception as exc:
+            logger.warning("http pool %s warm-up failed: %s", self.name, exc)
+            return False
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "http2": self.http2,
+            "requests": self.requests,
+            "failures": self.failures,
+            "new_connections": self.new_connections,
+            "reuse_rate": round(1 - self.new_connections / self.requests, 4) if self.requests else None,
+            "pool_wait_ms_avg": round(self.pool_wait_ms_total / self.requests, 3) if self.requests else None,
+            "pool_wait_ms_max": round(self.pool_wait_ms_max, 3),
+        }
+
+
+EXTERNAL_LLM_HTTP = HTTPClientPool(
+    "external_llm",
+    max_connections=SETTINGS.external_llm_max_connections,
+    max_keepalive=SETTINGS.external_llm_max_keepalive,
+    keepalive_expiry_s=SETTINGS.external_llm_keepalive_s,
+    http2=SETTINGS.external_llm_http2,
+    timeout_s=SETTINGS.node_timeout_ms / 1000,
+)
+
+
+class LatencyHistogram:
+    """Rolling latency distribution of one node: an EWMA plus a log-bucket quantile sketch.
+
+    Bucket bounds grow by ``gamma``, so every quantile is within about (gamma - 1) / 2
+    relative error whether the node answers in microseconds or in seconds. All counts
+    are halved every ``half_life`` observations, so the sketch follows the node's
+    recent behaviour rather than its whole history.
+    """
+
+    def __init__(self, gamma: float = 1.08, half_life: int = 512, alpha: float = 0.1) -> None:
+        self.gamma = gamma
+        self._log_gamma = math.log(gamma)
+        self.half_life = half_life
+        self.alpha = alpha
+        self._buckets: dict[int, float] = {}
+        self._total = 0.0
+        self.samples = 0
+        self.ewma_ms: Optional[float] = None
+        self.ewm_dev_ms = 0.0
+
+    def observe(self, latency_ms: float) -> None:
+        latency_ms = max(float(latency_ms), 0.01)
+        index = math.ceil(math.log(latency_ms) / self._log_gamma)
+        self._buckets[index] = self._buckets.get(index, 0.0) + 1
+        self._total += 1
+        self.samples += 1
+        if self.ewma_ms is None:
+            self.ewma_ms = latency_ms
+        else:
+            self.ewm_dev_ms += self.alpha * (abs(latency_ms - self.ewma_ms) - self.ewm_dev_ms)
+            self.ewma_ms += self.alpha * (latency_ms - self.ewma_ms)
+        if self.samples % self.half_life == 0:
+            self._buckets = {i: c / 2 for i, c in self._buckets.items() if c >= 0.02}
+            self._total = sum(self._buckets.values())
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self._buckets:
+            return None
+        rank, seen = q * self._total, 0.0
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen >= rank:
+                break
+        # Midpoint of the bucket (gamma^(i-1), gamma^i].
+        return 2 * self.gamma ** index / (self.gamma + 1)
+
+    def stats(self) -> dict[str, Any]:
+        def rounded(value: Optional[float]) -> Optional[float]:
+            return None if value is None else round(value, 3)
+        return {
+            "samples": self.samples,
+            "ewma_ms": rounded(self.ewma_ms),
+            "ewm_dev_ms": rounded(self.ewm_dev_ms),
+            "p50_ms": rounded(self.quantile(0.5)),
+            "p90_ms": rounded(self.quantile(0.9)),
+            "p99_ms": rounded(self.quantile(0.99)),
+        }
+
+
+@dataclass(frozen=True)
+class HedgePolicy:
+    """When to send a duplicate request to a node that has not answered yet.
+
+    The hedge goes out once the primary has run for the node's ``quantile`` latency,
+    and only after ``min_samples`` runs have been observed.
+    """
+
+    quantile: float = 0.9
+    min_samples: int = 20
+    min_delay_ms: float = 0.0
+
+
+class HedgeBudget:
+    """Caps hedges at ``percent`` of primary requests across all nodes.
+
+    Every primary request earns percent/100 of a token, every hedge spends one;
+    ``burst`` bounds how many unspent tokens can pile up during quiet periods.
+    """
+
+    def __init__(self, percent: float = 5.0, burst: float = 10.0) -> None:
+        self.ratio = max(0.0, percent) / 100
+        self.burst = burst
+        self._tokens = 0.0
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.hedges = 0
+        self.denied = 0
+
+    def record_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+            self._tokens = min(self.burst, self._tokens + self.ratio)
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if self._tokens < 1:
+                self.denied += 1
+                return False
+            self._tokens -= 1
+            self.hedges += 1
+            return True
+
+
+HEDGE_BUDGET = HedgeBudget(SETTINGS.hedge_budget_percent)
+
+
 class BaseNode(ABC):
     node_id: str
     node_type: str
@@ -663,11 +3274,16 @@ class BaseNode(ABC):
     latency_weight: float
     policy_tags: list[str]
     enabled: bool
+    hedge_policy: Optional[HedgePolicy] = None
 
     @abstractmethod
     async def run(self, task: TaskContext) -> CandidateAnswer:
         raise NotImplementedError
 
+    async def run_hedge(self, task: TaskContext) -> CandidateAnswer:
+        """The duplicate request sent when hedging; nodes with replicas can send it elsewhere."""
+        return await self.run(task)
+
 
 class LocalNode(BaseNode):
     def __init__(self) -> None:
@@ -733,7 +3349,8 @@ class LocalNode(BaseNode):
 
 
 class ExternalLLMNode(BaseNode):
-    def __init__(self) -> None:
+    def __init__(self, http: Optional[HTTPClientPool] = None) -> None:
+        self.http = http or EXTERNAL_LLM_HTTP
         self.node_id = SETTINGS.external_node_name
         self.node_type = "external_llm"
         self.capabilities = ["general", "technical", "higher_reasoning"]
@@ -743,6 +3360,8 @@ class ExternalLLMNode(BaseNode):
         self.latency_weight = 0.60
         self.policy_tags = ["default", "strict"]
         self.enabled = True
+        if SETTINGS.external_llm_hedge:
+            self.hedge_policy = HedgePolicy(quantile=SETTINGS.hedge_quantile, min_samples=SETTINGS.hedge_min_samples)
 
     async def run(self, task: TaskContext) -> CandidateAnswer:
         start = time.perf_counter()
@@ -768,16 +3387,16 @@ class ExternalLLMNode(BaseNode):
             }
 
             try:
-                timeout = SETTINGS.node_timeout_ms / 1000
-                async with httpx.AsyncClient(timeout=timeout) as client:
-                    response = await client.post(
-                        f"{SETTINGS.external_llm_base_url.rstrip('/')}/chat/completions",
-                        headers=headers,
-                        json=payload,
-                    )
-                    response.raise_for_status()
-                    data = response.json()
-                    content = data["choices"][0]["message"]["content"]
+                response = await self.http.request(
+                    "POST",
+                    f"{SETTINGS.external_llm_base_url.rstrip('/')}/chat/completions",
+                    headers=headers,
+                    json=payload,
+                    timeout=SETTINGS.node_timeout_ms / 1000,
+                )
+                response.raise_for_status()
+                data = response.json()
+                content = data["choices"][0]["message"]["content"]
 
                 return CandidateAnswer(
                     candidate_id=generate_id("cand"),
@@ -888,8 +3507,38 @@ class RetrievalNode(BaseNode):
 
 
 class NodeRegistry:
-    def __init__(self) -> None:
+    def __init__(self, adaptive_timeouts: Optional[bool] = None) -> None:
         self._nodes: dict[str, BaseNode] = {}
+        self._latency: dict[str, LatencyHistogram] = {}
+        self.adaptive_timeouts = SETTINGS.adaptive_node_timeouts if adaptive_timeouts is None else adaptive_timeouts
+
+    def observe(self, node_id: str, latency_ms: float) -> None:
+        self.latency(node_id).observe(latency_ms)
+
+    def latency(self, node_id: str) -> LatencyHistogram:
+        histogram = self._latency.get(node_id)
+        if histogram is None:
+            histogram = self._latency[node_id] = LatencyHistogram()
+        return histogram
+
+    def timeout_ms(self, node_id: str) -> float:
+        """How long to wait for ``node_id``, derived from its own latency distribution.
+
+        The larger of quantile x multiplier and EWMA + 4 deviations, kept within
+        [NODE_TIMEOUT_MIN_MS, NODE_TIMEOUT_MAX_MS]. Until enough runs have been seen,
+        or with adaptive timeouts off, it is NODE_TIMEOUT_MS.
+        """
+        histogram = self._latency.get(node_id)
+        if not self.adaptive_timeouts or histogram is None or histogram.samples < SETTINGS.node_timeout_min_samples:
+            return float(SETTINGS.node_timeout_ms)
+        derived = max(
+            (histogram.quantile(SETTINGS.node_timeout_quantile) or 0.0) * SETTINGS.node_timeout_multiplier,
+            (histogram.ewma_ms or 0.0) + 4 * histogram.ewm_dev_ms,
+        )
+        return float(min(max(derived, SETTINGS.node_timeout_min_ms), SETTINGS.node_timeout_max_ms))
+
+    def latency_stats(self, node_id: str) -> dict[str, Any]:
+        return {**self.latency(node_id).stats(), "timeout_ms": round(self.timeout_ms(node_id), 1)}
 
     def register(self, node: BaseNode) -> None:
         self._nodes[node.node_id] = node
@@ -1101,29 +3750,180 @@ class VicdanEngine:
         return "Vicdan rejection: the system cannot provide the requested output because it violates the active safety policy."
 
 
+class ReasonPipeline:
+    """Post-processing stages fed with each finished request's in-memory TraceBundle.
+
+    Stages run in registration order before the bundle is queued for writing and
+    may add to it (e.g. its chain events). A failing stage is logged and skipped.
+    """
+
+    def __init__(self) -> None:
+        self._stages: list[Callable[[TraceBundle], None]] = []
+
+    def add_stage(self, stage: Callable[[TraceBundle], None]) -> None:
+        self._stages.append(stage)
+
+    def run(self, bundle: TraceBundle) -> TraceBundle:
+        for stage in self._stages:
+            try:
+                stage(bundle)
+            except Exception as exc:
+                logger.warning("trace_id=%s event=pipeline_stage_failed stage=%s error=%s", bundle.task.trace_id, getattr(stage, "__name__", stage), exc)
+        return bundle
+
+
+REASON_PIPELINE = ReasonPipeline()
+
+
 class Observer:
     @staticmethod
-    def persist(task: TaskContext, candidates: list[CandidateAnswer], verification: VerificationResult, vicdan: VicdanResult, final_output: str, total_duration_ms: int) -> None:
-        DB.save_task(task)
-        DB.save_candidates(candidates)
-        DB.save_verification(verification)
-        DB.save_vicdan(vicdan)
-        DB.save_trace(
-            trace_id=task.trace_id,
-            task_id=task.task_id,
+    def bundle(
+        task: TaskContext,
+        candidates: list[CandidateAnswer],
+        verification: VerificationResult,
+        vicdan: VicdanResult,
+        final_output: str,
+        total_duration_ms: int,
+        hedges: Optional[dict[str, int]] = None,
+    ) -> TraceBundle:
+        return TraceBundle(
+            task=task,
+            candidates=candidates,
+            verification=verification,
+            vicdan=vicdan,
             request_summary=summarize_prompt(task.prompt),
             selected_nodes=list({c.node_id for c in candidates}),
-            candidate_ids=[c.candidate_id for c in candidates],
-            verification_summary=verification.verification_summary,
-            vicdan_status=vicdan.decision,
             final_output=final_output,
             total_duration_ms=total_duration_ms,
+            hedges=(hedges or {}).get("hedges", 0),
+            hedge_wins=(hedges or {}).get("hedge_wins", 0),
         )
 
+    @staticmethod
+    async def persist(bundle: TraceBundle) -> None:
+        try:
+            await TRACE_WRITER.submit_async(bundle)
+        except queue.Full:
+            raise HTTPException(status_code=503, detail="Trace persistence is backlogged, retry shortly")
+
+
+# error_text of candidates whose node was stopped once the quorum agreed.
+QUORUM_CANCELLED = "cancelled_by_quorum"
+
 
 class Orchestrator:
-    def __init__(self, registry: NodeRegistry) -> None:
+    def __init__(
+        self,
+        registry: NodeRegistry,
+        pipeline: Optional[ReasonPipeline] = None,
+        quorum: Optional[int] = None,
+        quorum_agreement: Optional[float] = None,
+        hedge_budget: Optional[HedgeBudget] = None,
+    ) -> None:
         self.registry = registry
+        self.pipeline = pipeline or REASON_PIPELINE
+        self.hedge_budget = hedge_budget or HEDGE_BUDGET
+        self.quorum = SETTINGS.reason_quorum if quorum is None else quorum
+        self.quorum_agreement = SETTINGS.reason_quorum_agreement if quorum_agreement is None else quorum_agreement
+
+    async def _collect_candidates(
+        self,
+        task: TaskContext,
+        nodes: list[BaseNode],
+        run: Callable[[BaseNode], Any],
+    ) -> list[CandidateAnswer]:
+        """Run ``nodes`` concurrently and return their candidates in node order.
+
+        With a quorum of k set, stop as soon as k valid candidates reach the agreement
+        threshold; the nodes still running are cancelled and recorded as such.
+        """
+        if not 0 < self.quorum < len(nodes):
+            return list(await asyncio.gather(*[run(node) for node in nodes]))
+
+        started = time.perf_counter()
+        running = {asyncio.create_task(run(node)): node for node in nodes}
+        results: dict[str, CandidateAnswer] = {}
+        while running:
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for finished in done:
+                results[running.pop(finished).node_id] = finished.result()
+            valid = [c for c in results.values() if c.output and not c.error]
+            if running and len(valid) >= self.quorum and VerificationEngine.compute_agreement_score(valid) >= self.quorum_agreement:
+                break
+
+        if running:
+            for straggler in running:
+                straggler.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+            elapsed_ms = int((time.perf_counter() - started) * 1000)
+            logger.info("trace_id=%s event=quorum_reached cancelled=%s", task.trace_id, [n.node_id for n in running.values()])
+            for node in running.values():
+                results[node.node_id] = CandidateAnswer(
+                    candidate_id=generate_id("cand"),
+                    task_id=task.task_id,
+                    node_id=node.node_id,
+                    duration_ms=elapsed_ms,
+                    error=QUORUM_CANCELLED,
+                )
+        return [results[node.node_id] for node in nodes]
+
+    async def _run_hedged(self, node: BaseNode, task: TaskContext, hedges: dict[str, int]) -> CandidateAnswer:
+        """Run ``node``; past its hedge delay, race a duplicate request if the budget allows.
+
+        The first valid answer wins and the other request is cancelled. ``hedges``
+        counts the request's hedges and how many of them won.
+        """
+        policy = node.hedge_policy
+        if policy is None:
+            return await node.run(task)
+        # Only hedgeable requests earn budget, so unhedged nodes cannot fund hedges for others.
+        self.hedge_budget.record_request()
+        latency = self.registry.latency(node.node_id)
+        if latency.samples < policy.min_samples:
+            return await node.run(task)
+
+        delay_ms = max(policy.min_delay_ms, latency.quantile(policy.quantile) or 0.0)
+        primary = asyncio.create_task(node.run(task))
+        running = {primary}
+        try:
+            done, _ = await asyncio.wait(running, timeout=delay_ms / 1000)
+            if done or not self.hedge_budget.try_acquire():
+                return await primary
+            hedge = asyncio.create_task(node.run_hedge(task))
+            running.add(hedge)
+            hedges["hedges"] = hedges.get("hedges", 0) + 1
+            logger.info("trace_id=%s event=hedge node=%s after_ms=%.0f", task.trace_id, node.node_id, delay_ms)
+
+            fallback: Optional[CandidateAnswer] = None
+            while running:
+                done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for finished in done:
+                    candidate = finished.result()
+                    if candidate.output and not candidate.error:
+                        if finished is hedge:
+                            hedges["hedge_wins"] = hedges.get("hedge_wins", 0) + 1
+                        return candidate
+                    fallback = fallback or candidate
+            return fallback
+        finally:
+            for pending in running:
+                pending.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+    async def _finish(
+        self,
+        task: TaskContext,
+        candidates: list[CandidateAnswer],
+        verification: VerificationResult,
+        vicdan: VicdanResult,
+        final_output: str,
+        total_duration_ms: int,
+        hedges: Optional[dict[str, int]] = None,
+    ) -> None:
+        """Pass the finished request, as built in memory, through the pipeline and on to the trace writer."""
+        bundle = self.pipeline.run(Observer.bundle(task, candidates, verification, vicdan, final_output, total_duration_ms, hedges))
+        await Observer.persist(bundle)
 
     async def execute_reasoning(self, request: ReasonRequest) -> FinalResponse:
         started = time.perf_counter()
@@ -1152,11 +3952,27 @@ class Orchestrator:
 
         logger.info("trace_id=%s event=nodes_selected nodes=%s", trace_id, [n.node_id for n in selected_nodes])
 
-        timeout = SETTINGS.node_timeout_ms / 1000
+        hedges: dict[str, int] = {}
 
         async def _safe_run(node: BaseNode) -> CandidateAnswer:
+            timeout = self.registry.timeout_ms(node.node_id) / 1000
+            node_started = time.perf_counter()
             try:
-                return await asyncio.wait_for(node.run(task), timeout=timeout)
+                candidate = await asyncio.wait_for(self._run_hedged(node, task, hedges), timeout=timeout)
+                if candidate.output and not candidate.error:
+                    # Wall-clock time from the primary's start: a winning hedge's own duration would read low.
+                    self.registry.observe(node.node_id, (time.perf_counter() - node_started) * 1000)
+                return candidate
+            except asyncio.TimeoutError:
+                # Count the timeout itself as a run, so a node that slows down pushes its timeout up instead of timing out forever.
+                self.registry.observe(node.node_id, timeout * 1000)
+                return CandidateAnswer(
+                    candidate_id=generate_id("cand"),
+                    task_id=task.task_id,
+                    node_id=node.node_id,
+                    duration_ms=int(timeout * 1000),
+                    error=f"node_timeout: no answer within {int(timeout * 1000)} ms",
+                )
             except Exception as exc:
                 return CandidateAnswer(
                     candidate_id=generate_id("cand"),
@@ -1169,7 +3985,7 @@ class Orchestrator:
                     error=f"node_runtime_error: {exc}",
                 )
 
-        candidates = await asyncio.gather(*[_safe_run(node) for node in selected_nodes])
+        candidates = await self._collect_candidates(task, selected_nodes, _safe_run)
         valid_candidates = [c for c in candidates if c.output and not c.error]
 
         verification = VerificationEngine.verify(task, candidates)
@@ -1177,7 +3993,7 @@ class Orchestrator:
             vicdan = VicdanResult(task_id=task.task_id, decision="REJECT", risk_scores={}, rationale="No valid candidate selected by verification.", required_modification="Return system-safe failure message.")
             final_output = "HOPEverse could not produce a sufficiently valid response because all candidate paths inside HOPEtensor failed verification."
             total_duration_ms = int((time.perf_counter() - started) * 1000)
-            Observer.persist(task, candidates, verification, vicdan, final_output, total_duration_ms)
+            await self._finish(task, candidates, verification, vicdan, final_output, total_duration_ms, hedges)
             return FinalResponse(answer=final_output, confidence=0.0, selected_nodes=[c.node_id for c in candidates], verification_summary=verification.verification_summary, vicdan_status=vicdan.decision, trace_id=trace_id)
 
         selected_candidate = next((c for c in valid_candidates if c.candidate_id == verification.selected_candidate_id), None)
@@ -1201,7 +4017,7 @@ class Orchestrator:
             final_output = "HOPEverse produced a response through HOPEtensor, but it did not meet the required confidence threshold.\n\n" + final_output
 
         total_duration_ms = int((time.perf_counter() - started) * 1000)
-        Observer.persist(task, candidates, verification, vicdan, final_output, total_duration_ms)
+        await self._finish(task, candidates, verification, vicdan, final_output, total_duration_ms, hedges)
 
         return FinalResponse(
             answer=final_output,
@@ -1498,49 +4314,50 @@ def plan_from_request(req: PlanRequest) -> dict[str, Any]:
 
 
 
-def write_reason_events_to_hopechain(trace_id: str, candidates: list[CandidateAnswer], verification: VerificationResult, vicdan: VicdanResult) -> list[dict[str, Any]]:
-    records: list[dict[str, Any]] = []
+def reason_chain_events(trace_id: str, candidates: list[CandidateAnswer], verification: VerificationResult, vicdan: VicdanResult) -> list[dict[str, Any]]:
+    events: list[dict[str, Any]] = []
     for candidate in candidates:
+        if candidate.error == QUORUM_CANCELLED:
+            continue  # stopped by us, not a failure of the node
         preview = candidate.output or candidate.error or "No output"
-        confidence = float(candidate.confidence_self_reported or 0.0)
-        success = not bool(candidate.error)
-        try:
-            records.append(
-                HOPECHAIN.record_node_execution(
-                    trace_id=trace_id,
-                    actor_name=candidate.node_id,
-                    output_preview=preview,
-                    confidence=confidence,
-                    duration_ms=candidate.duration_ms,
-                    success=success,
-                )
-            )
-        except Exception as exc:
-            records.append({"actor_name": candidate.node_id, "error": f"hopechain_node_write_failed: {exc}"})
-
-    try:
-        records.append(
-            HOPECHAIN.record_goal_decision(
+        events.append(
+            HOPEChain.node_execution_event(
                 trace_id=trace_id,
-                actor_name="vicdan",
-                goal_id=verification.selected_candidate_id or "no_candidate",
-                rank=1,
-                expected_impact=float(verification.confidence_score),
-                vicdan_alignment=vicdan.decision,
+                actor_name=candidate.node_id,
+                output_preview=preview,
+                confidence=float(candidate.confidence_self_reported or 0.0),
+                duration_ms=candidate.duration_ms,
+                success=not bool(candidate.error),
             )
         )
-    except Exception as exc:
-        records.append({"actor_name": "vicdan", "error": f"hopechain_vicdan_write_failed: {exc}"})
+    events.append(
+        HOPEChain.goal_decision_event(
+            trace_id=trace_id,
+            actor_name="vicdan",
+            goal_id=verification.selected_candidate_id or "no_candidate",
+            rank=1,
+            expected_impact=float(verification.confidence_score),
+            vicdan_alignment=vicdan.decision,
+        )
+    )
+    return events
+
+
+def record_reason_chain_events(bundle: TraceBundle) -> None:
+    """Pipeline stage: attach the request's chain events so they are written in the same batch as its trace."""
+    bundle.chain_events.extend(reason_chain_events(bundle.task.trace_id, bundle.candidates, bundle.verification, bundle.vicdan))
 
-    return records
+
+REASON_PIPELINE.add_stage(record_reason_chain_events)
 
 
 def write_plan_events_to_hopechain(trace_id: str, plan_output: dict[str, Any]) -> list[dict[str, Any]]:
-    records: list[dict[str, Any]] = []
+    events: list[dict[str, Any]] = []
+    skipped: list[dict[str, Any]] = []
     for decision in plan_output.get("decisions", []):
         try:
-            records.append(
-                HOPECHAIN.record_goal_decision(
+            events.append(
+                HOPEChain.goal_decision_event(
                     trace_id=trace_id,
                     actor_name="hopecore",
                     goal_id=decision.get("goal_id", "unknown_goal"),
@@ -1550,8 +4367,12 @@ def write_plan_events_to_hopechain(trace_id: str, plan_output: dict[str, Any]) -
                 )
             )
         except Exception as exc:
-            records.append({"actor_name": "hopecore", "goal_id": decision.get("goal_id"), "error": f"hopechain_plan_write_failed: {exc}"})
-    return records
+            skipped.append({"actor_name": "hopecore", "goal_id": decision.get("goal_id"), "error": f"hopechain_plan_write_failed: {exc}"})
+
+    try:
+        return HOPECHAIN.record_events(events) + skipped
+    except Exception as exc:
+        return [{"actor_name": "hopecore", "error": f"hopechain_plan_write_failed: {exc}"}] + skipped
 
 
 
@@ -1568,16 +4389,11 @@ class DIDLoginRequest(BaseModel):
 class IdentityStore:
     def __init__(self, db_path: str) -> None:
         self.db_path = db_path
+        self.pool = sqlite_pool(db_path)
         self._init_db()
 
-    def _connect(self):
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
-
     def _init_db(self) -> None:
-        conn = self._connect()
-        try:
+        with self.pool.write() as conn:
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS hope_identities (
                     did TEXT PRIMARY KEY,
@@ -1594,61 +4410,43 @@ class IdentityStore:
                     created_at TEXT NOT NULL
                 )
             """)
-            conn.commit()
-        finally:
-            conn.close()
 
     def create_identity(self, display_name: str, actor_type: str) -> dict[str, Any]:
         slug = re.sub(r"[^a-zA-Z0-9]+", "-", display_name.lower()).strip("-") or "citizen"
         did = f"did:hope:{slug}-{uuid.uuid4().hex[:8]}"
         now = utc_now()
-        conn = self._connect()
-        try:
+        with self.pool.write() as conn:
             conn.execute(
                 "INSERT INTO hope_identities (did, display_name, actor_type, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
                 (did, display_name, actor_type, now, now),
             )
-            conn.commit()
-        finally:
-            conn.close()
         return self.get_identity(did)
 
     def get_identity(self, did: str) -> Optional[dict[str, Any]]:
-        conn = self._connect()
-        try:
+        with self.pool.read() as conn:
             row = conn.execute("SELECT * FROM hope_identities WHERE did = ?", (did,)).fetchone()
             return dict(row) if row else None
-        finally:
-            conn.close()
 
     def create_session(self, did: str) -> str:
         token = secrets.token_hex(24)
-        conn = self._connect()
-        try:
+        with self.pool.write() as conn:
             conn.execute("INSERT INTO hope_sessions (token, did, created_at) VALUES (?, ?, ?)", (token, did, utc_now()))
-            conn.commit()
-        finally:
-            conn.close()
         return token
 
     def get_session(self, token: str) -> Optional[dict[str, Any]]:
-        conn = self._connect()
-        try:
+        with self.pool.read() as conn:
             row = conn.execute("SELECT * FROM hope_sessions WHERE token = ?", (token,)).fetchone()
             return dict(row) if row else None
-        finally:
-            conn.close()
 
     def reputation_for_did(self, did: str) -> dict[str, Any]:
         identity = self.get_identity(did)
         if not identity:
             raise HTTPException(status_code=404, detail="Identity not found")
 
-        events = HOPECHAIN.db.list_recent_events(500)
-        mine = [ev for ev in events if (ev.get("actor_did") == did)]
-        contribution_count = len(mine)
-        avg_impact = (sum(float(ev.get("impact_score") or 0) for ev in mine) / contribution_count) if contribution_count else 0.0
-        trust_score = 0.5 + sum(float(ev.get("trust_delta") or 0) for ev in mine)
+        rep = HOPECHAIN.db.get_reputation(did)
+        contribution_count = int(rep["contribution_count"]) if rep else 0
+        avg_impact = (float(rep["impact_sum"]) / contribution_count) if contribution_count else 0.0
+        trust_score = 0.5 + (float(rep["trust_delta_sum"]) if rep else 0.0)
         trust_score = clamp(trust_score, 0.0, 1.0)
         reputation_score = clamp(0.45 + avg_impact * 0.35 + min(contribution_count / 20, 1.0) * 0.20, 0.0, 1.0)
         return {
@@ -1656,13 +4454,73 @@ class IdentityStore:
             "reputation_score": round(reputation_score, 4),
             "trust_score": round(trust_score, 4),
             "contribution_count": contribution_count,
-            "recent_events": mine[:10],
+            "recent_events": HOPECHAIN.db.list_events(limit=10, actor_did=did),
         }
 
 
 IDENTITY_STORE = IdentityStore(SETTINGS.db_path)
 
-app = FastAPI(title=SETTINGS.app_name, version=SETTINGS.app_version)
+
+async def chain_full_verify_loop(interval_s: int) -> None:
+    while True:
+        await asyncio.sleep(interval_s)
+        try:
+            result = await asyncio.to_thread(HOPECHAIN.db.verify_chain, full=True)
+            if result["ok"]:
+                logger.info("event=chain_full_verify ok checked=%s", result["checked_records"])
+            else:
+                logger.error("event=chain_full_verify failed error=%s", result.get("error"))
+        except Exception as exc:
+            logger.warning("chain full verify skipped: %s", exc)
+
+
+async def chain_archive_loop(interval_s: int, keep_recent: int) -> None:
+    while True:
+        await asyncio.sleep(interval_s)
+        try:
+            result = await asyncio.to_thread(HOPECHAIN.db.compact, keep_recent)
+            if result["ok"]:
+                logger.info("event=chain_archive segments=%s events=%s through=%s", result["archived_segments"], result["archived_events"], result["archived_through"])
+            else:
+                logger.error("event=chain_archive failed error=%s", result.get("error"))
+        except Exception as exc:
+            logger.warning("chain archive skipped: %s", exc)
+
+
+async def trace_retention_loop(interval_s: int) -> None:
+    while True:
+        await asyncio.sleep(interval_s)
+        try:
+            result = await asyncio.to_thread(DB.apply_retention)
+            if result["dropped_partitions"] or result["emptied_tables"]:
+                logger.info("event=trace_retention dropped=%s emptied=%s", result["dropped_partitions"], result["emptied_tables"])
+        except Exception as exc:
+            logger.warning("trace retention skipped: %s", exc)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    background: list[asyncio.Task] = []
+    if SETTINGS.chain_full_verify_interval_s > 0:
+        background.append(asyncio.create_task(chain_full_verify_loop(SETTINGS.chain_full_verify_interval_s)))
+    if SETTINGS.chain_archive_interval_s > 0 and hasattr(HOPECHAIN.db, "compact"):
+        background.append(asyncio.create_task(chain_archive_loop(SETTINGS.chain_archive_interval_s, SETTINGS.chain_archive_keep_recent)))
+    if SETTINGS.trace_retention_interval_s > 0 and DB.partition != "none" and DB.retention_days:
+        background.append(asyncio.create_task(trace_retention_loop(SETTINGS.trace_retention_interval_s)))
+    if SETTINGS.external_llm_warmup and SETTINGS.external_llm_api_key and NODE_REGISTRY.get(SETTINGS.external_node_name):
+        background.append(asyncio.create_task(EXTERNAL_LLM_HTTP.warm_up(SETTINGS.external_llm_base_url, timeout=5.0)))
+    try:
+        yield
+    finally:
+        for task in background:
+            task.cancel()
+        await EXTERNAL_LLM_HTTP.aclose()
+        await asyncio.to_thread(TRACE_WRITER.close)
+        DB.close_partitions()
+        close_sqlite_pools()
+
+
+app = FastAPI(title=SETTINGS.app_name, version=SETTINGS.app_version, lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -1676,9 +4534,8 @@ app.add_middleware(
 @app.get("/health")
 async def health() -> dict[str, Any]:
     try:
-        conn = sqlite3.connect(SETTINGS.db_path)
-        conn.execute("SELECT 1")
-        conn.close()
+        with DB.pool.read() as conn:
+            conn.execute("SELECT 1")
         db_status = "ok"
     except Exception:
         db_status = "error"
@@ -1702,6 +4559,7 @@ async def list_nodes() -> list[NodeStatusResponse]:
             enabled=node.enabled,
             trust_score=node.trust_score,
             reputation_score=node.reputation_score,
+            latency=NODE_REGISTRY.latency_stats(node.node_id),
         )
         for node in NODE_REGISTRY.list_enabled()
     ]
@@ -1710,49 +4568,62 @@ async def list_nodes() -> list[NodeStatusResponse]:
 @app.post("/v1/reason", response_model=ReasonResponse)
 async def reason(request: ReasonRequest) -> ReasonResponse:
     result = await ORCHESTRATOR.execute_reasoning(request)
+    return ReasonResponse(**result.model_dump())
 
-    try:
-        trace = DB.get_trace(result.trace_id)
-        if trace:
-            candidates = [CandidateAnswer(**item) for item in DB.get_candidates_by_task(trace["task_id"])]
-            verification_row = sqlite3.connect(SETTINGS.db_path)
-            verification_row.row_factory = sqlite3.Row
-            vr = verification_row.execute("SELECT * FROM verification_results WHERE task_id = ?", (trace["task_id"],)).fetchone()
-            vc = verification_row.execute("SELECT * FROM vicdan_results WHERE task_id = ?", (trace["task_id"],)).fetchone()
-            verification_row.close()
-
-            if vr and vc:
-                verification = VerificationResult(
-                    task_id=vr["task_id"],
-                    agreement_score=vr["agreement_score"],
-                    evidence_score=vr["evidence_score"],
-                    contradiction_flags=json.loads(vr["contradiction_flags_json"]),
-                    confidence_score=vr["confidence_score"],
-                    candidate_rankings=json.loads(vr["candidate_rankings_json"]),
-                    selected_candidate_id=vr["selected_candidate_id"],
-                    verification_summary=vr["verification_summary"],
-                )
-                vicdan = VicdanResult(
-                    task_id=vc["task_id"],
-                    decision=vc["decision"],
-                    risk_scores=json.loads(vc["risk_scores_json"]),
-                    rationale=vc["rationale"],
-                    required_modification=vc["required_modification"],
-                )
-                write_reason_events_to_hopechain(result.trace_id, candidates, verification, vicdan)
-    except Exception as exc:
-        logger.warning("hopechain reason write skipped: %s", exc)
 
-    return ReasonResponse(**result.model_dump())
+@app.get("/v1/metrics")
+async def metrics() -> dict[str, Any]:
+    return {
+        "http": {EXTERNAL_LLM_HTTP.name: EXTERNAL_LLM_HTTP.stats()},
+        "hedging": {"requests": HEDGE_BUDGET.requests, "hedges": HEDGE_BUDGET.hedges, "denied": HEDGE_BUDGET.denied},
+        "trace_writer": TRACE_WRITER.stats(),
+    }
+
+
+@app.get("/v1/traces")
+async def search_traces(
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    vicdan_status: Optional[str] = None,
+    node_id: Optional[str] = None,
+    task_type: Optional[str] = None,
+    policy_profile: Optional[str] = None,
+    min_confidence: Optional[float] = None,
+    max_confidence: Optional[float] = None,
+    include_candidates: bool = False,
+    include_counts: bool = True,
+) -> dict[str, Any]:
+    try:
+        return await asyncio.to_thread(
+            DB.search_traces,
+            limit=limit,
+            cursor=cursor,
+            since=since,
+            until=until,
+            vicdan_status=vicdan_status,
+            node_id=node_id,
+            task_type=task_type,
+            policy_profile=policy_profile,
+            min_confidence=min_confidence,
+            max_confidence=max_confidence,
+            include_candidates=include_candidates,
+            include_counts=include_counts,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
 
 
 @app.get("/v1/traces/{trace_id}", response_model=TraceResponse)
 async def get_trace(trace_id: str) -> TraceResponse:
-    trace = DB.get_trace(trace_id)
+    # Read-your-writes: a trace still waiting in the write-behind queue is served from memory.
+    bundle = TRACE_WRITER.pending(trace_id)
+    trace = bundle.trace_row() if bundle else DB.get_trace(trace_id)
     if not trace:
         raise HTTPException(status_code=404, detail="Trace not found")
 
-    candidates = DB.get_candidates_by_task(trace["task_id"])
+    candidates = bundle.candidate_rows() if bundle else DB.get_candidates_by_task(trace["task_id"])
 
     return TraceResponse(
         trace_id=trace["trace_id"],
@@ -1764,6 +4635,8 @@ async def get_trace(trace_id: str) -> TraceResponse:
         total_duration_ms=trace["total_duration_ms"],
         created_at=trace["created_at"],
         candidates=candidates,
+        hedges=trace.get("hedges") or 0,
+        hedge_wins=trace.get("hedge_wins") or 0,
     )
 
 
@@ -1781,14 +4654,211 @@ async def plan(request: PlanRequest) -> dict[str, Any]:
 
     return output
 
+def require_admin(request: Request) -> None:
+    """Admin routes need ``Authorization: Bearer $HOPEVERSE_ADMIN_TOKEN`` and are off when it is unset."""
+    if not SETTINGS.admin_token:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled; set HOPEVERSE_ADMIN_TOKEN")
+    supplied = request.headers.get("authorization", "").encode("utf-8")
+    if not secrets.compare_digest(supplied, f"Bearer {SETTINGS.admin_token}".encode("utf-8")):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
 @app.get("/v1/chain/events")
-async def chain_events(limit: int = 20) -> dict[str, Any]:
+async def chain_events(
+    limit: int = 20,
+    before_id: Optional[int] = None,
+    after_id: Optional[int] = None,
+    trace_id: Optional[str] = None,
+    actor_did: Optional[str] = None,
+    event_type: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+) -> dict[str, Any]:
+    events = HOPECHAIN.db.list_events(
+        limit=limit,
+        before_id=before_id,
+        after_id=after_id,
+        trace_id=trace_id,
+        actor_did=actor_did,
+        event_type=event_type,
+        since=since,
+        until=until,
+    )
     return {
-        "events": HOPECHAIN.db.list_recent_events(limit=limit),
-        "chain_verify": HOPECHAIN.db.verify_chain(),
+        "events": events,
+        "next_before_id": events[-1]["id"] if events else None,
+        "next_after_id": events[0]["id"] if events else after_id,
+        # Incremental, so this only re-hashes the tail since the last call; full passes run in
+        # chain_full_verify_loop or through the admin-only POST /v1/chain/verify.
+        "chain_verify": await asyncio.to_thread(HOPECHAIN.db.verify_chain),
     }
 
 
+@app.post("/v1/chain/verify", dependencies=[Depends(require_admin)])
+async def chain_verify(deep_archives: bool = False) -> dict[str, Any]:
+    if isinstance(HOPECHAIN.db, SimpleChainDB):
+        return await asyncio.to_thread(HOPECHAIN.db.verify_chain, full=True, deep_archives=deep_archives)
+    return await asyncio.to_thread(HOPECHAIN.db.verify_chain, full=True)
+
+
+@app.get("/v1/chain/events/{event_id}/proof")
+async def chain_event_proof(event_id: int) -> dict[str, Any]:
+    proof = HOPECHAIN.db.get_inclusion_proof(event_id)
+    if proof is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    if not proof["sealed"]:
+        raise HTTPException(status_code=409, detail="Event is not sealed into a block yet")
+    return proof
+
+
+def sse_frame(record: dict[str, Any]) -> bytes:
+    return f"id: {record['id']}\nevent: chain_event\ndata: {json.dumps(record, separators=(',', ':'))}\n\n".encode("utf-8")
+
+
+async def chain_event_stream(
+    db: SimpleChainDB | SegmentLogChainDB,
+    broadcaster: ChainEventBroadcaster,
+    *,
+    after_id: Optional[int] = None,
+    event_type: Optional[str] = None,
+    actor_did: Optional[str] = None,
+    trace_id: Optional[str] = None,
+    heartbeat_s: float = 15.0,
+) -> AsyncIterator[bytes]:
+    """SSE frames for chain events, live from the broadcaster.
+
+    With ``after_id`` the stream first replays stored events after that id.
+    Any gap in the live ids (a dropped batch, a bulk import) is filled from the
+    store the same way, so a client never misses or repeats an event.
+    """
+    filters = {"event_type": event_type, "actor_did": actor_did, "trace_id": trace_id}
+    subscription = broadcaster.subscribe()
+    seen = 0
+
+    async def catch_up() -> AsyncIterator[bytes]:
+        nonlocal seen
+        # Read the tip before paging so that an event committed meanwhile is either
+        # in a page or still ahead of ``seen`` when it arrives live.
+        newest = await asyncio.to_thread(db.list_events, limit=1)
+        tip = newest[0]["id"] if newest else 0
+        while True:
+            page = await asyncio.to_thread(db.list_events, limit=200, after_id=seen, **filters)
+            for record in reversed(page):
+                seen = record["id"]
+                yield sse_frame(record)
+            if len(page) < 200:
+                break
+        seen = max(seen, tip)
+
+    try:
+        if after_id is None:
+            newest = await asyncio.to_thread(db.list_events, limit=1)
+            seen = newest[0]["id"] if newest else 0
+        else:
+            seen = after_id
+            async for frame in catch_up():
+                yield frame
+        while True:
+            if subscription.overflowed:
+                subscription.overflowed = False
+                async for frame in catch_up():
+                    yield frame
+            try:
+                records = await asyncio.wait_for(subscription.queue.get(), timeout=heartbeat_s)
+            except asyncio.TimeoutError:
+                yield b": keepalive\n\n"
+                continue
+            if not records or records[0]["id"] > seen + 1:
+                async for frame in catch_up():
+                    yield frame
+                continue
+            for record in records:
+                if record["id"] <= seen:
+                    continue
+                seen = record["id"]
+                if all(value is None or record.get(name) == value for name, value in filters.items()):
+                    yield sse_frame(record)
+    finally:
+        broadcaster.unsubscribe(subscription)
+
+
+@app.get("/v1/chain/stream")
+async def chain_stream(
+    request: Request,
+    after_id: Optional[int] = None,
+    event_type: Optional[str] = None,
+    actor_did: Optional[str] = None,
+    trace_id: Optional[str] = None,
+) -> StreamingResponse:
+    last_event_id = request.headers.get("last-event-id", "")
+    if after_id is None and last_event_id.isdigit():
+        after_id = int(last_event_id)
+    return StreamingResponse(
+        chain_event_stream(
+            HOPECHAIN.db,
+            CHAIN_BROADCASTER,
+            after_id=after_id,
+            event_type=event_type,
+            actor_did=actor_did,
+            trace_id=trace_id,
+            heartbeat_s=SETTINGS.chain_stream_heartbeat_s,
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(wbits=31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+@app.get("/v1/chain/export")
+def chain_export(after_id: int = 0, compress: bool = False) -> StreamingResponse:
+    chunks = HOPECHAIN.db.export_ndjson(after_id=after_id)
+    if compress:
+        return StreamingResponse(
+            gzip_chunks(chunks),
+            media_type="application/gzip",
+            headers={"Content-Disposition": f'attachment; filename="hopechain-{after_id}.ndjson.gz"'},
+        )
+    return StreamingResponse(chunks, media_type="application/x-ndjson")
+
+
+@app.post("/v1/chain/import", dependencies=[Depends(require_admin)])
+async def chain_import(request: Request) -> dict[str, Any]:
+    # Imported records set reputations, so the route is admin-only and the body is capped.
+    max_bytes = SETTINGS.chain_import_max_bytes
+    too_large = HTTPException(status_code=413, detail=f"Import body exceeds {max_bytes} bytes")
+    length = request.headers.get("content-length", "")
+    if length.isdigit() and int(length) > max_bytes:
+        raise too_large
+    # Spool the body to disk so neither the upload nor the import holds the export in memory.
+    with tempfile.TemporaryFile() as spool:
+        received = 0
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > max_bytes:
+                raise too_large
+            spool.write(chunk)
+        spool.seek(0)
+        compressed = spool.read(2) == b"\x1f\x8b"
+        spool.seek(0)
+
+        def run_import() -> dict[str, Any]:
+            with (gzip.open(spool, "rb") if compressed else spool) as lines:
+                return HOPECHAIN.db.import_ndjson(lines)
+
+        result = await asyncio.to_thread(run_import)
+    if not result["ok"]:
+        raise HTTPException(status_code=409, detail=result)
+    return result
+
+
 class FoodRegion(BaseModel):
     region: str
     children_at_risk: int = Field(..., ge=0)
@@ -1862,18 +4932,17 @@ async def food_plan(request: FoodRequest) -> dict[str, Any]:
     results.sort(key=lambda x: x["priority_score"], reverse=True)
 
     try:
-        hopechain_records = []
-        for idx, item in enumerate(results, start=1):
-            hopechain_records.append(
-                HOPECHAIN.record_goal_decision(
-                    trace_id=trace_id,
-                    actor_name="hopeverse_food",
-                    goal_id=f"food_{item['region'].lower().replace(' ', '_')}",
-                    rank=idx,
-                    expected_impact=float(item["priority_score"]),
-                    vicdan_alignment="ACCEPT",
-                )
+        hopechain_records = HOPECHAIN.record_events([
+            HOPEChain.goal_decision_event(
+                trace_id=trace_id,
+                actor_name="hopeverse_food",
+                goal_id=f"food_{item['region'].lower().replace(' ', '_')}",
+                rank=idx,
+                expected_impact=float(item["priority_score"]),
+                vicdan_alignment="ACCEPT",
             )
+            for idx, item in enumerate(results, start=1)
+        ])
     except Exception as exc:
         logger.warning("hopechain food write skipped: %s", exc)
         hopechain_records = [{"error": str(exc)}]
@@ -0,0 +1,182 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+import hopechain_did
+
+
+class HOPEChainBlockTests(unittest.TestCase):
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(prefix="hopechain_test_"), "chain.db")
+        self.chain = hopechain_did.HOPEChain(self.path, block_size=4)
+        self.addCleanup(self.chain.close)
+
+    def _record(self, i):
+        return self.chain.record_node_execution(
+            trace_id=f"trace_{i}",
+            actor_name="local-1",
+            output_preview=f"output {i}",
+            confidence=0.7,
+            duration_ms=10,
+        )
+
+    def test_inclusion_proof_matches_block_root(self):
+        results = [self._record(i) for i in range(10)]
+        event_id = results[6]["event"]["event_id"]
+
+        proof = self.chain.db.get_inclusion_proof(event_id)
+        self.assertTrue(proof["sealed"])
+        self.assertEqual(proof["block"]["first_index"], 4)
+        self.assertEqual(len(proof["proof"]), 2)
+        self.assertTrue(
+            hopechain_did.verify_merkle_proof(proof["record_hash"], proof["proof"], proof["block"]["merkle_root"])
+        )
+        self.assertTrue(self.chain.db.verify_block(proof["block"]["block_id"])["ok"])
+
+        tail = self.chain.db.get_inclusion_proof(results[9]["event"]["event_id"])
+        self.assertFalse(tail["sealed"])
+
+    def test_parallel_audit_reports_first_break(self):
+        for i in range(9):
+            self._record(i)
+        report = self.chain.db.verify_chain_parallel(workers=2, segment_size=3)
+        self.assertTrue(report["ok"])
+        self.assertEqual(report["checked_records"], 9)
+        self.assertEqual(report["segments"], 3)
+
+        conn = sqlite3.connect(self.path)
+        conn.execute("UPDATE chain_records SET prev_hash = 'forged' WHERE chain_index = 6")
+        conn.execute("UPDATE contribution_events SET impact_score = 0.1 WHERE id = 8")
+        conn.commit()
+        conn.close()
+
+        report = self.chain.db.verify_chain_parallel(workers=2, segment_size=3)
+        self.assertFalse(report["ok"])
+        self.assertEqual(report["first_break"]["chain_index"], 6)
+        self.assertEqual(report["checked_records"], 6)
+
+    def test_legacy_records_verify_alongside_binary_scheme(self):
+        legacy = hopechain_did.HOPEChain(self.path, block_size=4, hash_scheme="json-sha256")
+        legacy.record_node_execution(trace_id="t", actor_name="local-1", output_preview="x", confidence=0.7, duration_ms=1)
+        for i in range(5):
+            self._record(i)
+        self.assertEqual(self.chain.db.verify_chain()["checked_records"], 6)
+        self.assertTrue(self.chain.db.verify_chain_parallel(workers=1, segment_size=2)["ok"])
+
+        conn = sqlite3.connect(self.path)
+        conn.execute("UPDATE contribution_events SET trust_delta = 0.5 WHERE id = 3")
+        conn.commit()
+        conn.close()
+        self.assertIn("chain_index 2", self.chain.db.verify_chain()["error"])
+
+    def test_compaction_preserves_verification_and_reads(self):
+        results = [self._record(i) for i in range(14)]
+        report = self.chain.db.compact(keep_recent=4)
+        self.assertTrue(report["ok"])
+        self.assertEqual(report["archived_records"], 8)
+
+        self.assertEqual(self.chain.db.verify_chain()["checked_records"], 14)
+        self.assertEqual(self.chain.db.verify_chain_parallel(workers=1, segment_size=3)["checked_records"], 14)
+        events = self.chain.db.list_events(limit=8)
+        self.assertEqual([e["id"] for e in events], list(range(14, 6, -1)))
+        self.assertEqual([e["id"] for e in self.chain.db.list_events(limit=2, after_id=0)], [2, 1])
+        proof = self.chain.db.get_inclusion_proof(results[1]["event"]["event_id"])
+        self.assertTrue(self.chain.db.verify_block(proof["block"]["block_id"])["ok"])
+        self.assertEqual(self._record(14)["record"]["chain_index"], 14)
+        self.assertTrue(self.chain.db.verify_chain()["ok"])
+
+    def test_archived_pages_only_read_segments_past_the_cursor(self):
+        self.chain.db.archive_segment_records = 4
+        for i in range(20):
+            self._record(i)
+        self.assertEqual(self.chain.db.compact(keep_recent=4)["archived_segments"], 4)
+        self.chain.db._archive_cache.clear()
+
+        read = []
+        original = self.chain.db._read_archive
+        self.chain.db._read_archive = lambda name: read.append(name) or original(name)
+        self.assertEqual([e["id"] for e in self.chain.db.list_events(limit=2, after_id=12)], [14, 13])
+        self.assertEqual(read, ["contrib-000000000012-000000000015.ndjson.gz"])
+        self.assertEqual([e["id"] for e in self.chain.db.list_events(limit=2, before_id=6)], [5, 4])
+        self.assertEqual(read[1:], ["contrib-000000000004-000000000007.ndjson.gz", "contrib-000000000000-000000000003.ndjson.gz"])
+
+    def test_legacy_archive_table_is_renamed(self):
+        conn = sqlite3.connect(self.path)
+        conn.execute("ALTER TABLE did_chain_archives RENAME TO chain_archives")
+        conn.execute("ALTER TABLE chain_archives DROP COLUMN first_id")
+        conn.execute("ALTER TABLE chain_archives DROP COLUMN last_id")
+        conn.close()
+
+        db = hopechain_did.HOPEChainDB(self.path)
+        conn = sqlite3.connect(self.path)
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(did_chain_archives)")}
+        conn.close()
+        self.assertNotIn("chain_archives", tables)
+        self.assertTrue({"first_index", "first_id", "last_id"} <= columns)
+        self.assertTrue(db.verify_chain()["ok"])
+
+
+
+class IdentityCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(prefix="hopechain_test_"), "chain.db")
+
+    def test_identity_lookups_hit_the_lru_after_first_use(self):
+        db = hopechain_did.HOPEChainDB(self.path, identity_cache_size=2)
+        first = db.ensure_identity("local-1", "node")
+        db.ensure_identity("local-2", "node")
+
+        connects = []
+        original = db._connect
+        db._connect = lambda: connects.append(1) or original()
+        self.assertEqual(db.ensure_identity("local-1", "node").did, first.did)
+        self.assertEqual(db.get_identity(first.did).name, "local-1")
+        self.assertEqual(connects, [])
+
+        db.ensure_identity("local-3", "node")  # evicts local-2, the least recently used
+        self.assertNotIn("local-2", db._identity_names)
+        db.get_identity_by_name("local-2")
+        self.assertEqual(len(connects), 3)  # local-3 lookup + insert, then the local-2 miss
+
+        conn = sqlite3.connect(self.path)
+        plan = " ".join(r[3] for r in conn.execute("EXPLAIN QUERY PLAN SELECT * FROM did_identities WHERE name = ? ORDER BY id LIMIT 1", ("x",)))
+        conn.close()
+        self.assertIn("idx_did_identities_name", plan)
+
+    def test_oldest_identity_stays_canonical_for_a_shared_name(self):
+        db = hopechain_did.HOPEChainDB(self.path)
+        first = db.create_identity("shared", "node")
+        second = db.create_identity("shared", "node")
+        self.assertEqual(db.get_identity_by_name("shared").did, first.did)
+
+        fresh = hopechain_did.HOPEChainDB(self.path)
+        self.assertEqual(fresh.get_identity(second.did).did, second.did)
+        self.assertEqual(fresh.get_identity_by_name("shared").did, first.did)
+
+        # Creating a duplicate on a store that has not cached the original must not claim the name.
+        other = hopechain_did.HOPEChainDB(self.path)
+        other.create_identity("shared", "node")
+        self.assertEqual(other.get_identity_by_name("shared").did, first.did)
+
+    def test_deferred_signature_check_batches_and_reports_forgeries(self):
+        chain = hopechain_did.HOPEChain(self.path, verify_interval_s=60)
+        results = [
+            chain.record_goal_decision(trace_id="t", actor_name="hopecore", goal_id=f"g{i}", rank=i, expected_impact=0.5, vicdan_alignment="ACCEPT")
+            for i in range(3)
+        ]
+        self.assertEqual(results[0]["signature_verify"]["status"], "deferred")
+        self.assertEqual(results[2]["reputation"]["contribution_count"], 3)
+
+        conn = sqlite3.connect(self.path)
+        conn.execute("UPDATE contribution_events SET signature = 'forged' WHERE event_id = ?", (results[1]["event"]["event_id"],))
+        conn.commit()
+        conn.close()
+        report = chain.close()
+        self.assertEqual((report["checked"], report["failed"]), (3, 1))
+        self.assertEqual(chain.signature_failures[0]["event_id"], results[1]["event"]["event_id"])
+
+
+if __name__ == "__main__":
+    unittest.main()
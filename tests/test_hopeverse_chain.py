@@ -0,0 +1,469 @@
+import asyncio
+import importlib.util
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import hopechain_did
+
+_TMP = tempfile.mkdtemp(prefix="hopeverse_test_")
+os.environ.setdefault("HOPETENSOR_DB_PATH", os.path.join(_TMP, "hopetensor_v1.db"))
+_cwd = os.getcwd()
+os.chdir(_TMP)
+try:
+    import hopeverse_onefile_ultra as hv
+finally:
+    os.chdir(_cwd)
+
+
+def _add(db, i):
+    return db.add_event(
+        trace_id=f"trace_{i}",
+        event_type="node_execution",
+        actor_name="local-1",
+        actor_type="ai_node",
+        impact_score=0.5,
+        trust_delta=0.03,
+        payload={"i": i},
+    )
+
+
+class SimpleChainDBVerifyTests(unittest.TestCase):
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(dir=_TMP), "chain.db")
+        self.db = hv.SimpleChainDB(self.path)
+
+    def _tamper(self, event_id):
+        conn = sqlite3.connect(self.path)
+        conn.execute("UPDATE chain_events SET payload_json = ? WHERE id = ?", ('{"i": -1}', event_id))
+        conn.commit()
+        conn.close()
+
+    def test_incremental_verify_only_hashes_new_tail(self):
+        for i in range(5):
+            _add(self.db, i)
+        first = self.db.verify_chain()
+        self.assertTrue(first["ok"])
+        self.assertEqual(first["mode"], "full")
+        self.assertEqual(first["checked_records"], 5)
+
+        for i in range(5, 7):
+            _add(self.db, i)
+        second = self.db.verify_chain()
+        self.assertTrue(second["ok"])
+        self.assertEqual(second["mode"], "incremental")
+        self.assertEqual(second["verified_tail"], 2)
+        self.assertEqual(second["checked_records"], 7)
+        self.assertGreaterEqual(second["checkpoint_age_s"], 0)
+
+    def test_tampered_tail_is_detected(self):
+        for i in range(3):
+            _add(self.db, i)
+        self.db.verify_chain()
+        _add(self.db, 3)
+        self._tamper(4)
+        result = self.db.verify_chain()
+        self.assertFalse(result["ok"])
+        self.assertIn("id 4", result["error"])
+
+    def test_full_verify_catches_tampering_behind_checkpoint(self):
+        for i in range(4):
+            _add(self.db, i)
+        self.assertTrue(self.db.verify_chain()["ok"])
+        self._tamper(2)
+        self.assertTrue(self.db.verify_chain()["ok"])
+        self.assertFalse(self.db.verify_chain(full=True)["ok"])
+        # The checkpoint is pulled back, so the next cheap call keeps failing.
+        self.assertFalse(self.db.verify_chain()["ok"])
+
+    def _checkpoint(self):
+        conn = sqlite3.connect(self.path)
+        row = conn.execute("SELECT last_id, verified_at, full_verified_at FROM chain_checkpoints").fetchone()
+        conn.close()
+        return row
+
+    def test_checkpoint_is_written_only_when_it_moves(self):
+        for i in range(3):
+            _add(self.db, i)
+        stamped = self.db.verify_chain()["last_full_verify_at"]
+        before = self._checkpoint()
+        self.assertEqual(self.db.verify_chain()["verified_tail"], 0)
+        self.assertEqual(self._checkpoint(), before)
+
+        self._tamper(2)
+        failed = self.db.verify_chain(full=True)
+        self.assertFalse(failed["ok"])
+        self.assertEqual(failed["last_full_verify_at"], stamped)
+        self.assertEqual(self._checkpoint()[::2], (1, stamped))
+
+    def test_failed_first_pass_leaves_no_checkpoint(self):
+        for i in range(3):
+            _add(self.db, i)
+        self._tamper(2)
+        result = self.db.verify_chain()
+        self.assertFalse(result["ok"])
+        self.assertIsNone(result["last_full_verify_at"])
+        self.assertIsNone(self._checkpoint())
+
+    def test_inclusion_proof_for_sealed_event(self):
+        db = hv.SimpleChainDB(self.path, block_size=8)
+        for i in range(13):
+            _add(db, i)
+        proof = db.get_inclusion_proof(5)
+        self.assertTrue(proof["sealed"])
+        self.assertEqual(proof["leaf_index"], 4)
+        self.assertTrue(hv.verify_merkle_proof(proof["record_hash"], proof["proof"], proof["merkle_root"]))
+        self.assertFalse(hv.verify_merkle_proof(proof["record_hash"], proof["proof"][::-1], proof["merkle_root"]))
+        self.assertTrue(db.verify_block(proof["block_id"])["ok"])
+        self.assertFalse(db.get_inclusion_proof(12)["sealed"])
+        self.assertIsNone(db.get_inclusion_proof(999))
+
+    def test_keyset_pagination_with_filters(self):
+        for i in range(30):
+            self.db.add_event(
+                trace_id=f"trace_{i % 3}", event_type="node_execution", actor_name="local-1",
+                actor_type="ai_node", impact_score=0.5, trust_delta=0.03, payload={"i": i},
+            )
+        first = self.db.list_events(limit=4, trace_id="trace_1")
+        self.assertEqual([e["id"] for e in first], [29, 26, 23, 20])
+        older = self.db.list_events(limit=4, trace_id="trace_1", before_id=first[-1]["id"])
+        self.assertEqual([e["id"] for e in older], [17, 14, 11, 8])
+        newer = self.db.list_events(limit=2, trace_id="trace_1", after_id=8)
+        self.assertEqual([e["id"] for e in newer], [14, 11])
+
+        conn = sqlite3.connect(self.path)
+        plan = " ".join(r[3] for r in conn.execute("EXPLAIN QUERY PLAN SELECT * FROM chain_events WHERE trace_id = ? AND id < ? ORDER BY id DESC LIMIT 20", ("trace_1", 10)))
+        conn.close()
+        self.assertIn("idx_chain_events_trace_id", plan)
+
+    def test_reputation_is_materialized_and_backfilled(self):
+        for i in range(3):
+            _add(self.db, i)
+        self.db.add_events([
+            hv.HOPEChain.node_execution_event(trace_id="t", actor_name="local-1", output_preview="x", confidence=0.9, duration_ms=1, success=False)
+        ])
+        rep = self.db.get_reputation("did:hope:local-1")
+        self.assertEqual(rep["contribution_count"], 4)
+        self.assertAlmostEqual(rep["impact_sum"], 2.4)
+        self.assertAlmostEqual(rep["trust_delta_sum"], 0.04)
+
+        conn = sqlite3.connect(self.path)
+        conn.execute("DROP TABLE actor_reputation")
+        conn.commit()
+        conn.close()
+        self.assertEqual(hv.SimpleChainDB(self.path).get_reputation("did:hope:local-1")["contribution_count"], 4)
+
+    def test_legacy_and_binary_hash_schemes_share_one_chain(self):
+        legacy = hv.SimpleChainDB(self.path, hash_scheme="json-sha256")
+        for i in range(3):
+            _add(legacy, i)
+        conn = sqlite3.connect(self.path)
+        conn.execute("ALTER TABLE chain_events DROP COLUMN hash_scheme")
+        conn.commit()
+        conn.close()
+
+        db = hv.SimpleChainDB(self.path, hash_scheme="bin1-blake2b")
+        self.assertEqual(_add(db, 3)["hash_scheme"], "bin1-blake2b")
+        _add(hv.SimpleChainDB(self.path), 4)
+        conn = sqlite3.connect(self.path)
+        schemes = [r[0] for r in conn.execute("SELECT hash_scheme FROM chain_events ORDER BY id")]
+        conn.close()
+        self.assertEqual(schemes, ["json-sha256"] * 3 + ["bin1-blake2b", "bin1-sha256"])
+        self.assertTrue(db.verify_chain(full=True)["ok"])
+        self._tamper(5)
+        self.assertIn("id 5", db.verify_chain(full=True)["error"])
+
+    def test_compaction_keeps_chain_verifiable_and_readable(self):
+        db = hv.SimpleChainDB(self.path, block_size=4, archive_segment_events=8)
+        for i in range(30):
+            _add(db, i)
+        result = db.compact(keep_recent=10)
+        self.assertTrue(result["ok"])
+        self.assertEqual(result["archived_through"], 20)
+        self.assertEqual(result["archived_segments"], 3)
+
+        conn = sqlite3.connect(self.path)
+        self.assertEqual(conn.execute("SELECT MIN(id) FROM chain_events").fetchone()[0], 21)
+        conn.close()
+        self.assertEqual(db.verify_chain(full=True, deep_archives=True)["checked_records"], 30)
+        self.assertEqual([e["id"] for e in db.list_events(limit=4, before_id=23)], [22, 21, 20, 19])
+        self.assertEqual([e["id"] for e in db.list_events(limit=3, after_id=1)], [4, 3, 2])
+        self.assertEqual(db.list_events(limit=1, trace_id="trace_3")[0]["payload"], {"i": 3})
+        proof = db.get_inclusion_proof(6)
+        self.assertTrue(hv.verify_merkle_proof(proof["record_hash"], proof["proof"], proof["merkle_root"]))
+        self.assertTrue(db.verify_block(proof["block_id"])["ok"])
+        self.assertEqual(_add(hv.SimpleChainDB(self.path), 30)["id"], 31)
+
+        archive = sorted(db.archive_dir.iterdir())[0]
+        archive.write_bytes(archive.read_bytes()[:-4])
+        self.assertIn("checksum", db.verify_chain(full=True)["error"])
+
+    def test_export_import_round_trip(self):
+        source = hv.SimpleChainDB(self.path, block_size=4)
+        for i in range(12):
+            _add(source, i)
+        source.compact(keep_recent=4)
+        lines = b"".join(source.export_ndjson(batch_size=5)).splitlines()
+        self.assertEqual(len(lines), 12)
+
+        replica = hv.SimpleChainDB(os.path.join(tempfile.mkdtemp(dir=_TMP), "replica.db"), block_size=4)
+        result = replica.import_ndjson(lines[:7])
+        self.assertEqual((result["imported"], result["last_id"]), (7, 7))
+        self.assertEqual(replica.import_ndjson(lines[7:])["tip_hash"], source.list_events(limit=1)[0]["record_hash"])
+        self.assertTrue(replica.verify_chain(full=True)["ok"])
+        self.assertEqual(replica.get_inclusion_proof(6)["merkle_root"], source.get_inclusion_proof(6)["merkle_root"])
+
+        log = hv.SegmentLogChainDB(tempfile.mkdtemp(dir=_TMP), block_size=4)
+        self.assertTrue(log.import_ndjson(lines)["ok"])
+        self.assertEqual(b"".join(log.export_ndjson()).splitlines(), lines)
+
+        forged = hv.SimpleChainDB(os.path.join(tempfile.mkdtemp(dir=_TMP), "forged.db"))
+        bad = lines[:3] + [lines[3].replace(b'"i":3', b'"i":4')] + lines[4:]
+        result = forged.import_ndjson(bad)
+        self.assertFalse(result["ok"])
+        self.assertIn("line 4", result["error"])
+        self.assertEqual(forged.list_events(), [])
+
+    def test_import_endpoint_requires_admin_token_and_caps_the_body(self):
+        from fastapi.testclient import TestClient
+
+        source = hv.SimpleChainDB(self.path)
+        for i in range(3):
+            _add(source, i)
+        body = b"".join(source.export_ndjson())
+        replica = hv.SimpleChainDB(os.path.join(tempfile.mkdtemp(dir=_TMP), "replica.db"))
+        client = TestClient(hv.app)
+        auth = {"Authorization": "Bearer secret"}
+
+        with mock.patch.object(hv.HOPECHAIN, "db", replica):
+            with mock.patch.object(hv.SETTINGS, "admin_token", None):
+                self.assertEqual(client.post("/v1/chain/import", content=body, headers=auth).status_code, 403)
+            with mock.patch.object(hv.SETTINGS, "admin_token", "secret"):
+                self.assertEqual(client.post("/v1/chain/import", content=body).status_code, 401)
+                with mock.patch.object(hv.SETTINGS, "chain_import_max_bytes", len(body) - 1):
+                    self.assertEqual(client.post("/v1/chain/import", content=body, headers=auth).status_code, 413)
+                self.assertEqual(replica.list_events(), [])
+                result = client.post("/v1/chain/import", content=body, headers=auth).json()
+        self.assertEqual((result["ok"], result["imported"]), (True, 3))
+
+    def test_hoped_record_hash_matches_every_scheme(self):
+        spec = importlib.util.spec_from_file_location(
+            "hoped", Path(__file__).resolve().parents[1] / "docs/techspec/hopechain-techspec-v0.1.0/hoped/hoped.py"
+        )
+        hoped = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(hoped)
+        for scheme in hv.CHAIN_HASH_SCHEMES:
+            db = hv.SimpleChainDB(os.path.join(tempfile.mkdtemp(dir=_TMP), f"{scheme}.db"), hash_scheme=scheme)
+            _add(db, 0)
+            db.add_event(
+                trace_id="trace_ü", event_type="reputation", actor_name="Düğüm 2", actor_type="human",
+                impact_score=-1.25, trust_delta=0.0, payload={"note": "çalışma", "nested": [1, 2.5, None]},
+            )
+            for line in b"".join(db.export_ndjson()).splitlines():
+                record = json.loads(line)
+                self.assertEqual(hoped.record_hash(record), record["record_hash"], scheme)
+
+
+class SimpleChainDBAppendTests(unittest.TestCase):
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(dir=_TMP), "chain.db")
+
+    def test_concurrent_writers_never_fork_the_chain(self):
+        # Two instances with their own pools stand in for two worker processes sharing the file.
+        writers = [hv.SimpleChainDB(self.path), hv.SimpleChainDB(self.path, pool=hv.SQLitePool(self.path))]
+
+        def run(db, offset):
+            for i in range(25):
+                _add(db, offset + i)
+
+        threads = [threading.Thread(target=run, args=(db, n * 100)) for n in range(2) for db in writers]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        conn = sqlite3.connect(self.path)
+        total, distinct_prev = conn.execute("SELECT COUNT(*), COUNT(DISTINCT COALESCE(prev_hash, '')) FROM chain_events").fetchone()
+        conn.close()
+        self.assertEqual(total, 100)
+        self.assertEqual(distinct_prev, 100)
+        self.assertTrue(writers[0].verify_chain(full=True)["ok"])
+
+    def test_did_chain_and_simple_chain_share_one_file(self):
+        did_chain = hopechain_did.HOPEChain(self.path, block_size=4)
+        self.addCleanup(did_chain.close)
+        for i in range(5):
+            did_chain.record_node_execution(trace_id=f"trace_{i}", actor_name="local-1", output_preview="out", confidence=0.7, duration_ms=1)
+
+        db = hv.SimpleChainDB(self.path, block_size=4)
+        for i in range(9):
+            _add(db, i)
+        self.assertTrue(db.verify_chain(full=True)["ok"])
+        self.assertTrue(db.get_inclusion_proof(1)["sealed"])
+        self.assertTrue(did_chain.db.verify_chain()["ok"])
+        self.assertEqual(db.compact(keep_recent=4)["archived_through"], 4)
+        self.assertEqual(did_chain.db.compact(keep_recent=1)["archived_records"], 4)
+        self.assertTrue(db.verify_chain(full=True, deep_archives=True)["ok"])
+        self.assertTrue(did_chain.db.verify_chain()["ok"])
+        conn = sqlite3.connect(self.path)
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM chain_blocks").fetchone()[0], 2)
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM did_chain_blocks").fetchone()[0], 1)
+        conn.close()
+
+    def test_legacy_did_block_table_is_moved_aside(self):
+        conn = sqlite3.connect(self.path)
+        conn.execute("CREATE TABLE chain_blocks (block_id INTEGER PRIMARY KEY, first_index INTEGER, last_index INTEGER UNIQUE)")
+        conn.close()
+        db = hv.SimpleChainDB(self.path, block_size=2)
+        for i in range(2):
+            _add(db, i)
+        conn = sqlite3.connect(self.path)
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM chain_blocks").fetchone()[0], 1)
+        self.assertIn("first_index", [row[1] for row in conn.execute("PRAGMA table_info(did_chain_blocks)")])
+        conn.close()
+
+    def test_stores_on_one_file_share_the_pooled_writer(self):
+        first, second = hv.SimpleChainDB(self.path), hv.SimpleChainDB(self.path)
+        self.assertIs(first.pool, second.pool)
+        self.assertEqual(first.pool.writer.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        for i in range(6):
+            _add(first if i % 2 else second, i)
+        self.assertTrue(first.verify_chain(full=True)["ok"])
+
+        with first.pool.read() as conn:
+            with self.assertRaises(sqlite3.OperationalError):
+                conn.execute("DELETE FROM chain_events")
+        with self.assertRaises(RuntimeError):
+            with first.pool.write() as conn:
+                conn.execute("DELETE FROM chain_events")
+                raise RuntimeError("abort")
+        self.assertEqual(len(second.list_events(limit=10)), 6)
+
+    def test_failed_commit_rolls_back_the_shared_writer(self):
+        pool = hv.SQLitePool(self.path)
+        self.addCleanup(pool.close)
+        with pool.write() as conn:
+            conn.execute("CREATE TABLE parent (id INTEGER PRIMARY KEY)")
+            conn.execute("CREATE TABLE child (parent_id INTEGER REFERENCES parent(id) DEFERRABLE INITIALLY DEFERRED)")
+        pool.writer.execute("PRAGMA foreign_keys = ON")
+        # The deferred foreign key is only checked, and fails, at COMMIT.
+        with self.assertRaises(sqlite3.IntegrityError):
+            with pool.write() as conn:
+                conn.execute("INSERT INTO child VALUES (1)")
+        self.assertFalse(pool.writer.in_transaction)
+        with pool.write() as conn:
+            conn.execute("INSERT INTO parent VALUES (1)")
+        with pool.read() as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM child").fetchone()[0], 0)
+
+    def test_batch_append_is_linked_and_atomic(self):
+        db = hv.SimpleChainDB(self.path)
+        _add(db, 0)
+        events = [
+            hv.HOPEChain.goal_decision_event(trace_id="t", actor_name="hopeverse_food", goal_id=f"g{i}", rank=i, expected_impact=0.5, vicdan_alignment="ACCEPT")
+            for i in range(50)
+        ]
+        records = db.add_events(events)
+        self.assertEqual([r["id"] for r in records], list(range(2, 52)))
+        self.assertEqual(records[1]["prev_hash"], records[0]["record_hash"])
+        self.assertTrue(db.verify_chain()["ok"])
+
+        bad = events[:2] + [dict(events[2], payload={"unserializable": object()})]
+        with self.assertRaises(TypeError):
+            db.add_events(bad)
+        self.assertEqual(db.verify_chain()["checked_records"], 51)
+        self.assertEqual(_add(db, 99)["prev_hash"], records[-1]["record_hash"])
+
+
+class SegmentLogChainDBTests(unittest.TestCase):
+    def setUp(self):
+        self.log_dir = tempfile.mkdtemp(dir=_TMP)
+
+    def test_segment_log_matches_sqlite_contract(self):
+        db = hv.SegmentLogChainDB(self.log_dir, block_size=4, segment_bytes=4096)
+        for i in range(20):
+            _add(db, i)
+        self.assertGreater(len(db._segments), 1)
+        self.assertEqual(db.verify_chain()["checked_records"], 20)
+        self.assertEqual([e["id"] for e in db.list_events(limit=3, before_id=10)], [9, 8, 7])
+        proof = db.get_inclusion_proof(6)
+        self.assertTrue(hv.verify_merkle_proof(proof["record_hash"], proof["proof"], proof["merkle_root"]))
+
+        # A torn write (data without an index entry) is discarded on reopen.
+        last = db._segments[-1]
+        with open(db._segment_path(last["seq"], "log"), "ab") as handle:
+            handle.write(b'{"partial"')
+        reopened = hv.SegmentLogChainDB(self.log_dir, block_size=4, segment_bytes=4096)
+        self.assertEqual(reopened._tip, db._tip)
+        self.assertEqual(_add(reopened, 20)["id"], 21)
+        self.assertTrue(reopened.verify_chain(full=True)["ok"])
+        self.assertEqual(reopened.get_reputation("did:hope:local-1")["contribution_count"], 21)
+
+    def test_export_views_survive_remaps_while_writers_append(self):
+        db = hv.SegmentLogChainDB(self.log_dir, block_size=4)
+        for i in range(5):
+            _add(db, i)
+        view = next(db.read_raw(1, 5))
+        _add(db, 5)
+        # Reading the grown segment remaps it while the export still holds a view of the old map.
+        self.assertEqual(db.get_event(6)["id"], 6)
+        self.assertEqual(len(bytes(view).splitlines()), 5)
+
+        errors = []
+
+        def read():
+            try:
+                for _ in range(50):
+                    self.assertTrue(db.list_events(limit=5, trace_id="trace_1"))
+                    b"".join(db.export_ndjson())
+            except Exception as exc:
+                errors.append(exc)
+
+        readers = [threading.Thread(target=read) for _ in range(3)]
+        for t in readers:
+            t.start()
+        for i in range(6, 106):
+            _add(db, i)
+        for t in readers:
+            t.join()
+        self.assertEqual(errors, [])
+        self.assertTrue(db.verify_chain(full=True)["ok"])
+        view.release()
+        db.close()
+
+
+
+class ChainEventStreamTests(unittest.IsolatedAsyncioTestCase):
+    async def test_stream_replays_then_follows_live_appends(self):
+        db = hv.SimpleChainDB(os.path.join(tempfile.mkdtemp(dir=_TMP), "chain.db"))
+        broadcaster = hv.ChainEventBroadcaster(max_pending=1)
+        db.add_listener(broadcaster.publish)
+        for i in range(4):
+            _add(db, i)
+
+        stream = hv.chain_event_stream(db, broadcaster, after_id=1, trace_id="trace_3", heartbeat_s=5)
+        frames = []
+
+        async def collect(count):
+            while len(frames) < count:
+                frames.append(await stream.__anext__())
+
+        await collect(1)
+        # Three batches from another thread overflow the one-slot queue; the gap is filled from the store.
+        await asyncio.to_thread(lambda: [_add(db, i) for i in (3, 9, 3)])
+        await asyncio.wait_for(collect(3), timeout=5)
+        await stream.aclose()
+
+        ids = [int(frame.split(b"\n")[0][4:]) for frame in frames]
+        self.assertEqual(ids, [4, 5, 7])
+        self.assertEqual(json.loads(frames[1].split(b"data: ")[1])["payload"], {"i": 3})
+        self.assertEqual(broadcaster._subscribers, set())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,388 @@
+import asyncio
+import os
+import queue
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+_TMP = tempfile.mkdtemp(prefix="hopeverse_db_test_")
+os.environ.setdefault("HOPETENSOR_DB_PATH", os.path.join(_TMP, "hopetensor_v1.db"))
+_cwd = os.getcwd()
+os.chdir(_TMP)
+try:
+    import hopeverse_onefile_ultra as hv
+finally:
+    os.chdir(_cwd)
+
+
+def _bundle(n_candidates=3):
+    task = hv.TaskContext(
+        task_id=hv.generate_id("task"), trace_id=hv.generate_id("trace"), task_type="general",
+        policy_profile="default", prompt="What is HOPEverse?", created_at=hv.utc_now(),
+    )
+    candidates = [
+        hv.CandidateAnswer(candidate_id=hv.generate_id("cand"), task_id=task.task_id, node_id=f"node-{i}", output=f"answer {i}", confidence_self_reported=0.7)
+        for i in range(n_candidates)
+    ]
+    verification = hv.VerificationResult(
+        task_id=task.task_id, agreement_score=0.8, evidence_score=0.4, contradiction_flags=[], confidence_score=0.7,
+        candidate_rankings=[c.candidate_id for c in candidates], selected_candidate_id=candidates[0].candidate_id,
+        verification_summary="ok",
+    )
+    vicdan = hv.VicdanResult(task_id=task.task_id, decision="ACCEPT", risk_scores={}, rationale="ok")
+    return task, candidates, verification, vicdan
+
+
+class DatabaseTraceBundleTests(unittest.TestCase):
+    def setUp(self):
+        self.db = hv.Database(os.path.join(tempfile.mkdtemp(dir=_TMP), "hopetensor.db"))
+
+    def _save(self, task, candidates, verification, vicdan):
+        self.db.save_trace_bundle(
+            task, candidates, verification, vicdan,
+            request_summary=task.prompt, selected_nodes=[c.node_id for c in candidates],
+            final_output="answer 0", total_duration_ms=12,
+        )
+
+    def test_bundle_is_written_in_one_transaction(self):
+        task, candidates, verification, vicdan = _bundle()
+        self._save(task, candidates, verification, vicdan)
+
+        trace = self.db.get_trace(task.trace_id)
+        self.assertEqual(trace["task_id"], task.task_id)
+        self.assertEqual([c["candidate_id"] for c in self.db.get_candidates_by_task(task.task_id)], [c.candidate_id for c in candidates])
+
+    def test_failed_bundle_leaves_nothing_behind(self):
+        task, candidates, verification, vicdan = _bundle()
+        vicdan.risk_scores = {"harm": object()}
+        with self.assertRaises(TypeError):
+            self._save(task, candidates, verification, vicdan)
+
+        self.assertIsNone(self.db.get_trace(task.trace_id))
+        self.assertEqual(self.db.get_candidates_by_task(task.task_id), [])
+        with self.db.pool.read() as conn:
+            self.assertIsNone(conn.execute("SELECT 1 FROM tasks WHERE task_id = ?", (task.task_id,)).fetchone())
+
+
+class TraceSearchTests(unittest.TestCase):
+    def setUp(self):
+        self.db = hv.Database(os.path.join(tempfile.mkdtemp(dir=_TMP), "hopetensor.db"))
+        bundles = []
+        for i in range(7):
+            task, candidates, verification, vicdan = _bundle(n_candidates=1 + i % 2)
+            task.task_type = "technical" if i % 3 == 0 else "general"
+            verification.confidence_score = i / 10
+            vicdan.decision = "REJECT" if i % 2 else "ACCEPT"
+            bundles.append(hv.TraceBundle(
+                task=task, candidates=candidates, verification=verification, vicdan=vicdan, request_summary=task.prompt,
+                selected_nodes=[c.node_id for c in candidates], final_output="answer", total_duration_ms=i,
+                created_at=f"2026-03-0{i + 1}T00:00:00+00:00",
+            ))
+        self.db.save_trace_bundles(bundles)
+        self.bundles = bundles
+
+    def test_filters_and_counts(self):
+        result = self.db.search_traces(vicdan_status="REJECT", node_id="node-1", min_confidence=0.2)
+        self.assertEqual([t["total_duration_ms"] for t in result["traces"]], [5, 3])
+        self.assertNotIn("candidates", result["traces"][0])
+        self.assertEqual(result["counts"], {"total": 2, "by_vicdan_status": {"REJECT": 2}})
+
+        result = self.db.search_traces(task_type="technical", since="2026-03-02", until="2026-03-07", include_candidates=True)
+        self.assertEqual([t["total_duration_ms"] for t in result["traces"]], [3])
+        self.assertEqual([c["candidate_id"] for c in result["traces"][0]["candidates"]], [c.candidate_id for c in self.bundles[3].candidates])
+
+    def test_keyset_pages_cover_every_trace_once(self):
+        seen, cursor = [], None
+        while True:
+            page = self.db.search_traces(limit=3, cursor=cursor, include_counts=False)
+            seen.extend(t["trace_id"] for t in page["traces"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        self.assertEqual(seen, [b.task.trace_id for b in reversed(self.bundles)])
+        with self.assertRaises(ValueError):
+            self.db.search_traces(cursor="not-a-cursor")
+
+
+class TraceBlobTests(unittest.TestCase):
+    def test_long_text_is_stored_once_compressed_and_read_back(self):
+        db = hv.Database(os.path.join(tempfile.mkdtemp(dir=_TMP), "hopetensor.db"))
+        template = "Local node analysis: the governed answer repeats this template. " * 20
+        bundles = []
+        for _ in range(3):
+            task, candidates, verification, vicdan = _bundle()
+            task.prompt = template
+            for candidate in candidates:
+                candidate.output = template
+            candidates[-1].output = "short"
+            bundles.append(hv.TraceBundle(
+                task=task, candidates=candidates, verification=verification, vicdan=vicdan, request_summary="s",
+                selected_nodes=[], final_output=template, total_duration_ms=1,
+            ))
+        db.save_trace_bundles(bundles)
+
+        with db.pool.read() as conn:
+            blobs = conn.execute("SELECT codec, size, length(data) FROM blobs").fetchall()
+            self.assertEqual(conn.execute("SELECT prompt FROM tasks LIMIT 1").fetchone()[0], "")
+        self.assertEqual(len(blobs), 1)
+        self.assertEqual(blobs[0]["codec"], "zlib")
+        self.assertLess(blobs[0][2], blobs[0]["size"] / 4)
+
+        trace = db.get_trace(bundles[0].task.trace_id)
+        self.assertEqual(trace["final_output"], template)
+        self.assertNotIn("final_output_blob", trace)
+        outputs = [c["output"] for c in db.get_candidates_by_task(bundles[0].task.task_id)]
+        self.assertEqual(outputs, [template, template, "short"])
+        page = db.search_traces(include_candidates=True)
+        self.assertEqual(page["traces"][0]["candidates"][0]["output"], template)
+
+
+class TraceStoreMigrationTests(unittest.TestCase):
+    def test_existing_database_is_migrated_and_hot_queries_use_indexes(self):
+        path = os.path.join(tempfile.mkdtemp(dir=_TMP), "hopetensor.db")
+        conn = sqlite3.connect(path)
+        # The pre-migration schema: tables only, no indexes, no schema_migrations.
+        for statement in hv.Database.MIGRATIONS[0].apply:
+            conn.execute(statement)
+        conn.execute("INSERT INTO traces (trace_id, task_id, request_summary, selected_nodes_json, candidate_ids_json, verification_summary, vicdan_status, final_output, total_duration_ms, created_at) VALUES ('t1', 'k1', 's', '[]', '[]', 'v', 'ACCEPT', 'o', 1, '2026-01-01')")
+        conn.commit()
+        conn.close()
+
+        db = hv.Database(path)
+        self.assertEqual(db.get_trace("t1")["vicdan_status"], "ACCEPT")
+        plans = db.check_query_plans()
+        self.assertTrue(all(result["uses_index"] for result in plans.values()), plans)
+        self.assertEqual(hv.run_migrations(db.pool, "trace_store", db.MIGRATIONS), [])
+
+        step = hv.Migration(5, "add reviewer", hv.add_column("traces", "reviewer", "TEXT"))
+        self.assertEqual(hv.run_migrations(db.pool, "trace_store", [*db.MIGRATIONS, step]), [5])
+        with db.pool.read() as conn:
+            self.assertIsNone(conn.execute("SELECT reviewer FROM traces WHERE trace_id = 't1'").fetchone()[0])
+            versions = [row[0] for row in conn.execute("SELECT version FROM schema_migrations WHERE component = 'trace_store' ORDER BY version")]
+        self.assertEqual(versions, [1, 2, 3, 4, 5])
+        self.assertFalse(hv.plan_uses_index(["SCAN traces"]))
+
+
+class TracePartitionTests(unittest.TestCase):
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(dir=_TMP)
+        self.db = hv.Database(
+            os.path.join(self.workdir, "hopetensor.db"), partition="day",
+            retention_days=hv.parse_trace_retention(30, "candidate_answers=7"),
+        )
+        self.addCleanup(self.db.close_partitions)
+        self.bundles = []
+        for day in (1, 2, 3, 20):
+            task, candidates, verification, vicdan = _bundle()
+            self.bundles.append(hv.TraceBundle(
+                task=task, candidates=candidates, verification=verification, vicdan=vicdan, request_summary=task.prompt,
+                selected_nodes=[c.node_id for c in candidates], final_output="answer", total_duration_ms=day,
+                created_at=f"2026-03-{day:02d}T12:00:00+00:00",
+            ))
+        self.db.save_trace_bundles(self.bundles)
+
+    def test_traces_are_routed_to_daily_files_and_read_back_merged(self):
+        files = sorted(name for name in os.listdir(self.db.partition_dir) if name.endswith(".db"))
+        self.assertEqual(files, [f"traces-2026-03-{day}.db" for day in ("01", "02", "03", "20")])
+        with self.db.pool.read() as conn:
+            self.assertIsNone(conn.execute("SELECT 1 FROM traces").fetchone())
+
+        first = self.bundles[0]
+        self.assertEqual(self.db.get_trace(first.task.trace_id)["total_duration_ms"], 1)
+        self.assertEqual(len(self.db.get_candidates_by_task(first.task.task_id)), 3)
+
+        seen, cursor = [], None
+        while True:
+            page = self.db.search_traces(limit=3, cursor=cursor)
+            self.assertEqual(page["counts"]["total"], 4)
+            seen.extend(t["total_duration_ms"] for t in page["traces"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        self.assertEqual(seen, [20, 3, 2, 1])
+        window = self.db.search_traces(since="2026-03-02", until="2026-03-04", include_candidates=True)
+        self.assertEqual([t["total_duration_ms"] for t in window["traces"]], [3, 2])
+        self.assertEqual(len(window["traces"][0]["candidates"]), 3)
+
+    def test_retention_drops_expired_files_and_empties_expired_tables(self):
+        result = self.db.apply_retention(now=hv.datetime(2026, 4, 1, tzinfo=hv.timezone.utc))
+        self.assertEqual(result["dropped_partitions"], ["2026-03-01"])
+        self.assertEqual(result["emptied_tables"], [
+            {"partition": key, "table": "candidate_answers"} for key in ("2026-03-02", "2026-03-03", "2026-03-20")
+        ])
+        self.assertFalse(os.path.exists(os.path.join(self.db.partition_dir, "traces-2026-03-01.db")))
+        self.assertIsNone(self.db.get_trace(self.bundles[0].task.trace_id))
+        self.assertIsNotNone(self.db.get_trace(self.bundles[1].task.trace_id))
+        self.assertEqual(self.db.get_candidates_by_task(self.bundles[1].task.task_id), [])
+        self.assertEqual(self.db.search_traces()["counts"]["total"], 3)
+
+        with self.assertRaises(ValueError):
+            hv.parse_trace_retention(30, "nodes=1")
+
+    def test_reopened_partitions_skip_migrations_and_dropped_ones_wait_for_readers(self):
+        self.db.close_partitions()
+        with mock.patch.object(hv, "run_migrations") as migrate:
+            self.assertEqual(self.db.search_traces()["counts"]["total"], 4)
+        migrate.assert_not_called()
+
+        readers = self.db._read_pools()
+        pool = next(readers)
+        self.db._drop_partition("2026-03-20")
+        with pool.read() as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM traces").fetchone()[0], 1)
+        self.assertIsNotNone(pool._writer)
+        readers.close()
+        self.assertIsNone(pool._writer)
+
+    def test_evicted_partitions_close_once_no_longer_leased(self):
+        self.db.close_partitions()
+        self.db.max_open_partitions = 2
+        leased = self.db._partition_pool("2026-03-20")
+        opened = {}
+        for key in ("2026-03-20", "2026-03-01", "2026-03-02", "2026-03-03"):
+            opened[key] = pool = self.db._partition_pool(key)
+            with pool.read() as conn:
+                self.assertEqual(conn.execute("SELECT COUNT(*) FROM traces").fetchone()[0], 1)
+            self.db._release_partition(pool)
+        self.assertEqual(list(self.db._partitions), ["2026-03-02", "2026-03-03"])
+        self.assertIsNone(opened["2026-03-01"]._writer)
+        self.assertIsNotNone(leased._writer)
+
+        # Reopening a partition that is still leased takes the same pool back: one writer per file.
+        self.assertIs(self.db._partition_pool("2026-03-20"), leased)
+        self.assertIsNone(opened["2026-03-02"]._writer)
+        self.db._release_partition(leased)
+        self.db._release_partition(leased)
+        self.assertIsNotNone(leased._writer)
+
+        self.assertEqual(self.db.search_traces()["counts"]["total"], 4)
+        self.assertIsNone(leased._writer)
+        self.assertEqual(self.db._partition_leases, {})
+        self.assertEqual(self.db._retired_pools, set())
+
+    def test_single_row_saves_route_by_created_at(self):
+        _, _, verification, vicdan = _bundle(1)
+        created_at = "2026-03-05T08:00:00+00:00"
+        self.db.save_verification(verification, created_at=created_at)
+        self.db.save_vicdan(vicdan, created_at=created_at)
+        conn = sqlite3.connect(os.path.join(self.db.partition_dir, "traces-2026-03-05.db"))
+        rows = conn.execute("SELECT created_at FROM verification_results UNION ALL SELECT created_at FROM vicdan_results").fetchall()
+        conn.close()
+        self.assertEqual(rows, [(created_at,), (created_at,)])
+
+
+class TraceWriterTests(unittest.TestCase):
+    def setUp(self):
+        workdir = tempfile.mkdtemp(dir=_TMP)
+        self.db = hv.Database(os.path.join(workdir, "hopetensor.db"))
+        self.chain = hv.HOPEChain(os.path.join(workdir, "chain.db"))
+
+    def _bundle(self):
+        task, candidates, verification, vicdan = _bundle()
+        return hv.TraceBundle(
+            task=task, candidates=candidates, verification=verification, vicdan=vicdan, request_summary=task.prompt,
+            selected_nodes=[c.node_id for c in candidates], final_output="answer 0", total_duration_ms=12,
+            chain_events=hv.reason_chain_events(task.trace_id, candidates, verification, vicdan),
+        )
+
+    def test_bundles_are_readable_before_and_after_the_write(self):
+        writer = hv.TraceWriter(self.db, self.chain)
+        self.addCleanup(writer.close)
+        bundles = [self._bundle() for _ in range(5)]
+        for bundle in bundles:
+            writer.submit(bundle)
+            trace_id = bundle.task.trace_id
+            pending = writer.pending(trace_id)
+            trace = pending.trace_row() if pending else self.db.get_trace(trace_id)
+            self.assertEqual(trace["trace_id"], trace_id)
+
+        writer.flush()
+        self.assertIsNone(writer.pending(bundles[0].task.trace_id))
+        self.assertEqual(self.db.get_trace(bundles[-1].task.trace_id)["created_at"], bundles[-1].created_at)
+        self.assertEqual(len(self.chain.db.list_events(limit=100)), 5 * 4)
+        self.assertEqual(writer.written_bundles, 5)
+
+    def test_reason_pipeline_attaches_chain_events_to_the_bundle(self):
+        task, candidates, verification, vicdan = _bundle()
+        bundle = hv.REASON_PIPELINE.run(hv.Observer.bundle(task, candidates, verification, vicdan, "answer 0", 12))
+        self.assertEqual([e["event_type"] for e in bundle.chain_events], ["node_execution"] * 3 + ["goal_decision"])
+        self.assertTrue(all(e["trace_id"] == task.trace_id for e in bundle.chain_events))
+
+    def test_full_queue_pushes_back_and_close_drains_it(self):
+        release = threading.Event()
+
+        class SlowDatabase(hv.Database):
+            def save_trace_bundles(self, bundles):
+                release.wait()
+                super().save_trace_bundles(bundles)
+
+        writer = hv.TraceWriter(SlowDatabase(self.db.db_path), self.chain, max_pending=1, batch_size=1, enqueue_timeout_s=0.05)
+        first, second, third = self._bundle(), self._bundle(), self._bundle()
+        writer.submit(first)
+        while writer._queue.qsize():
+            time.sleep(0.001)  # until the writer has taken the first bundle
+        writer.submit(second)
+        with self.assertRaises(queue.Full):
+            writer.submit(third)
+        self.assertIsNone(writer.pending(third.task.trace_id))
+
+        async def submit_while_ticking():
+            ticks = 0
+
+            async def tick():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.005)
+                    ticks += 1
+
+            ticker = asyncio.create_task(tick())
+            with self.assertRaises(queue.Full):
+                await writer.submit_async(third)
+            ticker.cancel()
+            return ticks
+
+        # The full queue is waited on in a worker thread, so the loop keeps running.
+        self.assertGreater(asyncio.run(submit_while_ticking()), 2)
+
+        release.set()
+        writer.close()
+        self.assertIsNotNone(self.db.get_trace(first.task.trace_id))
+        self.assertIsNotNone(self.db.get_trace(second.task.trace_id))
+        self.assertIsNone(self.db.get_trace(third.task.trace_id))
+
+    def test_failed_chain_appends_are_retried_then_dead_lettered_and_replayed(self):
+        chain, failures = self.chain, [0]
+
+        class FlakyChain:
+            def record_events(self, events):
+                if failures[0]:
+                    failures[0] -= 1
+                    raise sqlite3.OperationalError("database is locked")
+                return chain.record_events(events)
+
+        writer = hv.TraceWriter(self.db, FlakyChain(), chain_retries=2, retry_backoff_s=0)
+        self.addCleanup(writer.close)
+        failures[0] = 2
+        writer.submit(self._bundle())
+        writer.flush()
+        self.assertEqual(len(chain.db.list_events(limit=100)), 4)
+        self.assertEqual(writer.stats()["failed_chain_events"], 0)
+
+        failures[0] = 3
+        writer.submit(self._bundle())
+        writer.flush()
+        self.assertEqual((writer.stats()["failed_chain_events"], writer.stats()["dead_letter_events"]), (4, 4))
+        self.assertTrue(writer.dead_letter_path.exists())
+
+        writer.submit(self._bundle())
+        writer.flush()
+        self.assertEqual(len(chain.db.list_events(limit=100)), 12)
+        self.assertEqual(writer.stats()["dead_letter_events"], 0)
+        self.assertFalse(writer.dead_letter_path.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,272 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+_TMP = tempfile.mkdtemp(prefix="hopeverse_nodes_test_")
+os.environ.setdefault("HOPETENSOR_DB_PATH", os.path.join(_TMP, "hopetensor_v1.db"))
+os.environ.setdefault("HOPECHAIN_DB_PATH", os.path.join(_TMP, "hopechain.db"))
+_cwd = os.getcwd()
+os.chdir(_TMP)
+try:
+    import hopeverse_onefile_ultra as hv
+finally:
+    os.chdir(_cwd)
+
+
+class _ChatServer:
+    """Minimal keep-alive HTTP/1.1 server answering every request with one chat completion."""
+
+    def __init__(self, status=b"200 OK"):
+        self.status = status
+        self.connections = 0
+        self.requests = []
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.url = f"http://127.0.0.1:{self.server.sockets[0].getsockname()[1]}/v1"
+        return self
+
+    async def __aexit__(self, *exc):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                headers = dict(line.lower().split(": ", 1) for line in head.decode().split("\r\n")[1:] if ": " in line)
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                self.requests.append(json.loads(body) if body else None)
+                reply = json.dumps({"choices": [{"message": {"content": "pooled answer"}}]}).encode()
+                writer.write(b"HTTP/1.1 %s\r\nContent-Type: application/json\r\nContent-Length: %d\r\n\r\n" % (self.status, len(reply)))
+                if not head.startswith(b"HEAD "):
+                    writer.write(reply)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+
+def _task():
+    return hv.TaskContext(
+        task_id=hv.generate_id("task"), trace_id=hv.generate_id("trace"), task_type="general",
+        policy_profile="default", prompt="What is HOPEverse?", created_at=hv.utc_now(),
+    )
+
+
+class HTTPClientPoolTests(unittest.TestCase):
+    def test_external_node_reuses_one_warm_connection(self):
+        async def scenario():
+            async with _ChatServer() as server:
+                http = hv.HTTPClientPool("test", http2=True)
+                node = hv.ExternalLLMNode(http=http)
+                with mock.patch.multiple(hv.SETTINGS, external_llm_api_key="key", external_llm_base_url=server.url):
+                    self.assertTrue(await http.warm_up(server.url))
+                    answers = [await node.run(_task()) for _ in range(3)]
+                await http.aclose()
+                return server, http, answers
+
+        server, http, answers = asyncio.run(scenario())
+        self.assertEqual([a.output for a in answers], ["pooled answer"] * 3)
+        self.assertEqual(server.connections, 1)
+        self.assertEqual(server.requests[1]["messages"][1]["content"], "What is HOPEverse?")
+        stats = http.stats()
+        self.assertEqual((stats["requests"], stats["new_connections"], stats["failures"]), (4, 1, 0))
+        self.assertEqual(stats["reuse_rate"], 0.75)
+        self.assertGreaterEqual(stats["pool_wait_ms_avg"], 0)
+
+    def test_failed_requests_are_counted(self):
+        async def scenario():
+            http = hv.HTTPClientPool("test")
+            self.assertFalse(await http.warm_up("http://127.0.0.1:1/"))
+            await http.aclose()
+            return http
+
+        stats = asyncio.run(scenario()).stats()
+        self.assertEqual((stats["requests"], stats["failures"]), (1, 1))
+
+    def test_error_statuses_are_counted_as_failures(self):
+        async def scenario():
+            async with _ChatServer(status=b"503 Service Unavailable") as server:
+                http = hv.HTTPClientPool("test")
+                self.assertTrue(await http.warm_up(server.url))
+                response = await http.request("POST", f"{server.url}/chat/completions", json={})
+                await http.aclose()
+                return http, response
+
+        http, response = asyncio.run(scenario())
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual((http.stats()["requests"], http.stats()["failures"]), (2, 1))
+
+
+class _StubNode(hv.BaseNode):
+    def __init__(self, node_id, output, delay_s):
+        self.node_id, self.node_type, self.capabilities = node_id, "stub", ["general"]
+        self.trust_score = self.reputation_score = self.cost_weight = self.latency_weight = 0.5
+        self.policy_tags, self.enabled = ["default"], True
+        self.output, self.delay_s = output, delay_s
+        self.cancelled = False
+
+    async def run(self, task):
+        try:
+            await asyncio.sleep(self.delay_s)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return hv.CandidateAnswer(candidate_id=hv.generate_id("cand"), task_id=task.task_id, node_id=self.node_id, output=self.output)
+
+
+class QuorumTests(unittest.TestCase):
+    ANSWER = "Governed multi-node execution compares reasoning paths before release."
+
+    def _orchestrator(self, nodes, **kwargs):
+        registry = hv.NodeRegistry()
+        for node in nodes:
+            registry.register(node)
+        self.bundles = []
+        pipeline = hv.ReasonPipeline()
+        pipeline.add_stage(hv.record_reason_chain_events)
+        pipeline.add_stage(self.bundles.append)
+        return hv.Orchestrator(registry, pipeline=pipeline, **kwargs)
+
+    def test_agreeing_fast_nodes_cancel_the_straggler(self):
+        slow = _StubNode("quorum-slow", self.ANSWER, 30)
+        nodes = [slow, _StubNode("quorum-a", self.ANSWER, 0), _StubNode("quorum-b", self.ANSWER, 0.01)]
+        orchestrator = self._orchestrator(nodes, quorum=2, quorum_agreement=0.8)
+
+        async def scenario():
+            started = asyncio.get_running_loop().time()
+            response = await orchestrator.execute_reasoning(hv.ReasonRequest(prompt="quorum"))
+            return response, asyncio.get_running_loop().time() - started
+
+        response, elapsed = asyncio.run(scenario())
+        self.assertLess(elapsed, 5)
+        self.assertTrue(slow.cancelled)
+        self.assertEqual(response.selected_nodes, ["quorum-slow", "quorum-a", "quorum-b"])
+        (bundle,) = self.bundles
+        self.assertEqual([c.error for c in bundle.candidates], [hv.QUORUM_CANCELLED, None, None])
+        self.assertNotIn("quorum-slow", [e["actor_name"] for e in bundle.chain_events])
+        hv.TRACE_WRITER.flush()
+        task_id = hv.DB.get_trace(response.trace_id)["task_id"]
+        self.assertEqual(hv.DB.get_candidates_by_task(task_id)[0]["error"], hv.QUORUM_CANCELLED)
+
+    def test_disagreeing_nodes_wait_for_everyone(self):
+        nodes = [_StubNode("split-a", "alpha beta gamma", 0), _StubNode("split-b", "delta epsilon zeta", 0), _StubNode("split-c", self.ANSWER, 0.05)]
+        orchestrator = self._orchestrator(nodes, quorum=2, quorum_agreement=0.8)
+        task = hv.TaskContext(task_id="t", trace_id="r", task_type="general", policy_profile="default", prompt="p", created_at=hv.utc_now())
+
+        candidates = asyncio.run(orchestrator._collect_candidates(task, nodes, lambda node: node.run(task)))
+        self.assertEqual([c.output for c in candidates], ["alpha beta gamma", "delta epsilon zeta", self.ANSWER])
+        self.assertFalse(any(node.cancelled for node in nodes))
+
+
+class HedgingTests(unittest.TestCase):
+    def _setup(self, delays, budget):
+        node = _StubNode("hedged", QuorumTests.ANSWER, 0)
+        node.hedge_policy = hv.HedgePolicy(quantile=0.9, min_samples=5)
+        node.delays = list(delays)
+        node.run = self._run_with_delays(node)
+        registry = hv.NodeRegistry()
+        registry.register(node)
+        for _ in range(10):
+            registry.observe("hedged", 10)
+        self.bundles = []
+        pipeline = hv.ReasonPipeline()
+        pipeline.add_stage(self.bundles.append)
+        return node, hv.Orchestrator(registry, pipeline=pipeline, hedge_budget=budget)
+
+    @staticmethod
+    def _run_with_delays(node):
+        async def run(task):
+            node.delay_s = node.delays.pop(0)
+            return await _StubNode.run(node, task)
+        return run
+
+    def test_slow_primary_is_hedged_and_the_hedge_wins(self):
+        node, orchestrator = self._setup([30, 0], hv.HedgeBudget(percent=100))
+        with mock.patch.object(orchestrator.registry, "observe") as observe:
+            response = asyncio.run(orchestrator.execute_reasoning(hv.ReasonRequest(prompt="hedge")))
+
+        self.assertTrue(node.cancelled)
+        # Latency is measured from the primary's start, so it includes the hedge delay.
+        self.assertGreaterEqual(observe.call_args.args[1], 9)
+        (bundle,) = self.bundles
+        self.assertEqual((bundle.hedges, bundle.hedge_wins), (1, 1))
+        hv.TRACE_WRITER.flush()
+        trace = hv.DB.get_trace(response.trace_id)
+        self.assertEqual((trace["hedges"], trace["hedge_wins"]), (1, 1))
+
+    def test_budget_caps_hedges(self):
+        budget = hv.HedgeBudget(percent=0)
+        node, orchestrator = self._setup([0.05], budget)
+        task = hv.TaskContext(task_id="t", trace_id="r", task_type="general", policy_profile="default", prompt="p", created_at=hv.utc_now())
+        hedges = {}
+
+        candidate = asyncio.run(orchestrator._run_hedged(node, task, hedges))
+        self.assertEqual(candidate.output, QuorumTests.ANSWER)
+        self.assertEqual(hedges, {})
+        self.assertEqual((budget.requests, budget.hedges, budget.denied), (1, 0, 1))
+
+        plain = _StubNode("unhedged", QuorumTests.ANSWER, 0)
+        asyncio.run(orchestrator._run_hedged(plain, task, hedges))
+        self.assertEqual(budget.requests, 1)
+
+
+class AdaptiveTimeoutTests(unittest.TestCase):
+    def test_histogram_tracks_quantiles_and_ewma(self):
+        histogram = hv.LatencyHistogram()
+        for i in range(1, 501):
+            histogram.observe(i)
+        self.assertAlmostEqual(histogram.quantile(0.5), 250, delta=250 * 0.05)
+        self.assertAlmostEqual(histogram.quantile(0.99), 495, delta=495 * 0.05)
+        self.assertGreater(histogram.ewma_ms, 400)
+        self.assertEqual(histogram.stats()["samples"], 500)
+
+        # Older samples decay, so a node that speeds up soon shows it.
+        for _ in range(5000):
+            histogram.observe(2)
+        self.assertLess(histogram.quantile(0.99), 2.2)
+
+    def test_timeouts_follow_each_node_within_bounds(self):
+        registry = hv.NodeRegistry(adaptive_timeouts=True)
+        self.assertEqual(registry.timeout_ms("fast"), hv.SETTINGS.node_timeout_ms)
+        for _ in range(50):
+            registry.observe("fast", 0)
+            registry.observe("slow", 4000)
+        self.assertEqual(registry.timeout_ms("fast"), hv.SETTINGS.node_timeout_min_ms)
+        self.assertAlmostEqual(registry.timeout_ms("slow"), 12000, delta=12000 * 0.05)
+        with mock.patch.object(hv.SETTINGS, "node_timeout_max_ms", 5000):
+            self.assertEqual(registry.timeout_ms("slow"), 5000)
+        self.assertEqual(hv.NodeRegistry(adaptive_timeouts=False).timeout_ms("fast"), hv.SETTINGS.node_timeout_ms)
+
+    def test_slow_call_times_out_at_the_learned_timeout(self):
+        node = _StubNode("adaptive", QuorumTests.ANSWER, 30)
+        registry = hv.NodeRegistry(adaptive_timeouts=True)
+        registry.register(node)
+        for _ in range(30):
+            registry.observe("adaptive", 1)
+        orchestrator = hv.Orchestrator(registry, pipeline=hv.ReasonPipeline())
+
+        response = asyncio.run(orchestrator.execute_reasoning(hv.ReasonRequest(prompt="timeout")))
+        self.assertEqual(response.vicdan_status, "REJECT")
+        self.assertTrue(node.cancelled)
+        self.assertEqual(registry.latency("adaptive").samples, 31)
+        self.assertGreater(registry.timeout_ms("adaptive"), hv.SETTINGS.node_timeout_min_ms)
+
+    def test_nodes_endpoint_reports_latency(self):
+        from fastapi.testclient import TestClient
+
+        hv.NODE_REGISTRY.observe(hv.SETTINGS.local_node_name, 3)
+        nodes = {n["node_id"]: n for n in TestClient(hv.app).get("/v1/nodes").json()}
+        latency = nodes[hv.SETTINGS.local_node_name]["latency"]
+        self.assertGreaterEqual(latency["samples"], 1)
+        self.assertIn("timeout_ms", latency)
+
+
+if __name__ == "__main__":
+    unittest.main()